@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks of swiftsc, run with ``python -m benchmarks.<name>``."""
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""Benchmark of swiftsc client against the in-process fake Swift.
+
+Cases cover authentication, small and large PUT and GET, SLO upload,
+parallel ranged download, listing pagination, HEAD storms, server-side
+copy, rate limiting, routing over several proxies and hedged reads.
+Results are written as JSON, so that runs can be compared.::
+
+    $ python -m benchmarks.bench_client --output before.json
+    $ python -m benchmarks.bench_client --latency 2 --cases small,head
+"""
+import os
+import shutil
+import tempfile
+from io import BytesIO
+
+from benchmarks import common
+from benchmarks.fake_swift import FakeSwift
+from swiftsc import Client
+from swiftsc.governor import Governor
+from swiftsc.hedging import HedgePolicy
+from swiftsc.retry import RetryPolicy
+
+#: container of the benchmark objects
+CONTAINER = 'bench'
+
+#: names of all cases
+CASES = ('auth', 'small', 'large', 'listing', 'head', 'copy', 'governor',
+         'endpoints', 'hedge')
+
+
+def bench_auth(swift, opts):
+    """Authenticate with tempauth and KeyStone."""
+    results = {}
+    for case, auth_uri, tenant_name in (
+            ('tempauth', swift.auth_uri, None),
+            ('keystone_v2', swift.keystone_v2_uri, 'bench'),
+            ('keystone_v3', swift.keystone_v3_uri, 'bench')):
+        client = Client(auth_uri=auth_uri, username=swift.username,
+                        password=swift.password, tenant_name=tenant_name)
+        results[case] = common.measure(lambda _: client.authenticate(),
+                                       range(opts.count))
+        client.close()
+    return results
+
+
+def bench_small(client, opts):
+    """PUT then GET small objects, one at a time and concurrently."""
+    bucket = client.container(CONTAINER)
+    body = os.urandom(opts.small_size)
+    names = ['small/%06d' % i for i in range(opts.count)]
+    results = {}
+    for concurrency in (1, opts.concurrency):
+        results['put_c%d' % concurrency] = common.measure(
+            lambda name: bucket.object(name).create(BytesIO(body)),
+            names, concurrency, opts.small_size)
+        results['get_c%d' % concurrency] = common.measure(
+            lambda name: bucket.object(name).download(BytesIO()),
+            names, concurrency, opts.small_size)
+    return results
+
+
+def bench_large(client, opts):
+    """PUT, SLO upload, GET and parallel ranged GET of a large object."""
+    bucket = client.container(CONTAINER)
+    obj = bucket.object('large')
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, 'large.bin')
+        with open(path, 'wb') as fobj:
+            fobj.write(os.urandom(opts.large_size))
+        dest = os.path.join(tmpdir, 'dest.bin')
+        size = opts.large_size
+        part = max(1, size // 8)
+        return {
+            'put': common.measure(
+                lambda _: obj.create(path), range(3), size=size),
+            'put_slo': common.measure(
+                lambda _: obj.create_large(path, segment_size=part,
+                                           concurrency=opts.concurrency),
+                range(3), size=size),
+            'get': common.measure(
+                lambda _: obj.download(dest), range(3), size=size),
+            'get_parallel': common.measure(
+                lambda _: obj.download_parallel(
+                    dest, part_size=part, concurrency=opts.concurrency),
+                range(3), size=size),
+        }
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def bench_listing(swift, client, opts):
+    """Iterate a paginated listing."""
+    for i in range(opts.listing):
+        swift.put_object(CONTAINER, 'list/%07d' % i, b'')
+    bucket = client.container(CONTAINER)
+    result = common.measure(
+        lambda _: sum(1 for _ in bucket.iter_list(prefix='list/',
+                                                  limit=opts.page)),
+        range(3))
+    result['entries_per_s'] = result['ops_per_s'] * opts.listing
+    result['page_size'] = opts.page
+    return result
+
+
+def bench_head(client, opts):
+    """Send concurrent HEAD of objects."""
+    bucket = client.container(CONTAINER)
+    names = ['small/%06d' % (i % opts.count) for i in range(opts.count * 5)]
+    return common.measure(lambda name: bucket.object(name).show_metadata(),
+                          names, opts.concurrency)
+
+
+def bench_copy(client, opts):
+    """Copy objects on the server side."""
+    bucket = client.container(CONTAINER)
+    return common.measure(
+        lambda i: bucket.object('small/%06d' % i).copy('copy/%06d' % i),
+        range(opts.count))
+
+
+def bench_governor(opts):
+    """PUT small objects with many workers against a rate limited proxy,
+    without and with governor."""
+    body = os.urandom(opts.small_size)
+    names = ['governed/%06d' % i for i in range(opts.count * 2)]
+    results = {}
+    for case, governor in (('ungoverned', None),
+                           ('governed', Governor(max_in_flight=64))):
+        with FakeSwift(latency=opts.latency / 1000.0,
+                       rate_limit=opts.rate_limit) as swift:
+            with Client(auth_uri=swift.auth_uri, username=swift.username,
+                        password=swift.password, pool_maxsize=64,
+                        retry=RetryPolicy(attempts=20, backoff=0.01),
+                        governor=governor) as client:
+                bucket = client.container(CONTAINER)
+                bucket.create()
+                result = common.measure(
+                    lambda name: bucket.object(name).create(BytesIO(body)),
+                    names, 64, opts.small_size)
+                result['rejected'] = swift.rejected
+                result['retries'] = client.retry.retries
+                if governor is not None:
+                    result['limit'] = governor.limit
+                    result['decreases'] = governor.decreases
+                results[case] = result
+    return results
+
+
+def bench_endpoints(opts):
+    """HEAD objects over three proxies of the KeyStone catalog, one of which
+    is slow, then again after another one went down."""
+    names = ['routed/%06d' % i for i in range(opts.count * 5)]
+    latency = opts.latency / 1000.0
+    results = {}
+    with FakeSwift(latency=latency,
+                   latencies=[0.001, 0.001, 0.001 + opts.slow / 1000.0]) \
+            as swift:
+        for name in names:
+            swift.put_object(CONTAINER, name, b'')
+        shares = {}
+
+        def _count(event):
+            shares[event.endpoint] = shares.get(event.endpoint, 0) + 1
+
+        with Client(auth_uri=swift.keystone_v3_uri, username=swift.username,
+                    password=swift.password, tenant_name='bench',
+                    pool_maxsize=opts.concurrency, hooks=[_count]) as client:
+            bucket = client.container(CONTAINER)
+            client.authenticate()
+            proxies = [endpoint.split('//')[1] for endpoint in swift.endpoints]
+            for case in ('healthy', 'failover'):
+                if case == 'failover':
+                    swift.stop_proxy(0)
+                shares.clear()
+                result = common.measure(
+                    lambda name: bucket.object(name).show_metadata(),
+                    names, opts.concurrency)
+                result['shares'] = [shares.get(proxy, 0) for proxy in proxies]
+                result['failovers'] = client.router.failovers
+                results[case] = result
+    return results
+
+
+def bench_hedge(opts):
+    """GET and HEAD small objects of a proxy answering some requests late,
+    without and with hedging."""
+    body = os.urandom(opts.small_size)
+    names = ['hedged/%06d' % i for i in range(opts.count * 5)]
+    results = {}
+    for case, hedge in (('unhedged', None), ('hedged', HedgePolicy())):
+        with FakeSwift(latency=opts.latency / 1000.0,
+                       stragglers=opts.stragglers,
+                       straggler_latency=opts.straggler_ms / 1000.0) \
+                as swift:
+            for name in names:
+                swift.put_object(CONTAINER, name, body)
+            with Client(auth_uri=swift.auth_uri, username=swift.username,
+                        password=swift.password,
+                        pool_maxsize=opts.concurrency * 2,
+                        hedge=hedge) as client:
+                bucket = client.container(CONTAINER)
+                for verb, func in (
+                        ('get', lambda name: bucket.object(name).detail()),
+                        ('head',
+                         lambda name: bucket.object(name).show_metadata())):
+                    result = common.measure(func, names, opts.concurrency)
+                    if hedge is not None:
+                        result['hedges'] = hedge.hedges
+                        result['wins'] = hedge.wins
+                        result['extra_load'] = (
+                            float(hedge.hedges) / len(names))
+                        hedge.hedges = hedge.wins = 0
+                    results['%s_%s' % (case, verb)] = result
+        if hedge is not None:
+            hedge.close()
+    return results
+
+
+def main():
+    """Run the benchmark."""
+    args = common.parser(__doc__.splitlines()[0])
+    args.add_argument('--cases', default=','.join(CASES),
+                      help='comma separated cases (default: all)')
+    args.add_argument('--latency', type=float, default=0.0,
+                      help='milliseconds added to each response')
+    args.add_argument('--count', type=int, default=200,
+                      help='number of small objects and of requests')
+    args.add_argument('--concurrency', type=int, default=8,
+                      help='number of concurrent requests')
+    args.add_argument('--small-size', type=int, default=4096,
+                      help='bytes of small objects')
+    args.add_argument('--large-size', type=int, default=32 * 1024 ** 2,
+                      help='bytes of the large object')
+    args.add_argument('--listing', type=int, default=5000,
+                      help='number of listed objects')
+    args.add_argument('--page', type=int, default=1000,
+                      help='entries of a listing page')
+    args.add_argument('--rate-limit', type=float, default=100.0,
+                      help='requests per second of the governor case')
+    args.add_argument('--slow', type=float, default=10.0,
+                      help='milliseconds added by the slow proxy of the '
+                      'endpoints case')
+    args.add_argument('--stragglers', type=float, default=0.02,
+                      help='fraction of requests answered late in the '
+                      'hedge case')
+    args.add_argument('--straggler-ms', type=float, default=100.0,
+                      help='milliseconds added to late requests')
+    opts = args.parse_args()
+    cases = opts.cases.split(',')
+
+    results = {}
+    with FakeSwift(latency=opts.latency / 1000.0) as swift:
+        with Client(auth_uri=swift.auth_uri, username=swift.username,
+                    password=swift.password,
+                    pool_maxsize=opts.concurrency) as client:
+            client.containers.create(name=CONTAINER)
+            if 'auth' in cases:
+                results['auth'] = bench_auth(swift, opts)
+            if 'small' in cases or 'head' in cases or 'copy' in cases:
+                # the objects are also read by head and copy
+                results['small'] = bench_small(client, opts)
+            if 'large' in cases:
+                results['large'] = bench_large(client, opts)
+            if 'listing' in cases:
+                results['listing'] = bench_listing(swift, client, opts)
+            if 'head' in cases:
+                results['head'] = bench_head(client, opts)
+            if 'copy' in cases:
+                results['copy'] = bench_copy(client, opts)
+        results['requests'] = swift.requests
+    if 'governor' in cases:
+        results['governor'] = bench_governor(opts)
+    if 'endpoints' in cases:
+        results['endpoints'] = bench_endpoints(opts)
+    if 'hedge' in cases:
+        results['hedge'] = bench_hedge(opts)
+    common.emit('client', results, opts.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Benchmark of import and client construction time.
+
+Each import is measured in a new interpreter. The client is created with
+credentials and without a reachable server, so a round trip in the
+constructor shows up as an error rather than as a slow result.::
+
+    $ python -m benchmarks.bench_startup --max-import-ms 400
+"""
+import subprocess
+import sys
+
+from benchmarks import common
+
+#: script printing the import time of swiftsc and the loaded modules
+IMPORT_SCRIPT = '''
+import sys, time
+clock = getattr(time, 'perf_counter', time.time)
+started = clock()
+import swiftsc
+sys.stdout.write('%r %d\\n' % (clock() - started, 'magic' in sys.modules))
+'''
+
+
+def bench_import(runs):
+    """Measure ``import swiftsc`` in new interpreters.
+
+    :rtype: dict
+    :return: summary of import times, and whether libmagic was loaded
+    """
+    samples = []
+    loaded = False
+    for _ in range(runs):
+        out = subprocess.check_output([sys.executable, '-c', IMPORT_SCRIPT])
+        elapsed, magic = out.split()
+        samples.append(float(elapsed))
+        loaded = loaded or magic == b'1'
+    result = common.summarize(samples)
+    result['magic_loaded'] = loaded
+    return result
+
+
+def bench_construct(runs):
+    """Measure creating clients with credentials.
+
+    :rtype: dict
+    :return: summary of construction times
+    """
+    from swiftsc import Client
+    samples = []
+    for _ in range(runs):
+        started = common.clock()
+        client = Client(auth_uri='http://127.0.0.1:9/auth/v1.0',
+                        username='bench:bench', password='bench')
+        samples.append(common.clock() - started)
+        client.close()
+    return common.summarize(samples)
+
+
+def main():
+    """Run the benchmark."""
+    args = common.parser(__doc__.splitlines()[0])
+    args.add_argument('--runs', type=int, default=10,
+                      help='number of imports and of constructions x100')
+    args.add_argument('--max-import-ms', type=float,
+                      help='fail when the median import time is larger')
+    args.add_argument('--max-construct-ms', type=float,
+                      help='fail when the median construction time is larger')
+    opts = args.parse_args()
+    results = {'import': bench_import(opts.runs),
+               'construct': bench_construct(opts.runs * 100)}
+    common.emit('startup', results, opts.output)
+    failures = []
+    if results['import']['magic_loaded']:
+        failures.append('libmagic is loaded by import')
+    for case, budget in (('import', opts.max_import_ms),
+                         ('construct', opts.max_construct_ms)):
+        if budget is not None and results[case]['p50_ms'] > budget:
+            failures.append('%s takes %.1f ms, budget %.1f ms'
+                            % (case, results[case]['p50_ms'], budget))
+    if failures:
+        sys.exit('\n'.join(failures))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""Helpers shared by the benchmarks."""
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+#: monotonic clock of the highest resolution
+clock = getattr(time, 'perf_counter', time.time)
+
+
+def percentile(samples, fraction):
+    """Calculate percentile by nearest rank.
+
+    :rtype: float
+    :return: sample at ``fraction`` of the sorted samples
+
+    :param list samples: measured values
+    :param float fraction: rank between 0 and 1
+    """
+    ordered = sorted(samples)
+    return ordered[max(0, int(math.ceil(fraction * len(ordered))) - 1)]
+
+
+def summarize(samples):
+    """Summarize latencies in milliseconds.
+
+    :rtype: dict
+    :return: count, min, median, p95, p99 and max
+
+    :param list samples: latencies in seconds
+    """
+    return {'count': len(samples),
+            'min_ms': min(samples) * 1000,
+            'p50_ms': percentile(samples, 0.5) * 1000,
+            'p95_ms': percentile(samples, 0.95) * 1000,
+            'p99_ms': percentile(samples, 0.99) * 1000,
+            'max_ms': max(samples) * 1000}
+
+
+def measure(func, items, concurrency=1, size=0):
+    """Call function for each item, measuring latency and throughput.
+
+    :rtype: dict
+    :return: latency summary, seconds, operations and MB per second
+
+    :param func: callable taking an item
+    :param list items: arguments of the calls
+    :param int concurrency: number of threads calling ``func``
+    :param int size: bytes transferred by each call
+    """
+    latencies = []
+
+    def _timed(item):
+        started = clock()
+        func(item)
+        latencies.append(clock() - started)
+
+    started = clock()
+    if concurrency == 1:
+        for item in items:
+            _timed(item)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(_timed, items))
+    elapsed = clock() - started
+    result = summarize(latencies)
+    result['seconds'] = elapsed
+    result['concurrency'] = concurrency
+    result['ops_per_s'] = len(latencies) / elapsed
+    if size:
+        result['mb_per_s'] = size * len(latencies) / elapsed / 1024 ** 2
+    return result
+
+
+def parser(description):
+    """Create argument parser with the options of every benchmark.
+
+    :rtype: `argparse.ArgumentParser`
+    :return: parser of ``--output``
+
+    :param str description: description of the benchmark
+    """
+    args = argparse.ArgumentParser(description=description)
+    args.add_argument('--output', '-o',
+                      help='write JSON results to file instead of stdout')
+    return args
+
+
+def emit(suite, results, output=None):
+    """Write results as JSON.
+
+    :param str suite: name of the benchmark
+    :param dict results: results by case
+    :param str output: file path, ``None`` for stdout
+    """
+    document = {'suite': suite,
+                'python': platform.python_version(),
+                'implementation': platform.python_implementation(),
+                'time': time.time(),
+                'results': results}
+    text = json.dumps(document, indent=2, sort_keys=True)
+    if output is None:
+        sys.stdout.write(text + '\n')
+    else:
+        with open(output, 'w') as fobj:
+            fobj.write(text + '\n')
@@ -0,0 +1,642 @@
+# -*- coding: utf-8 -*-
+"""In-process stand-in of Swift proxy for the benchmarks.
+
+The server keeps accounts in memory and implements the parts of the API
+used by swiftsc: tempauth, KeyStone v2.0 and v3 tokens, ``/info``, the verbs
+of accounts, containers and objects, ``X-Copy-From``, single byte ranges,
+SLO manifests, bulk delete and extract archive.::
+
+    >>> with FakeSwift() as swift:
+    ...     client = Client(auth_uri=swift.auth_uri,
+    ...                     username=swift.username,
+    ...                     password=swift.password)
+    ...     client.containers.create(name='bench')
+"""
+import hashlib
+import json
+import random
+import re
+import tarfile
+import threading
+import time
+import uuid
+from io import BytesIO
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urlparse, parse_qs, unquote
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import urlparse, parse_qs
+    from urllib import unquote
+
+#: account of the storage URL
+ACCOUNT = 'AUTH_bench'
+
+#: size of slices written to the connection
+WRITE_SIZE = 1024 * 1024
+
+#: default number of entries of a listing
+LISTING_LIMIT = 10000
+
+#: pattern of the Range header, only a single range is supported
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class _Object(object):
+    """Stored object, or SLO manifest when ``manifest`` is set."""
+
+    __slots__ = ('body', 'etag', 'content_type', 'manifest', 'timestamp')
+
+    def __init__(self, body, content_type, manifest=None, etag=None):
+        """Constructor of _Object."""
+        self.body = body
+        self.etag = etag or hashlib.md5(body).hexdigest()
+        self.content_type = content_type
+        self.manifest = manifest
+        self.timestamp = time.time()
+
+
+class FakeSwift(object):
+    """In-memory Swift proxy served by a thread of the current process.
+
+    :param float latency: seconds added before each response, to simulate
+                          the round trip to a remote proxy
+    :param str username: tempauth and KeyStone username
+    :param str password: tempauth and KeyStone password
+    :param float token_ttl: seconds until tokens expire
+    :param float rate_limit: requests per second of containers and objects
+                             above which ``498`` is returned, like the
+                             ratelimit middleware, ``None`` for no limit
+    :param int proxies: number of proxies serving the same accounts, all
+                        of which are in the catalog of KeyStone
+    :param list latencies: seconds added by each proxy on top of
+                           ``latency``
+    :param float stragglers: fraction of requests answered late, like
+                             those waiting for a slow object server
+    :param float straggler_latency: seconds added to late requests
+    """
+
+    def __init__(self, latency=0.0, username='bench:bench',
+                 password='bench', token_ttl=3600.0, rate_limit=None,
+                 proxies=1, latencies=None, stragglers=0.0,
+                 straggler_latency=0.1):
+        """Constructor of FakeSwift."""
+        self.latency = latency
+        self.stragglers = stragglers
+        self.straggler_latency = straggler_latency
+        self.latencies = list(latencies or [0.0] * proxies)
+        self.rate_limit = rate_limit
+        self.username = username
+        self.password = password
+        self.token_ttl = token_ttl
+        #: objects by container name and object name
+        self.containers = {}
+        #: number of requests by method
+        self.requests = {}
+        #: number of requests rejected by the rate limit
+        self.rejected = 0
+        #: lock of the containers, held while a request changes them
+        self.lock = threading.Lock()
+        self._tokens = {}
+        self._bucket = (rate_limit or 0.0, time.time())
+        self._servers = []
+        self._threads = []
+
+    def start(self):
+        """Listen on ephemeral ports of the loopback interface."""
+        for latency in self.latencies:
+            server = _Server(('127.0.0.1', 0), _Handler)
+            server.swift = self
+            server.latency = latency
+            thread = threading.Thread(target=server.serve_forever)
+            thread.daemon = True
+            thread.start()
+            self._servers.append(server)
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        """Stop serving and close the sockets."""
+        for index in range(len(self._servers)):
+            self.stop_proxy(index)
+        for thread in self._threads:
+            thread.join()
+
+    def stop_proxy(self, index):
+        """Take a proxy down, dropping requests of kept-alive connections.
+
+        :param int index: index of the proxy in :attr:`endpoints`
+        """
+        server = self._servers[index]
+        if not server.down:
+            server.down = True
+            server.shutdown()
+            server.server_close()
+
+    def __enter__(self):
+        """Start server as context manager."""
+        return self.start()
+
+    def __exit__(self, *args):
+        """Stop server when leaving the context."""
+        self.stop()
+
+    @property
+    def endpoint(self):
+        """URL of the first proxy."""
+        return self.endpoints[0]
+
+    @property
+    def endpoints(self):
+        """URLs of the proxies."""
+        return ['http://%s:%d' % server.server_address[:2]
+                for server in self._servers]
+
+    @property
+    def auth_uri(self):
+        """URL of tempauth."""
+        return '%s/auth/v1.0' % self.endpoint
+
+    @property
+    def keystone_v2_uri(self):
+        """URL of KeyStone Identity API v2.0 tokens."""
+        return '%s/v2.0/tokens' % self.endpoint
+
+    @property
+    def keystone_v3_uri(self):
+        """URL of KeyStone Identity API v3 tokens."""
+        return '%s/v3/auth/tokens' % self.endpoint
+
+    @property
+    def storage_url(self):
+        """Swift Storage URL of the account."""
+        return '%s/v1/%s' % (self.endpoint, ACCOUNT)
+
+    @property
+    def storage_urls(self):
+        """Swift Storage URLs of the account on every proxy."""
+        return ['%s/v1/%s' % (endpoint, ACCOUNT)
+                for endpoint in self.endpoints]
+
+    def issue_token(self):
+        """Issue new token.
+
+        :rtype: str
+        :return: token valid for ``token_ttl`` seconds
+        """
+        token = 'tk_%s' % uuid.uuid4().hex
+        with self.lock:
+            self._tokens[token] = time.time() + self.token_ttl
+        return token
+
+    def valid_token(self, token):
+        """Check token.
+
+        :rtype: bool
+        :return: ``True`` when the token was issued and has not expired
+        """
+        with self.lock:
+            return self._tokens.get(token, 0) > time.time()
+
+    def put_object(self, container, name, body,
+                   content_type='application/octet-stream'):
+        """Store object without request, to prepare a benchmark.
+
+        :param str container: container name, created if missing
+        :param str name: object name
+        :param bytes body: content of the object
+        :param str content_type: mimetype of the object
+        """
+        with self.lock:
+            self.containers.setdefault(container, {})[name] = _Object(
+                body, content_type)
+
+    def throttle(self):
+        """Take a request from the rate limit.
+
+        :rtype: bool
+        :return: ``True`` when the request must be rejected
+        """
+        if not self.rate_limit:
+            return False
+        with self.lock:
+            tokens, refilled = self._bucket
+            now = time.time()
+            tokens = min(self.rate_limit,
+                         tokens + (now - refilled) * self.rate_limit)
+            if tokens < 1:
+                self._bucket = (tokens, now)
+                self.rejected += 1
+                return True
+            self._bucket = (tokens - 1, now)
+            return False
+
+    def count(self, method):
+        """Count request."""
+        with self.lock:
+            self.requests[method] = self.requests.get(method, 0) + 1
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    """HTTP server handling each connection in a thread."""
+
+    daemon_threads = True
+    request_queue_size = 128
+    #: :class:`FakeSwift <FakeSwift>` of the server
+    swift = None
+    #: seconds added by the proxy
+    latency = 0.0
+    #: the proxy was taken down
+    down = False
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler of the fake Swift proxy."""
+
+    protocol_version = 'HTTP/1.1'
+    # headers and body are written separately
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        """Do not log requests."""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET."""
+        self._dispatch('GET')
+
+    def do_HEAD(self):  # pylint: disable=invalid-name
+        """Handle HEAD."""
+        self._dispatch('HEAD')
+
+    def do_PUT(self):  # pylint: disable=invalid-name
+        """Handle PUT."""
+        self._dispatch('PUT')
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Handle POST."""
+        self._dispatch('POST')
+
+    def do_DELETE(self):  # pylint: disable=invalid-name
+        """Handle DELETE."""
+        self._dispatch('DELETE')
+
+    @property
+    def swift(self):
+        """:class:`FakeSwift <FakeSwift>` served by the handler."""
+        return self.server.swift
+
+    def _dispatch(self, method):
+        """Route request by path."""
+        if self.server.down:
+            # drop the request like a crashed proxy
+            self.close_connection = True
+            return
+        self.swift.count(method)
+        url = urlparse(self.path)
+        query = dict((key, values[0])
+                     for key, values in parse_qs(
+                         url.query, keep_blank_values=True).items())
+        body = self._read_body()
+        if self.swift.latency or self.server.latency:
+            time.sleep(self.swift.latency + self.server.latency)
+        if self.swift.stragglers and random.random() < self.swift.stragglers:
+            time.sleep(self.swift.straggler_latency)
+        if url.path == '/auth/v1.0' and method == 'GET':
+            return self._temp_auth()
+        if url.path in ('/v2.0/tokens', '/v3/auth/tokens') and \
+                method == 'POST':
+            return self._keystone_auth(url.path, body)
+        if url.path == '/info' and method == 'GET':
+            return self._send_json(200, {
+                'swift': {'version': 'fake'},
+                'bulk_delete': {'max_deletes_per_request': LISTING_LIMIT},
+                'bulk_upload': {},
+                'slo': {'max_manifest_segments': 1000}})
+        parts = url.path.split('/', 4)[1:]
+        if len(parts) < 2 or parts[0] != 'v1' or parts[1] != ACCOUNT:
+            return self._send(404)
+        if not self.swift.valid_token(self.headers.get('X-Auth-Token')):
+            return self._send(401)
+        if self.swift.throttle():
+            return self._send(498, b'Slow down')
+        container = unquote(parts[2]) if len(parts) > 2 and parts[2] \
+            else None
+        name = unquote(parts[3]) if len(parts) > 3 and parts[3] else None
+        if container is None:
+            return self._account(method, query, body)
+        if name is None:
+            return self._container(method, container, query, body)
+        return self._object(method, container, name, query, body)
+
+    def _read_body(self):
+        """Read request body, with or without chunked encoding.
+
+        :rtype: bytes
+        :return: request body
+        """
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b';')[0].strip(), 16)
+                if size == 0:
+                    while self.rfile.readline() not in (b'\r\n', b'\n', b''):
+                        pass
+                    return b''.join(chunks)
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _send(self, status, body=b'', headers=None, length=None):
+        """Send response.
+
+        :param int status: status code
+        :param bytes body: response body, not sent to HEAD
+        :param dict headers: response headers
+        :param int length: Content-Length when it differs from the body
+        """
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length',
+                         str(len(body) if length is None else length))
+        self.send_header('X-Trans-Id', 'tx%s' % uuid.uuid4().hex[:21])
+        self.end_headers()
+        if self.command == 'HEAD':
+            return
+        view = memoryview(body)
+        for offset in range(0, len(body), WRITE_SIZE):
+            self.wfile.write(view[offset:offset + WRITE_SIZE])
+
+    def _send_json(self, status, payload, headers=None):
+        """Send JSON response."""
+        headers = dict(headers or {})
+        headers['Content-Type'] = 'application/json; charset=utf-8'
+        self._send(status, json.dumps(payload).encode('utf-8'), headers)
+
+    def _temp_auth(self):
+        """Issue token of tempauth."""
+        if (self.headers.get('X-Storage-User') != self.swift.username or
+                self.headers.get('X-Storage-Pass') != self.swift.password):
+            return self._send(401)
+        return self._send(200, headers={
+            'X-Auth-Token': self.swift.issue_token(),
+            'X-Storage-Url': self.swift.storage_url,
+            'X-Auth-Token-Expires': str(int(self.swift.token_ttl))})
+
+    def _keystone_auth(self, path, body):
+        """Issue token of KeyStone Identity API v2.0 or v3."""
+        payload = json.loads(body.decode('utf-8'))['auth']
+        expires = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(
+            time.time() + self.swift.token_ttl))
+        token = self.swift.issue_token()
+        if path == '/v2.0/tokens':
+            creds = payload['passwordCredentials']
+            if (creds['username'], creds['password']) != (
+                    self.swift.username, self.swift.password):
+                return self._send(401)
+            return self._send_json(200, {'access': {
+                'token': {'id': token, 'expires': expires},
+                'serviceCatalog': [{
+                    'type': 'object-store',
+                    'name': 'swift',
+                    'endpoints': [{'region': 'RegionOne', 'publicURL': url}
+                                  for url in self.swift.storage_urls]}]}})
+        user = payload['identity']['password']['user']
+        if (user['id'], user['password']) != (self.swift.username,
+                                              self.swift.password):
+            return self._send(401)
+        return self._send_json(201, {'token': {
+            'expires_at': expires,
+            'catalog': [{
+                'type': 'object-store',
+                'name': 'swift',
+                'endpoints': [{'region': 'RegionOne',
+                               'interface': 'public',
+                               'url': url}
+                              for url in self.swift.storage_urls]}]}},
+            headers={'X-Subject-Token': token})
+
+    def _account(self, method, query, body):
+        """Handle request of the account."""
+        containers = self.swift.containers
+        if method in ('GET', 'HEAD'):
+            with self.swift.lock:
+                entries = [{'name': name,
+                            'count': len(objects),
+                            'bytes': sum(len(obj.body)
+                                         for obj in objects.values())}
+                           for name, objects in containers.items()]
+            return self._listing(query, entries, {
+                'X-Account-Container-Count': str(len(entries))})
+        if method == 'POST' and 'bulk-delete' in query:
+            return self._bulk_delete(body)
+        if method == 'POST':
+            return self._send(204)
+        return self._send(405)
+
+    def _container(self, method, container, query, body):
+        """Handle request of a container."""
+        swift = self.swift
+        if method == 'PUT' and 'extract-archive' in query:
+            return self._extract_archive(container, '', body)
+        with swift.lock:
+            objects = swift.containers.get(container)
+            if method == 'PUT':
+                created = objects is None
+                swift.containers.setdefault(container, {})
+                return self._send(201 if created else 202)
+            if method == 'DELETE':
+                if objects is None:
+                    return self._send(404)
+                if objects:
+                    return self._send(409)
+                del swift.containers[container]
+                return self._send(204)
+            if objects is None:
+                return self._send(404)
+            entries = [{'name': name,
+                        'bytes': len(obj.body),
+                        'hash': obj.etag,
+                        'content_type': obj.content_type,
+                        'last_modified': time.strftime(
+                            '%Y-%m-%dT%H:%M:%S', time.gmtime(obj.timestamp))}
+                       for name, obj in objects.items()]
+        if method in ('GET', 'HEAD'):
+            return self._listing(query, entries, {
+                'X-Container-Object-Count': str(len(entries))})
+        return self._send(204)
+
+    def _listing(self, query, entries, headers):
+        """Send page of listing."""
+        entries.sort(key=lambda entry: entry['name'])
+        prefix = query.get('prefix', '')
+        marker = query.get('marker')
+        end_marker = query.get('end_marker')
+        delimiter = query.get('delimiter')
+        limit = int(query.get('limit') or LISTING_LIMIT)
+        page = []
+        for entry in entries:
+            name = entry['name']
+            if (not name.startswith(prefix) or
+                    (marker and name <= marker) or
+                    (end_marker and name >= end_marker)):
+                continue
+            if delimiter and delimiter in name[len(prefix):]:
+                subdir = name[:name.index(delimiter, len(prefix)) + 1]
+                if page and page[-1].get('subdir') == subdir:
+                    continue
+                entry = {'subdir': subdir}
+            page.append(entry)
+            if len(page) >= limit:
+                break
+        if query.get('format') == 'json':
+            return self._send_json(200, page, headers)
+        if not page:
+            return self._send(204, headers=headers)
+        text = '\n'.join(entry.get('name', entry.get('subdir'))
+                         for entry in page) + '\n'
+        headers = dict(headers, **{'Content-Type': 'text/plain'})
+        return self._send(200, text.encode('utf-8'), headers)
+
+    def _object(self, method, container, name, query, body):
+        """Handle request of an object."""
+        swift = self.swift
+        if method == 'PUT' and 'extract-archive' in query:
+            return self._extract_archive(container, name + '/', body)
+        with swift.lock:
+            objects = swift.containers.get(container)
+            if objects is None:
+                return self._send(404)
+            if method == 'PUT':
+                return self._put_object(objects, name, query, body)
+            elif name not in objects:
+                return self._send(404)
+            elif method == 'DELETE':
+                del objects[name]
+                return self._send(204)
+            elif method == 'POST':
+                return self._send(202)
+            else:
+                obj = objects[name]
+        if obj.manifest is not None and \
+                query.get('multipart-manifest') == 'get':
+            return self._send_json(200, obj.manifest)
+        return self._get_object(obj)
+
+    def _put_object(self, objects, name, query, body):
+        """Create object, copy or SLO manifest. The lock is held."""
+        content_type = self.headers.get('Content-Type',
+                                        'application/octet-stream')
+        copy_from = self.headers.get('X-Copy-From')
+        if copy_from:
+            src_cont, src_name = unquote(copy_from).lstrip('/').split('/', 1)
+            src = self.swift.containers.get(src_cont, {}).get(src_name)
+            if src is None:
+                return self._send(404)
+            objects[name] = _Object(src.body, src.content_type,
+                                    src.manifest, src.etag)
+            return self._send(201, headers={'Etag': src.etag})
+        if query.get('multipart-manifest') == 'put':
+            return self._put_manifest(objects, name, content_type, body)
+        obj = _Object(body, content_type)
+        etag = self.headers.get('ETag')
+        if etag and etag.strip('"') != obj.etag:
+            return self._send(422)
+        objects[name] = obj
+        return self._send(201, headers={'Etag': obj.etag})
+
+    def _put_manifest(self, objects, name, content_type, body):
+        """Create SLO manifest from uploaded segments. The lock is held."""
+        manifest = []
+        bodies = []
+        for segment in json.loads(body.decode('utf-8')):
+            seg_cont, seg_name = unquote(segment['path']).lstrip(
+                '/').split('/', 1)
+            seg = self.swift.containers.get(seg_cont, {}).get(seg_name)
+            if seg is None or (segment.get('etag') and
+                               segment['etag'] != seg.etag):
+                return self._send(400)
+            manifest.append({'name': '/%s/%s' % (seg_cont, seg_name),
+                             'hash': seg.etag,
+                             'bytes': len(seg.body),
+                             'content_type': seg.content_type})
+            bodies.append(seg.body)
+        etag = hashlib.md5(''.join(
+            seg['hash'] for seg in manifest).encode('ascii')).hexdigest()
+        objects[name] = _Object(b''.join(bodies), content_type,
+                                manifest=manifest, etag=etag)
+        return self._send(201, headers={'Etag': '"%s"' % etag})
+
+    def _get_object(self, obj):
+        """Send object body, or a single byte range of it."""
+        headers = {'Etag': obj.etag,
+                   'Content-Type': obj.content_type,
+                   'Accept-Ranges': 'bytes',
+                   'X-Timestamp': '%.5f' % obj.timestamp}
+        if obj.manifest is not None:
+            headers['Etag'] = '"%s"' % obj.etag
+            headers['X-Static-Large-Object'] = 'True'
+        size = len(obj.body)
+        match = RANGE_PATTERN.match(self.headers.get('Range', ''))
+        if match is None:
+            if self.command == 'HEAD':
+                return self._send(200, headers=headers, length=size)
+            return self._send(200, obj.body, headers)
+        first, last = match.groups()
+        if first:
+            first, last = int(first), min(int(last or size - 1), size - 1)
+        else:
+            first, last = max(0, size - int(last)), size - 1
+        if first > last:
+            return self._send(416, headers={
+                'Content-Range': 'bytes */%d' % size})
+        headers['Content-Range'] = 'bytes %d-%d/%d' % (first, last, size)
+        return self._send(206, obj.body[first:last + 1], headers)
+
+    def _bulk_delete(self, body):
+        """Delete objects listed in the body."""
+        deleted = not_found = 0
+        errors = []
+        with self.swift.lock:
+            for line in body.decode('utf-8').splitlines():
+                path = unquote(line.strip()).lstrip('/')
+                if not path:
+                    continue
+                cont, _, name = path.partition('/')
+                objects = self.swift.containers.get(cont)
+                if objects is None or (name and name not in objects):
+                    not_found += 1
+                elif not name:
+                    if objects:
+                        errors.append(['/' + path, '409 Conflict'])
+                    else:
+                        del self.swift.containers[cont]
+                        deleted += 1
+                else:
+                    del objects[name]
+                    deleted += 1
+        return self._send_json(200, {
+            'Number Deleted': deleted,
+            'Number Not Found': not_found,
+            'Errors': errors,
+            'Response Status': '400 Bad Request' if errors else '200 OK'})
+
+    def _extract_archive(self, container, prefix, body):
+        """Create objects from tar archive."""
+        created = 0
+        with tarfile.open(fileobj=BytesIO(body), mode='r:*') as archive:
+            members = [(member.name, archive.extractfile(member).read())
+                       for member in archive if member.isfile()]
+        with self.swift.lock:
+            objects = self.swift.containers.setdefault(container, {})
+            for name, data in members:
+                objects[prefix + name] = _Object(
+                    data, 'application/octet-stream')
+                created += 1
+        return self._send_json(201, {
+            'Number Files Created': created,
+            'Errors': [],
+            'Response Status': '201 Created'})
@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""pytest configuration of swiftsc."""
+import sys
+
+#: modules using async/await, which are syntax errors before Python 3.6
+collect_ignore = []
+if sys.version_info < (3, 6):
+    collect_ignore.extend(['swiftsc/aio.py', 'swiftsc/tests/test_aio.py'])
@@ -60,9 +60,11 @@ long_description = (
 
 requires = ['setuptools',
             'requests',
-            'python-magic']
+            'python-magic',
+            'futures; python_version < "3.2"']
 extras_require = {
     'reST': ['Sphinx'],
+    'async': ['aiohttp'],
     }
 if os.environ.get('READTHEDOCS', None):
     extras_require['reST'].append('recommonmark')
@@ -0,0 +1,532 @@
+# -*- coding: utf-8 -*-
+"""swiftsc.aio module.
+
+asyncio client of Swift, mirroring :class:`Client <swiftsc.client.Client>`.
+It requires Python 3.6 or later and aiohttp (``pip install swiftsc[async]``).
+::
+
+    >>> import asyncio
+    >>> from swiftsc.aio import AsyncClient
+    >>> async def main():
+    ...     async with AsyncClient(
+    ...             auth_uri='https://swift.example.org/auth/v1.0',
+    ...             username='swiftuser', password='passw0rd') as client:
+    ...         client.containers.container('mycontainer')
+    ...         await client.containers.objects.create(
+    ...             file_path='/tmp/dummy.txt')
+    >>> asyncio.get_event_loop().run_until_complete(main())
+"""
+import asyncio
+import copy
+import json
+import os.path
+from io import BytesIO
+
+import aiohttp
+
+from swiftsc import utils
+from swiftsc.client import (TIMEOUT, POOL_MAXSIZE, LISTING_LIMIT,
+                            _keystone_auth_payload, _set_auth_token,
+                            _retrieve_public_url_swift)
+from swiftsc.exception import (ValidationError, AuthenticationError,
+                               ResponseError)
+
+#: maximum number of connections of all hosts
+CONNECTION_LIMIT = 100
+
+
+async def _temp_auth(obj):
+    """tmpauth."""
+    auth_headers = {"X-Storage-User": obj.username,
+                    "X-Storage-Pass": obj.password}
+    async with obj.session.get(obj.auth_uri, headers=auth_headers) as res:
+        if res.status != 200:
+            raise AuthenticationError('Authentication failed')
+        obj.headers = {"X-Auth-Token": res.headers.get("X-Auth-Token")}
+        obj.uri = res.headers.get("X-Storage-URL")
+
+
+async def _keystone_auth(obj):
+    """keystone auth."""
+    payload = _keystone_auth_payload(obj)
+    headers = {"Content-Type": "application/json"}
+    async with obj.session.post(obj.auth_uri,
+                                headers=headers,
+                                data=json.dumps(payload)) as res:
+        # Identity API v3 answers 201 Created
+        if res.status not in (200, 201):
+            raise AuthenticationError('Authentication failed')
+        r_json = await res.json(content_type=None)
+        obj.headers = _set_auth_token(r_json, res.headers)
+        obj.uri = _retrieve_public_url_swift(r_json)
+
+
+def _check_response(res):
+    """Check response status.
+
+    :rtype: `aiohttp.ClientResponse`
+    :return: the response when it succeeded
+
+    :param res: `aiohttp.ClientResponse`
+    """
+    if res.status >= 400:
+        res.release()
+        raise ResponseError('%(status)s %(reason)s: %(url)s'
+                            % {'status': res.status,
+                               'reason': res.reason,
+                               'url': res.url},
+                            response=res)
+    return res
+
+
+async def _iter_stream(stream):
+    """Iterate chunks of blocking stream in the default executor.
+
+    :param stream: iterable of chunks, such as
+                   :class:`utils.FileStream <swiftsc.utils.FileStream>`
+    """
+    loop = asyncio.get_event_loop()
+    iterator = iter(stream)
+    while True:
+        chunk = await loop.run_in_executor(None, next, iterator, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+class AsyncClient(object):
+    """The :class:`AsyncClient <AsyncClient>` object.
+
+    The parameters are the same as :class:`Client <swiftsc.client.Client>`.
+    Authentication is done by :meth:`authenticate`, which is awaited when
+    the client is used as an asynchronous context manager.
+
+    :param str auth_uri: tempauth URL or KeyStone URL
+    :param str uri: Storage URL (required token)
+    :param str username: tempauth or KeyStone username
+    :param str password: tempauth or KeyStone password
+    :param str token: Auth token
+    :param str tenant_name: KeyStone tenant name
+    :param session: `aiohttp.ClientSession` to use instead of creating one
+    :param int limit: maximum number of connections of all hosts
+    :param int limit_per_host: maximum number of connections per host
+    :param bool keep_alive: reuse connections between requests
+    """
+
+    def __init__(self,
+                 auth_uri=None,
+                 uri=None,
+                 username=None,
+                 password=None,
+                 token=None,
+                 tenant_name=None,
+                 verify=True,
+                 timeout=TIMEOUT,
+                 session=None,
+                 limit=CONNECTION_LIMIT,
+                 limit_per_host=POOL_MAXSIZE,
+                 keep_alive=True):
+        """constructor of AsyncClient."""
+        #: SSL Cert Verification. (default: ``True``)
+        self.verify = verify
+        #: Request timeout. (default: ``5.0``)
+        self.timeout = timeout
+        self._session = session
+        self._session_options = {'limit': limit,
+                                 'limit_per_host': limit_per_host,
+                                 'force_close': not keep_alive}
+        if not verify:
+            self._session_options['ssl'] = False
+        #: Swift Storage URL
+        self.uri = uri
+        self.headers = None
+        #: TempAuth or KeyStone API URL
+        self.auth_uri = auth_uri
+        #: username
+        self.username = username
+        #: password
+        self.password = password
+        #: KeyStone tenant name
+        self.tenant_name = tenant_name
+        #: :class:`AsyncContainer <AsyncContainer>`, set after authentication
+        self.containers = None
+        if token:
+            self.headers = {'X-Auth-Token': token}
+            self.containers = AsyncContainer(self)
+
+    @property
+    def session(self):
+        """HTTP session shared by containers and objects.
+
+        It is created on first use, as it requires a running event loop.
+
+        :rtype: `aiohttp.ClientSession`
+        """
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(**self._session_options),
+                timeout=aiohttp.ClientTimeout(sock_connect=self.timeout,
+                                              sock_read=self.timeout),
+                # object bodies are transferred as they are stored
+                auto_decompress=False)
+        return self._session
+
+    async def authenticate(self):
+        """Authenticate with tempauth or KeyStone.
+
+        Nothing is done when the client has a token.
+        """
+        if self.headers is not None:
+            return
+        if self.tenant_name:
+            await _keystone_auth(self)
+        else:
+            await _temp_auth(self)
+        self.containers = AsyncContainer(self)
+
+    async def close(self):
+        """Close the pooled connections of the session."""
+        if self._session is not None:
+            await self._session.close()
+
+    async def __aenter__(self):
+        """Authenticate when entering the context."""
+        await self.authenticate()
+        return self
+
+    async def __aexit__(self, *args):
+        """Close the pooled connections when leaving the context."""
+        await self.close()
+
+
+class _AsyncCRUD(object):
+    """The :class:`_AsyncCRUD <_AsyncCRUD>` object."""
+
+    def __init__(self, obj):
+        """Constructor of _AsyncCRUD."""
+        self.uri = obj.uri
+        self.headers = obj.headers
+        #: :class:`AsyncClient <AsyncClient>` sharing its session
+        self.client = getattr(obj, 'client', obj)
+
+    def _request(self, method, uri, **kwargs):
+        """Send request over the shared session.
+
+        :rtype: `aiohttp.client._RequestContextManager`
+        :return: awaitable response, also usable as context manager
+
+        :param str method: HTTP method
+        :param str uri: request URL
+        :param **kwargs: keyword arguments of `aiohttp.ClientSession.request`
+        """
+        kwargs.setdefault('headers', self.headers)
+        return self.client.session.request(method, uri, **kwargs)
+
+    async def _read(self, method, uri, **kwargs):
+        """Send request and read the whole response body.
+
+        :rtype: `aiohttp.ClientResponse`
+        :return: released response, of which body is loaded
+        """
+        res = await self._request(method, uri, **kwargs)
+        await res.read()
+        res.release()
+        return res
+
+    async def list(self):
+        """List collection of resources.
+
+        :rtype: `aiohttp.ClientResponse`
+        :return: Response of list collection.
+        """
+        return await self._read('GET', self.uri, params={"format": "json"})
+
+    async def iter_list(self, prefix=None, delimiter=None, marker=None,
+                        end_marker=None, limit=LISTING_LIMIT):
+        """Iterate collection of resources page by page.
+
+        See :meth:`Container.iter_list <swiftsc.client._CRUD.iter_list>`.
+        The next page is fetched concurrently while the current one is
+        consumed.
+
+        :rtype: async generator
+        :return: dict of each resource
+        """
+        params = {'format': 'json', 'limit': limit}
+        for key, value in (('prefix', prefix),
+                           ('delimiter', delimiter),
+                           ('end_marker', end_marker)):
+            if value is not None:
+                params[key] = value
+        task = asyncio.ensure_future(self._list_page(params, marker))
+        try:
+            while task:
+                page = await task
+                if len(page) < limit:
+                    task = None
+                else:
+                    last = page[-1]
+                    task = asyncio.ensure_future(
+                        self._list_page(params,
+                                        last.get('name', last.get('subdir'))))
+                for entry in page:
+                    yield entry
+        finally:
+            if task:
+                task.cancel()
+
+    async def _list_page(self, params, marker=None):
+        """Retrieve a page of listing.
+
+        :rtype: list
+        :return: entries of the page
+        """
+        if marker is not None:
+            params = dict(params, marker=marker)
+        async with self._request('GET', self.uri, params=params) as res:
+            _check_response(res)
+            if res.status == 204:
+                return []
+            return await res.json(content_type=None)
+
+    async def detail(self, obj_id=None):
+        """Show/Get a single resource.
+
+        :rtype: `aiohttp.ClientResponse`
+        :return: Response of detail single resource.
+
+        :param str obj_id: resource id (or resource name)
+        """
+        if obj_id is None:
+            raise KeyError
+        return await self._read('GET', "%(uri)s/%(id)s" % {"uri": self.uri,
+                                                           "id": obj_id})
+
+    async def show_metadata(self, obj_id=None):
+        """Show metadata.
+
+        :rtype: `aiohttp.ClientResponse`
+        :return: Response of metadata single resource.
+
+        :param str obj_id: resource id (or resource name)
+        """
+        if obj_id is None:
+            raise KeyError
+        return await self._read('HEAD', "%(uri)s/%(id)s" % {"uri": self.uri,
+                                                            "id": obj_id})
+
+    async def create(self, **kwargs):
+        """Create or replace resource.
+
+        :rtype: `aiohttp.ClientResponse`
+        :return: Response of create resource.
+
+        :param **kwargs: parameters
+        """
+        self._validate(**kwargs)
+        return await self._read('PUT',
+                                '%(uri)s/%(id)s' % {'uri': self.uri,
+                                                    'id': kwargs.get('name')},
+                                data=kwargs.get('data'))
+
+    @staticmethod
+    def _validate(**kwargs):
+        """Validate parameters."""
+        return kwargs
+
+    async def update_metadata(self, obj_id, **kwargs):
+        """Create, Update (or delete) metadata.
+
+        :rtype: `aiohttp.ClientResponse`
+        :return: Response of updating a single resource.
+
+        :param str obj_id: resource id (or resource name)
+        :param **kwargs: keyword arguments of method
+        """
+        return await self._read('POST',
+                                "%(uri)s/%(id)s" % {"uri": self.uri,
+                                                    "id": obj_id},
+                                data=json.dumps(kwargs))
+
+    async def delete(self, obj_id):
+        """Delete resource.
+
+        :rtype: `aiohttp.ClientResponse`
+        :return: Response of deleting a single resource.
+
+        :param str obj_id: resource id (or resource name)
+        """
+        if obj_id is None:
+            raise KeyError
+        return await self._read('DELETE',
+                                "%(uri)s/%(id)s" % {"uri": self.uri,
+                                                    "id": obj_id})
+
+
+class AsyncContainer(_AsyncCRUD):
+    """Swift container resources of :class:`AsyncClient <AsyncClient>`."""
+
+    def __init__(self, obj):
+        """constructor of AsyncContainer."""
+        super(AsyncContainer, self).__init__(obj)
+        self.container_name = None
+        self.objects = None
+
+    def container(self, container_name):
+        """Set container name and create instances.
+
+        * objects: :class:`AsyncObject <AsyncObject>`
+
+        :param str container_name: container name
+        """
+        self.container_name = container_name
+        self.objects = AsyncObject(self)
+
+    def _validate(self, **kwargs):
+        if kwargs.get('name') is None:
+            raise ValidationError('name is None')
+
+
+class AsyncObject(_AsyncCRUD):
+    """Objects resources of :class:`AsyncClient <AsyncClient>`."""
+
+    def __init__(self, obj):
+        """Constructor of AsyncObject."""
+        if obj.container_name is None:
+            raise KeyError('Container name is None')
+        super(AsyncObject, self).__init__(obj)
+        self.container_name = obj.container_name
+        self.uri = "%(uri)s/%(path)s" % {"uri": self.uri,
+                                         "path": self.container_name}
+
+    async def create(self, **kwargs):
+        """Create object.
+
+        The body is streamed in chunks, read from the file in the default
+        executor. See :meth:`Object.create <swiftsc.client.Object.create>`.
+
+        :param **kwargs: parameters for creating object
+
+        * name: object name (default: basename of ``file_path``)
+        * file_path: local file path, or file object such as stdin pipe
+        * chunk_size: size of chunks read from the file
+        * content_type: mimetype of the object, ``False`` to let Swift
+          decide
+
+        :rtype: `aiohttp.ClientResponse`
+        :return: Response of create object
+        """
+        self._validate(**kwargs)
+
+        loop = asyncio.get_event_loop()
+        headers = copy.deepcopy(self.headers)
+        name = kwargs.get('name')
+        file_path = kwargs.get('file_path')
+        chunk_size = kwargs.get('chunk_size') or utils.CHUNK_SIZE
+        mimetype = kwargs.get('content_type')
+
+        if hasattr(file_path, 'read'):
+            # stdin pipe or file object
+            fobj = file_path
+            length = utils.stream_length(fobj)
+            head = await loop.run_in_executor(None, fobj.read, chunk_size)
+            if mimetype is None:
+                mimetype = await loop.run_in_executor(
+                    None, utils.check_mimetype_buffer, BytesIO(head), name)
+        else:
+            # local file
+            if name is None:
+                name = os.path.basename(file_path)
+            fobj = open(file_path, 'rb')
+            length = os.path.getsize(file_path)
+            head = b''
+            if mimetype is None:
+                mimetype = await loop.run_in_executor(
+                    None, utils.check_mimetype, file_path)
+        if mimetype:
+            headers['Content-Type'] = mimetype
+        else:
+            headers.pop('Content-Type', None)
+        if length is None:
+            headers.pop('Content-Length', None)
+        else:
+            headers['Content-Length'] = str(length)
+        try:
+            data = utils.stream_body(fobj, length=length,
+                                     chunk_size=chunk_size, head=head)
+            if not isinstance(data, bytes):
+                data = _iter_stream(data)
+            return await self._read('PUT',
+                                    '%(uri)s/%(name)s' % dict(uri=self.uri,
+                                                              name=name),
+                                    headers=headers,
+                                    data=data)
+        finally:
+            if fobj is not file_path:
+                fobj.close()
+
+    async def copy(self, src_object_name, dest_object_name):
+        """Copy object.
+
+        :rtype: `aiohttp.ClientResponse`
+        :return: Response of copy object
+        """
+        headers = copy.deepcopy(self.headers)
+        headers['Content-Length'] = '0'
+        headers['X-Copy-From'] = (
+            '/%(cont)s/%(obj)s' % {'cont': self.container_name,
+                                   'obj': src_object_name})
+        return await self._read('PUT',
+                                '%(uri)s/%(obj)s' % {'uri': self.uri,
+                                                     'obj': dest_object_name},
+                                headers=headers)
+
+    async def iter_content(self, name, chunk_size=utils.CHUNK_SIZE):
+        """Iterate object body in chunks.
+
+        :rtype: async generator
+        :return: chunks of object body
+
+        :param str name: object name
+        :param int chunk_size: size of chunks
+        """
+        async with self._request('GET',
+                                 '%(uri)s/%(name)s' % dict(uri=self.uri,
+                                                           name=name)) as res:
+            _check_response(res)
+            async for chunk in res.content.iter_chunked(chunk_size):
+                yield chunk
+
+    async def download(self, name, dest, chunk_size=utils.CHUNK_SIZE):
+        """Download object body in chunks.
+
+        Chunks are written to a local file in the default executor.
+
+        :rtype: int
+        :return: number of bytes written
+
+        :param str name: object name
+        :param dest: local file path, writable file object or callable
+        :param int chunk_size: size of chunks
+        """
+        loop = asyncio.get_event_loop()
+        fobj = None
+        if hasattr(dest, 'write'):
+            write = dest.write
+        elif callable(dest):
+            write = dest
+        else:
+            fobj = open(dest, 'wb')
+            write = fobj.write
+        written = 0
+        try:
+            async for chunk in self.iter_content(name, chunk_size):
+                if fobj is None:
+                    write(chunk)
+                else:
+                    await loop.run_in_executor(None, write, chunk)
+                written += len(chunk)
+        finally:
+            if fobj is not None:
+                fobj.close()
+        return written
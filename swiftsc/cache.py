@@ -0,0 +1,593 @@
+# -*- coding: utf-8 -*-
+"""swiftsc cache module."""
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from swiftsc import utils
+try:
+    import fcntl
+except ImportError:
+    # no advisory locking on Windows
+    fcntl = None
+
+#: seconds before expiry when a cached token is no longer used
+EXPIRY_MARGIN = 300
+
+#: seconds a cached response is used without revalidation
+RESPONSE_TTL = 5.0
+
+#: maximum number of cached responses
+RESPONSE_CACHE_SIZE = 256
+
+#: maximum total size of cached object bodies
+OBJECT_CACHE_BYTES = 1024 * 1024 * 1024
+
+#: seconds a cached object is used without revalidation
+OBJECT_STALE_AFTER = 60.0
+
+
+def cache_dir():
+    """Directory of caches of the user.
+
+    :rtype: str
+    :return: ``$XDG_CACHE_HOME/swiftsc`` (default: ``~/.cache/swiftsc``)
+    """
+    base = (os.environ.get('XDG_CACHE_HOME') or
+            os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base, 'swiftsc')
+
+
+def _makedirs(directory):
+    """Create directory readable only by the user, if missing."""
+    if directory and not os.path.isdir(directory):
+        try:
+            os.makedirs(directory, 0o700)
+        except OSError:
+            if not os.path.isdir(directory):
+                raise
+
+
+def file_mtime(fstat):
+    """Retrieve modification time of file in nanoseconds.
+
+    :rtype: int
+    :return: nanoseconds since the epoch
+
+    :param fstat: result of `os.stat`
+    """
+    return getattr(fstat, 'st_mtime_ns', None) or int(fstat.st_mtime * 1e9)
+
+
+class TokenCache(object):
+    """The :class:`TokenCache <TokenCache>` object.
+
+    This stores tokens and Storage URLs in a file shared by clients and
+    processes, so that short-lived processes reuse a token instead of
+    authenticating every time.::
+
+        >>> from swiftsc import Client
+        >>> from swiftsc.cache import TokenCache
+        >>> client = Client(auth_uri='https://swift.example.org/auth/v1.0',
+        ... username='swiftuser', password='passw0rd',
+        ... token_cache=TokenCache())
+
+    Entries are keyed by auth URL, username and tenant name, and by the
+    interface and region of the KeyStone catalog, and are used
+    until ``margin`` seconds before the token expires. Writers hold an
+    exclusive ``flock`` of ``<path>.lock``, so only one of the processes
+    missing a token authenticates while the others wait for it.
+
+    :param str path: path of the cache file
+                     (default: ``~/.cache/swiftsc/tokens.json``)
+    :param int margin: seconds before expiry to stop using a token
+    """
+
+    def __init__(self, path=None, margin=EXPIRY_MARGIN):
+        """Constructor of TokenCache."""
+        #: path of the cache file
+        self.path = path or os.path.join(cache_dir(), 'tokens.json')
+        #: seconds before expiry to stop using a token
+        self.margin = margin
+
+    @staticmethod
+    def key(auth_uri, username, tenant_name=None, interface=None,
+            region=None):
+        """Build key of an entry.
+
+        The Storage URL of KeyStone depends on the interface and region
+        selected from the catalog, so they are part of the key.
+
+        :rtype: str
+        :return: key of the credentials
+
+        :param str auth_uri: tempauth URL or KeyStone URL
+        :param str username: tempauth or KeyStone username
+        :param str tenant_name: KeyStone tenant name
+        :param str interface: interface of the KeyStone catalog
+        :param str region: preferred region of the KeyStone catalog
+        """
+        if interface is None and region is None:
+            return json.dumps([auth_uri, username, tenant_name])
+        return json.dumps([auth_uri, username, tenant_name, interface,
+                           region])
+
+    def get(self, key):
+        """Retrieve unexpired entry.
+
+        :rtype: dict
+        :return: ``token``, ``uri`` and ``expires``, or ``None``
+
+        :param str key: key of the credentials
+        """
+        with self._lock(exclusive=False):
+            entry = self._load().get(key)
+        return entry if self._fresh(entry) else None
+
+    def set(self, key, entry):
+        """Store entry.
+
+        :param str key: key of the credentials
+        :param dict entry: ``token``, ``uri``, ``expires`` as seconds
+                           since the epoch, and ``catalog`` of KeyStone.
+                           The entry is not stored when ``expires`` is
+                           unknown.
+        """
+        with self._lock(exclusive=True):
+            entries = self._load()
+            entries[key] = entry
+            self._save(entries)
+
+    def invalidate(self, key, token=None):
+        """Remove entry.
+
+        :param str key: key of the credentials
+        :param str token: remove the entry only when it still holds the
+                          token, so that a token refreshed by another
+                          process is kept
+        """
+        with self._lock(exclusive=True):
+            entries = self._load()
+            entry = entries.get(key)
+            if entry and (token is None or entry.get('token') == token):
+                del entries[key]
+                self._save(entries)
+
+    def fetch(self, key, authenticate):
+        """Retrieve entry, authenticating when none is cached.
+
+        :rtype: dict
+        :return: ``token``, ``uri`` and ``expires``
+
+        :param str key: key of the credentials
+        :param authenticate: callable returning a new entry. The entry is
+                             not stored when ``expires`` is unknown.
+        """
+        entry = self.get(key)
+        if entry:
+            return entry
+        with self._lock(exclusive=True):
+            entries = self._load()
+            entry = entries.get(key)
+            if self._fresh(entry):
+                # authenticated by another process while waiting for lock
+                return entry
+            entry = authenticate()
+            if entry.get('expires'):
+                entries[key] = entry
+                self._save(entries)
+        return entry
+
+    def _fresh(self, entry):
+        """Check expiry of entry.
+
+        :rtype: bool
+        :return: ``True`` when the token is usable for ``margin`` seconds
+        """
+        return bool(entry and
+                    (entry.get('expires') or 0) - self.margin > time.time())
+
+    @contextlib.contextmanager
+    def _lock(self, exclusive):
+        """Hold lock of the cache file."""
+        _makedirs(os.path.dirname(self.path))
+        with open(self.path + '.lock', 'a') as lock:
+            if fcntl:
+                fcntl.flock(lock.fileno(),
+                            fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def _load(self):
+        """Read entries, discarding a missing or broken file.
+
+        :rtype: dict
+        :return: entries by key
+        """
+        try:
+            with open(self.path) as fobj:
+                entries = json.load(fobj)
+        except (IOError, OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def _save(self, entries):
+        """Replace the cache file, dropping expired entries.
+
+        The file is written to a temporary file readable only by the user
+        and renamed, so that readers never see a partial file.
+        """
+        now = time.time()
+        entries = dict((key, entry) for key, entry in entries.items()
+                       if (entry.get('expires') or 0) > now)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path) or '.',
+                                   prefix='.tokens')
+        try:
+            with os.fdopen(fd, 'w') as fobj:
+                json.dump(entries, fobj)
+            getattr(os, 'replace', os.rename)(tmp, self.path)
+        except Exception:
+            os.unlink(tmp)
+            raise
+
+
+class HashIndex(object):
+    """The :class:`HashIndex <HashIndex>` object.
+
+    This stores MD5 of local files in SQLite, keyed by path, size and
+    modification time, so that unchanged files are not hashed again.
+
+    :param str path: path of the database (default: under :func:`cache_dir`,
+                     named after ``local_dir``)
+    :param str local_dir: directory of which files are indexed
+    """
+
+    def __init__(self, path=None, local_dir=None):
+        """Constructor of HashIndex."""
+        if path is None:
+            digest = hashlib.sha1(
+                os.path.abspath(local_dir or '.').encode('utf-8'))
+            path = os.path.join(cache_dir(), 'index',
+                                '%s.sqlite' % digest.hexdigest())
+        _makedirs(os.path.dirname(path))
+        #: path of the database
+        self.path = path
+        # imported on use, for fast startup
+        import sqlite3
+        self._conn = sqlite3.connect(path)
+        with self._conn:
+            self._conn.execute('CREATE TABLE IF NOT EXISTS files ('
+                               'path TEXT PRIMARY KEY, '
+                               'size INTEGER NOT NULL, '
+                               'mtime INTEGER NOT NULL, '
+                               'md5 TEXT NOT NULL)')
+
+    def get(self, path, size, mtime):
+        """Retrieve MD5 of unchanged file.
+
+        :rtype: str
+        :return: hex digest of MD5, ``None`` if the file is not indexed or
+                 was changed
+
+        :param str path: local file path
+        :param int size: size of the file
+        :param int mtime: modification time in nanoseconds
+        """
+        row = self._conn.execute(
+            'SELECT md5 FROM files WHERE path = ? AND size = ? AND mtime = ?',
+            (path, size, mtime)).fetchone()
+        return row[0] if row else None
+
+    def update(self, entries):
+        """Store MD5 of files.
+
+        :param entries: iterable of tuples of path, size, mtime and MD5
+        """
+        with self._conn:
+            self._conn.executemany('INSERT OR REPLACE INTO files '
+                                   '(path, size, mtime, md5) '
+                                   'VALUES (?, ?, ?, ?)', entries)
+
+    def close(self):
+        """Close the database."""
+        self._conn.close()
+
+
+class ResponseCache(object):
+    """The :class:`ResponseCache <ResponseCache>` object.
+
+    This keeps responses of listings and metadata of a client in memory.::
+
+        >>> from swiftsc import Client
+        >>> from swiftsc.cache import ResponseCache
+        >>> client = Client(auth_uri='https://swift.example.org/auth/v1.0',
+        ... username='swiftuser', password='passw0rd',
+        ... response_cache=ResponseCache(ttl=10))
+
+    A response is used for ``ttl`` seconds, then revalidated with
+    ``If-None-Match`` or ``If-Modified-Since`` when it has ``ETag`` or
+    ``Last-Modified``. The least recently used responses are discarded
+    beyond ``maxsize``. Requests changing a resource through the client
+    discard the responses of the resource, of its ancestors and of its
+    descendants.
+
+    :param float ttl: seconds a response is used without revalidation
+    :param int maxsize: maximum number of responses
+    """
+
+    def __init__(self, ttl=RESPONSE_TTL, maxsize=RESPONSE_CACHE_SIZE):
+        """Constructor of ResponseCache."""
+        #: seconds a response is used without revalidation
+        self.ttl = ttl
+        #: number of responses used without request
+        self.hits = 0
+        #: number of responses revalidated by ``304 Not Modified``
+        self.revalidated = 0
+        self._entries = utils.LRUCache(maxsize)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Retrieve response.
+
+        :rtype: tuple
+        :return: response and whether it is fresh, or ``(None, False)``
+
+        :param tuple key: method, URL and query parameters
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return (None, False)
+        res, stored = entry
+        fresh = time.time() - stored < self.ttl
+        if fresh:
+            self._count('hits')
+        return (res, fresh)
+
+    def set(self, key, res, revalidated=False):
+        """Store response, or renew it after revalidation.
+
+        :param tuple key: method, URL and query parameters
+        :param res: `requests.Response` of which body is read
+        :param bool revalidated: ``True`` when renewed by
+                                 ``304 Not Modified``
+        """
+        if revalidated:
+            self._count('revalidated')
+        self._entries.set(key, (res, time.time()))
+
+    @staticmethod
+    def conditional_headers(res):
+        """Build headers revalidating response.
+
+        :rtype: dict
+        :return: ``If-None-Match`` and ``If-Modified-Since``
+
+        :param res: cached `requests.Response`
+        """
+        headers = {}
+        if res.headers.get('Etag'):
+            headers['If-None-Match'] = res.headers['Etag']
+        if res.headers.get('Last-Modified'):
+            headers['If-Modified-Since'] = res.headers['Last-Modified']
+        return headers
+
+    def invalidate(self, uri):
+        """Discard responses of resource, its ancestors and descendants.
+
+        :param str uri: URL of the changed resource
+        """
+        uri = uri.split('?')[0].rstrip('/')
+        for key in self._entries.keys():
+            base = key[1].rstrip('/')
+            if (base == uri or uri.startswith(base + '/') or
+                    base.startswith(uri + '/')):
+                self._entries.pop(key)
+
+    def clear(self):
+        """Discard all responses."""
+        self._entries.clear()
+
+    def _count(self, name):
+        """Increment counter."""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+class ObjectCache(object):
+    """The :class:`ObjectCache <ObjectCache>` object.
+
+    This keeps object bodies in files of a directory, so that objects read
+    over and over are served from the local disk.::
+
+        >>> from swiftsc import Client
+        >>> from swiftsc.cache import ObjectCache
+        >>> client = Client(auth_uri='https://swift.example.org/auth/v1.0',
+        ... username='swiftuser', password='passw0rd',
+        ... object_cache=ObjectCache('/var/cache/swift', 10 * 1024 ** 3))
+        >>> client.containers.container('mycontainer')
+        >>> path = client.containers.objects.fetch('reference.bin')
+
+    Bodies are stored by URL and ETag, and the files are not modified once
+    written, so they may be opened or mapped while the object is replaced.
+    An entry is revalidated with ``If-None-Match`` after ``stale_after``
+    seconds. The least recently used entries are evicted when the bodies
+    exceed ``max_bytes``.
+
+    :param str directory: directory of the bodies
+                          (default: ``~/.cache/swiftsc/objects``)
+    :param int max_bytes: maximum total size of the bodies
+    :param float stale_after: seconds an entry is used without revalidation
+    """
+
+    def __init__(self, directory=None, max_bytes=OBJECT_CACHE_BYTES,
+                 stale_after=OBJECT_STALE_AFTER):
+        """Constructor of ObjectCache."""
+        #: directory of the bodies
+        self.directory = directory or os.path.join(cache_dir(), 'objects')
+        #: maximum total size of the bodies
+        self.max_bytes = max_bytes
+        #: seconds an entry is used without revalidation
+        self.stale_after = stale_after
+        self._lock = threading.Lock()
+        _makedirs(self.directory)
+        self._size = sum(entry['size'] for _, entry in self._entries())
+
+    def get(self, key):
+        """Retrieve entry, marking it as recently used.
+
+        :rtype: dict
+        :return: ``path``, ``etag``, ``headers``, ``size`` and
+                 ``validated`` of the entry, or ``None``
+
+        :param str key: URL of the object
+        """
+        meta = self._meta_path(key)
+        entry = self._load(meta)
+        if entry is None or not os.path.exists(entry['path']):
+            return None
+        try:
+            os.utime(meta, None)
+        except OSError:
+            return None
+        return entry
+
+    def fresh(self, entry):
+        """Check whether entry is used without revalidation.
+
+        :rtype: bool
+        :return: ``True`` within ``stale_after`` seconds of validation
+
+        :param dict entry: entry returned by :meth:`get`
+        """
+        return time.time() - entry['validated'] < self.stale_after
+
+    def put(self, key, headers, chunks):
+        """Store body, evicting least recently used entries.
+
+        :rtype: dict
+        :return: the entry
+
+        :param str key: URL of the object
+        :param headers: response headers including ``Etag``
+        :param chunks: iterable of bytes of the body
+        """
+        etag = headers.get('Etag', '').strip('"')
+        digest = self._digest(key)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix='.body')
+        try:
+            with os.fdopen(fd, 'wb') as fobj:
+                size = utils.write_chunks(chunks, fobj)
+            path = os.path.join(self.directory, '%s.%s' % (
+                digest, hashlib.sha1(etag.encode('utf-8')).hexdigest()))
+            getattr(os, 'replace', os.rename)(tmp, path)
+        except Exception:
+            os.unlink(tmp)
+            raise
+        entry = {'key': key,
+                 'path': path,
+                 'etag': etag,
+                 'headers': dict(headers),
+                 'size': size,
+                 'validated': time.time()}
+        with self._lock:
+            self._discard(key, keep=path)
+            self._write(self._meta_path(key), entry)
+            self._size += size
+            self._evict(keep=key)
+        return entry
+
+    def renew(self, key):
+        """Mark entry as validated now.
+
+        :param str key: URL of the object
+        """
+        with self._lock:
+            entry = self._load(self._meta_path(key))
+            if entry is not None:
+                entry['validated'] = time.time()
+                self._write(self._meta_path(key), entry)
+
+    def discard(self, key):
+        """Remove entry.
+
+        :param str key: URL of the object
+        """
+        with self._lock:
+            self._discard(key)
+
+    def _discard(self, key, keep=None):
+        """Remove entry, holding the lock."""
+        meta = self._meta_path(key)
+        entry = self._load(meta)
+        if entry is None:
+            return
+        if entry['path'] != keep:
+            self._remove(entry['path'])
+        self._remove(meta)
+        self._size -= entry['size']
+
+    def _evict(self, keep):
+        """Remove least recently used entries beyond ``max_bytes``."""
+        if self._size <= self.max_bytes:
+            return
+        for _, entry in sorted(self._entries(), key=lambda item: item[0]):
+            if self._size <= self.max_bytes:
+                break
+            if entry['key'] != keep:
+                self._discard(entry['key'])
+
+    def _entries(self):
+        """Enumerate entries with their last use.
+
+        :rtype: generator
+        :return: tuple of mtime of metadata and entry
+        """
+        for filename in os.listdir(self.directory):
+            if not filename.endswith('.json'):
+                continue
+            meta = os.path.join(self.directory, filename)
+            entry = self._load(meta)
+            if entry is not None:
+                try:
+                    yield (os.path.getmtime(meta), entry)
+                except OSError:
+                    continue
+
+    @staticmethod
+    def _digest(key):
+        """Hash key into file name."""
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def _meta_path(self, key):
+        """Path of metadata of entry."""
+        return os.path.join(self.directory, '%s.json' % self._digest(key))
+
+    @staticmethod
+    def _load(meta):
+        """Read metadata, ``None`` if missing or broken."""
+        try:
+            with open(meta) as fobj:
+                return json.load(fobj)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def _write(self, meta, entry):
+        """Replace metadata atomically."""
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix='.meta')
+        with os.fdopen(fd, 'w') as fobj:
+            json.dump(entry, fobj)
+        getattr(os, 'replace', os.rename)(tmp, meta)
+
+    @staticmethod
+    def _remove(path):
+        """Remove file if it exists."""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -1,33 +1,93 @@
 # -*- coding: utf-8 -*-
 """swiftsc.client module."""
 import os.path
+import hashlib
+import functools
 import json
 import copy
+import itertools
+import threading
+import time
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import requests
 
-from swiftsc import utils
-from swiftsc.exception import ValidationError, AuthenticationError
+from swiftsc import utils, metrics
+from swiftsc.cache import TokenCache, HashIndex, ResponseCache, file_mtime
+from swiftsc.governor import Governor
+from swiftsc.hedging import HedgePolicy
+from swiftsc.routing import Router, catalog_endpoints
+from swiftsc.exception import (ValidationError, AuthenticationError,
+                               ResponseError, IntegrityError)
 
 #: connection timeout
 #: see also http://goo.gl/6KIJnc
 TIMEOUT = 5.000
 
+#: number of per-host connection pools cached by a session
+POOL_CONNECTIONS = 10
+
+#: maximum number of connections kept alive per host
+POOL_MAXSIZE = 10
+
+#: size of segments of Static Large Object
+SEGMENT_SIZE = 100 * 1024 * 1024
+
+#: number of concurrent requests of parallel transfer
+CONCURRENCY = 4
+
+#: size of byte ranges of parallel download
+PART_SIZE = 64 * 1024 * 1024
+
+#: maximum number of entries of a listing page allowed by Swift
+LISTING_LIMIT = 10000
+
+#: maximum size of files of a bulk upload archive
+BULK_BATCH_SIZE = 256 * 1024 * 1024
+
+#: maximum size of objects transferred at once by tree transfer
+MAX_BYTES_IN_FLIGHT = 1024 * 1024 * 1024
+
 # See: https://urllib3.readthedocs.org/en/latest/security.html
 requests.packages.urllib3.disable_warnings()
 
 
+def _create_session(pool_connections=POOL_CONNECTIONS,
+                    pool_maxsize=POOL_MAXSIZE,
+                    keep_alive=True):
+    """Create HTTP session with connection pool.
+
+    :rtype: `requests.Session`
+    :return: session sharing keep-alive connections
+
+    :param int pool_connections: number of per-host pools to cache
+    :param int pool_maxsize: maximum number of connections per host
+    :param bool keep_alive: reuse connections after each request
+    """
+    session = requests.Session()
+    adapter = metrics.TimedHTTPAdapter(pool_connections=pool_connections,
+                                       pool_maxsize=pool_maxsize)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+    return session
+
+
 def _temp_auth(obj):
     """tmpauth."""
     auth_headers = {"X-Storage-User": obj.username,
                     "X-Storage-Pass": obj.password}
-    res = requests.get(obj.auth_uri,
-                       headers=auth_headers,
-                       verify=obj.verify,
-                       timeout=obj.timeout)
+    res = _http(obj, obj, 'GET', obj.auth_uri,
+                operation='auth.get',
+                headers=auth_headers)
     if res.status_code != 200:
         raise AuthenticationError('Authentication failed')
-    obj.headers = {"X-Auth-Token": res.headers.get("X-Auth-Token")}
+    obj.headers["X-Auth-Token"] = res.headers.get("X-Auth-Token")
+    obj.catalog = None
     obj.uri = res.headers.get("X-Storage-URL")
+    expires = res.headers.get("X-Auth-Token-Expires")
+    obj.expires = time.time() + float(expires) if expires else None
 
 
 def _keystone_auth_payload(obj):
@@ -54,14 +114,18 @@ def _keystone_auth_payload(obj):
     return payload
 
 
-def _set_auth_token(res):
-    """Retrieve Auth token."""
-    if res.json().get('access'):
+def _set_auth_token(r_json, headers):
+    """Retrieve Auth token.
+
+    :param dict r_json: response payload from KeyStone auth
+    :param headers: response headers from KeyStone auth
+    """
+    if r_json.get('access'):
         # Identity API v2.0
-        token = res.json()['access']['token']['id']
-    elif res.headers.get('x-subject-token'):
+        token = r_json['access']['token']['id']
+    elif headers.get('x-subject-token'):
         # Identity API v3
-        token = res.headers.get('x-subject-token')
+        token = headers.get('x-subject-token')
     return {"X-Auth-Token": token}
 
 
@@ -69,36 +133,215 @@ def _keystone_auth(obj):
     """keystone auth."""
     payload = _keystone_auth_payload(obj)
     headers = {"Content-Type": "application/json"}
-    res = requests.post(obj.auth_uri,
-                        headers=headers,
-                        data=json.dumps(payload),
-                        verify=obj.verify,
-                        timeout=obj.timeout)
-    if res.status_code != 200:
+    res = _http(obj, obj, 'POST', obj.auth_uri,
+                operation='auth.post',
+                headers=headers,
+                data=json.dumps(payload))
+    # Identity API v3 answers 201 Created
+    if res.status_code not in (200, 201):
         raise AuthenticationError('Authentication failed')
-    obj.headers = _set_auth_token(res)
-    obj.uri = _retrieve_public_url_swift(res.json())
+    obj.headers.update(_set_auth_token(res.json(), res.headers))
+    obj.catalog = catalog_endpoints(res.json(), obj.interface, obj.region)
+    if not obj.catalog:
+        raise AuthenticationError('No %s object-store endpoint in catalog'
+                                  % obj.interface)
+    obj.uri = obj.catalog[0][0]
+    obj.expires = _token_expires(res.json())
 
 
-def _retrieve_public_url_swift(r_json):
-    """Retrieve Swift public url from KeyStone.
+def _token_expires(r_json):
+    """Retrieve expiry of KeyStone token.
 
-    :rtype: string
-    :return: swift public url
+    :rtype: int
+    :return: seconds since the epoch, or ``None`` when unknown
 
     :param dict r_json: response payload from KeyStone auth
     """
     if r_json.get('access'):
         # Identity API v2.0
-        url = [ep.get('endpoints')[0]
-               for ep in r_json.get('access').get('serviceCatalog')
-               if ep.get('type') == 'object-store'][0].get('publicURL')
+        expires = r_json['access']['token'].get('expires')
     else:
         # Identity API v3
-        url = [ep.get('endpoints')[0]
-               for ep in r_json.get('token').get('catalog')
-               if ep.get('type') == 'object-store'][0].get('url')
-    return url
+        expires = r_json.get('token', {}).get('expires_at')
+    return utils.parse_isotime(expires) if expires else None
+
+
+def _retrieve_public_url_swift(r_json, interface='public', region=None):
+    """Retrieve Swift public url from KeyStone.
+
+    :rtype: string
+    :return: swift url of the interface, in the region when it has one
+
+    :param dict r_json: response payload from KeyStone auth
+    :param str interface: ``public``, ``internal`` or ``admin``
+    :param str region: preferred region
+    """
+    endpoints = catalog_endpoints(r_json, interface, region)
+    return endpoints[0][0] if endpoints else None
+
+
+def _http(obj, client, method, uri, operation=None, retries=0, **kwargs):
+    """Send HTTP request, notifying the hooks of the client.
+
+    :rtype: `requests.Response`
+    :return: Response of the request
+
+    :param obj: sender of which ``session``, ``verify`` and ``timeout`` are
+                used, such as :class:`Client <Client>` or :class:`Object
+                <Object>`
+    :param client: :class:`Client <Client>` of which hooks are notified
+    :param str method: HTTP method
+    :param str uri: request URL
+    :param str operation: operation name, ``None`` to name it from the URL
+    :param int retries: number of previous attempts of the request
+    :param **kwargs: keyword arguments of `requests.Session.request`
+    """
+    hooks = getattr(client, 'hooks', None)
+    if not hooks:
+        return obj.session.request(method, uri, verify=obj.verify,
+                                   timeout=obj.timeout, **kwargs)
+    container = name = res = error = None
+    if operation is None:
+        operation, container, name = metrics.describe(
+            client.uri, method, uri, kwargs.get('params'),
+            kwargs.get('headers'))
+    metrics.reset_connect_time()
+    started = time.time()
+    try:
+        res = obj.session.request(method, uri, verify=obj.verify,
+                                  timeout=obj.timeout, **kwargs)
+        return res
+    except Exception as exc:
+        error = type(exc).__name__
+        raise
+    finally:
+        client.emit(metrics.RequestEvent(
+            operation, method, container, name,
+            endpoint=metrics.endpoint_of(uri),
+            status=res.status_code if res is not None else None,
+            bytes_sent=_bytes_sent(kwargs.get('data'), res),
+            bytes_received=_bytes_received(res, kwargs.get('stream')),
+            connect=metrics.connect_time(),
+            ttfb=res.elapsed.total_seconds() if res is not None else 0.0,
+            total=time.time() - started,
+            retries=retries,
+            error=error))
+
+
+def _bytes_sent(data, res=None):
+    """Count bytes of request body.
+
+    :rtype: int
+    :return: bytes sent, 0 when unknown
+    """
+    if res is not None and res.request.headers.get('Content-Length'):
+        return int(res.request.headers['Content-Length'])
+    if hasattr(data, 'sent'):
+        # chunked transfer encoding
+        return data.sent
+    if isinstance(data, (bytes, type(u''))):
+        return len(data)
+    return 0
+
+
+def _body_size(data):
+    """Retrieve size of request body.
+
+    :rtype: int
+    :return: bytes, 0 when unknown
+    """
+    if isinstance(data, (bytes, type(u''))):
+        return len(data)
+    return getattr(data, 'length', None) or 0
+
+
+def _bytes_received(res, stream=False):
+    """Count bytes of response body.
+
+    :rtype: int
+    :return: bytes received, ``Content-Length`` of streamed response
+    """
+    if res is None:
+        return 0
+    if stream:
+        return int(res.headers.get('Content-Length') or 0)
+    return len(res.content)
+
+
+def _check_response(res):
+    """Check response status.
+
+    :rtype: `requests.Response`
+    :return: the response when it succeeded
+
+    :param res: `requests.Response`
+    """
+    if not res.ok:
+        res.close()
+        raise ResponseError('%(status)s %(reason)s: %(url)s'
+                            % {'status': res.status_code,
+                               'reason': res.reason,
+                               'url': res.url},
+                            response=res)
+    return res
+
+
+def _check_etag(res, body, name):
+    """Verify ETag of uploaded object against MD5 of the body sent.
+
+    :rtype: `requests.Response`
+    :return: the response when the checksums match
+
+    :param res: `requests.Response` of PUT
+    :param body: request body, :class:`FileStream <swiftsc.utils.FileStream>`
+                 of which MD5 is computed while it is sent
+    :param str name: object name
+    """
+    etag = res.headers.get('Etag', '').strip('"')
+    sent = getattr(body, 'etag', None)
+    if res.ok and etag and sent and etag != sent:
+        raise IntegrityError('%s is corrupted on upload: %s != %s'
+                             % (name, etag, sent))
+    return res
+
+
+def _count_deleted(result, path, status_code, reason):
+    """Count result of deleting object.
+
+    :param dict result: numbers of deleted and not found objects, and errors
+    :param str path: path of the object
+    :param int status_code: status code of DELETE
+    :param str reason: reason phrase of DELETE
+    """
+    if status_code == 404:
+        result['not_found'] += 1
+    elif status_code < 300:
+        result['deleted'] += 1
+    else:
+        result['errors'].append([path, '%d %s' % (status_code, reason)])
+
+
+def _bulk_errors(r_json, paths):
+    """Retrieve errors of bulk middleware.
+
+    The middleware answers ``200 OK`` and reports the status of the
+    operation in the body. When the whole request is rejected, such as an
+    invalid archive or too many paths, no error is listed per path, so
+    every path of the request is reported with the status.
+
+    :rtype: list
+    :return: errors as list of path and status
+
+    :param dict r_json: response payload of bulk middleware
+    :param list paths: paths of the request
+    """
+    errors = r_json.get('Errors') or []
+    status = r_json.get('Response Status', '200 OK')
+    if errors or status[:1] == '2':
+        return errors
+    if r_json.get('Response Body'):
+        status = '%s: %s' % (status, r_json['Response Body'].strip())
+    return [[path, status] for path in paths]
 
 
 class Client(object):
@@ -116,6 +359,61 @@ class Client(object):
     :param str password: tempauth or KeyStone password
     :param str token: Auth token
     :param str tenant_name: KeyStone tenant name
+    :param session: `requests.Session` to use instead of creating one
+    :param int pool_connections: number of per-host connection pools
+    :param int pool_maxsize: maximum number of connections per host
+    :param bool keep_alive: reuse connections between requests
+    :param token_cache: :class:`TokenCache <swiftsc.cache.TokenCache>`, or
+                        path of its file, to share tokens between clients
+                        and processes. ``True`` uses the default path.
+    :param retry: :class:`RetryPolicy <swiftsc.retry.RetryPolicy>` of the
+                  requests of containers and objects (default: no retry)
+    :param response_cache: :class:`ResponseCache
+                           <swiftsc.cache.ResponseCache>` of listings and
+                           metadata. ``True`` uses the default TTL.
+    :param object_cache: :class:`ObjectCache <swiftsc.cache.ObjectCache>`
+                         of object bodies read by :meth:`Object.detail
+                         <Object.detail>` and :meth:`Object.fetch
+                         <Object.fetch>`
+    :param list hooks: callables receiving a :class:`RequestEvent
+                       <swiftsc.metrics.RequestEvent>` for every HTTP call,
+                       such as :class:`Metrics <swiftsc.metrics.Metrics>`
+    :param governor: :class:`Governor <swiftsc.governor.Governor>` limiting
+                     the requests of containers and objects. ``True`` uses
+                     the default limits.
+    :param list endpoints: Swift proxies to spread requests over, as
+                           Storage URLs, URLs without path or
+                           ``[url, region]``, instead of those of the
+                           KeyStone catalog
+    :param str interface: interface of the KeyStone catalog, ``public``,
+                          ``internal`` or ``admin``
+    :param str region: preferred region of the endpoints
+    :param hedge: :class:`HedgePolicy <swiftsc.hedging.HedgePolicy>` of
+                  reads, sent again when no response arrived within a
+                  delay. ``True`` uses the default policy.
+
+    Authentication is deferred to the first request, so creating a client
+    costs no round trip. Call :meth:`authenticate` to authenticate
+    beforehand.
+
+    When the KeyStone catalog has several Swift endpoints of the interface,
+    or ``endpoints`` are given, a :class:`Router <swiftsc.routing.Router>`
+    spreads the requests of containers and objects over the healthy ones,
+    preferring those of ``region``, and fails over when one goes down.
+
+    An expired token is refreshed transparently when the client has the
+    credentials: a request answered with ``401 Unauthorized`` is sent
+    again with a new token, which is shared by every
+    :class:`Container <Container>` and :class:`Object <Object>` of the
+    client.
+
+    The connection pool is shared by :class:`Container <Container>` and
+    :class:`Object <Object>` created from the client. Release it with
+    :meth:`close`, or use the client as a context manager.::
+
+        >>> with Client(auth_uri='https://swift.example.org/auth/v1.0',
+        ...             username='swiftuser', password='passw0rd') as client:
+        ...     client.containers.list()
     """
 
     #: The path of the API endpoint.
@@ -129,37 +427,275 @@ class Client(object):
                  token=None,
                  tenant_name=None,
                  verify=True,
-                 timeout=TIMEOUT):
+                 timeout=TIMEOUT,
+                 session=None,
+                 pool_connections=POOL_CONNECTIONS,
+                 pool_maxsize=POOL_MAXSIZE,
+                 keep_alive=True,
+                 token_cache=None,
+                 retry=None,
+                 response_cache=None,
+                 object_cache=None,
+                 hooks=None,
+                 governor=None,
+                 endpoints=None,
+                 interface='public',
+                 region=None,
+                 hedge=None):
         """constructor of Client."""
         #: SSL Cert Verification. (default: ``True``)
         self.verify = verify
         #: Request timeout. (default: ``5.0``)
         self.timeout = timeout
-
-        if uri:
-            #: Swift Storage URL
-            self.uri = uri
+        #: HTTP session shared by containers and objects
+        self.session = session or _create_session(pool_connections,
+                                                  pool_maxsize,
+                                                  keep_alive)
+
+        #: TempAuth or KeyStone API URL
+        self.auth_uri = auth_uri
+        #: username
+        self.username = username
+        #: password
+        self.password = password
+        #: KeyStone tenant name
+        self.tenant_name = tenant_name
+        if token_cache and not isinstance(token_cache, TokenCache):
+            token_cache = TokenCache(None if token_cache is True
+                                     else token_cache)
+        #: cache of tokens shared by clients and processes
+        self.token_cache = token_cache
+        #: retry policy of the requests
+        self.retry = retry
+        if response_cache is True:
+            response_cache = ResponseCache()
+        #: cache of listings and metadata
+        self.response_cache = response_cache
+        #: cache of object bodies on local disk
+        self.object_cache = object_cache
+        #: callables notified of every HTTP call
+        self.hooks = list(hooks or [])
+        if governor is True:
+            governor = Governor()
+        #: governor of the requests shared by threads
+        self.governor = governor
+        #: interface of the KeyStone catalog
+        self.interface = interface
+        #: preferred region of the endpoints
+        self.region = region
+        #: ``[url, region]`` of the Swift endpoints of the KeyStone catalog
+        self.catalog = None
+        #: router of the requests over several endpoints, or ``None``
+        self.router = Router(endpoints, region) if endpoints else None
+        self._endpoints = bool(endpoints)
+        if hedge is True:
+            hedge = HedgePolicy()
+        #: hedging policy of the reads
+        self.hedge = hedge
+        #: expiry of the token as seconds since the epoch
+        self.expires = None
+        #: auth headers shared by containers and objects, updated in place
+        self.headers = {}
+        self._auth_lock = threading.Lock()
+
+        self.uri = uri
         if token:
-            self.headers = {'X-Auth-Token': token}
-        elif auth_uri and username and password:
-            #: TempAuth or KeyStone API URL
-            self.auth_uri = auth_uri
-            #: username
-            self.username = username
-            #: password
-            self.password = password
-            #: KeyStone tenant name
-            if tenant_name:
-                # for KeyStone
-
-                self.tenant_name = tenant_name
-                _keystone_auth(self)
-            else:
-                # for tempauth
-                _temp_auth(self)
+            self.headers['X-Auth-Token'] = token
 
+        self._capabilities = None
         self.containers = Container(self)
 
+    @property
+    def uri(self):
+        """Swift Storage URL.
+
+        The client authenticates on the first use, not when it is created.
+        """
+        self.ensure_authenticated()
+        return self._uri
+
+    @uri.setter
+    def uri(self, value):
+        self._uri = value
+        if value and self.router is not None:
+            self.router.bind(value)
+
+    def ensure_authenticated(self):
+        """Authenticate unless the client has a token.
+
+        Concurrent callers wait for a single authentication.
+
+        :rtype: str
+        :return: token, or ``None`` without token nor credentials
+        """
+        if ('X-Auth-Token' not in self.headers and
+                self.auth_uri and self.username and self.password):
+            with self._auth_lock:
+                if 'X-Auth-Token' not in self.headers:
+                    self.authenticate()
+        return self.headers.get('X-Auth-Token')
+
+    def authenticate(self):
+        """Authenticate with tempauth or KeyStone.
+
+        With :attr:`token_cache`, a token cached by another client or
+        process is reused until shortly before it expires.
+        """
+        if self.token_cache is None:
+            self._login()
+        else:
+            entry = self.token_cache.fetch(self._cache_key(), self._login)
+            self.headers['X-Auth-Token'] = entry['token']
+            self.catalog = entry.get('catalog')
+            self.uri = entry['uri']
+            self.expires = entry['expires']
+        self._route()
+
+    def _route(self):
+        """Route requests over the endpoints of the catalog."""
+        if self._endpoints:
+            # given endpoints take precedence over the catalog
+            return
+        if not self.catalog or len(self.catalog) < 2:
+            self.router = None
+            return
+        if (self.router is None or
+                self.router.urls() != [url for url, _ in self.catalog]):
+            # health of the endpoints is kept over re-authentication
+            self.router = Router(self.catalog, self.region)
+        self.router.bind(self._uri)
+
+    def refresh_token(self, stale_token):
+        """Re-authenticate once for the requests rejected with a token.
+
+        Concurrent callers wait for a single authentication: only the first
+        caller holding the stale token authenticates, the others find the
+        token already replaced.
+
+        :rtype: str
+        :return: new token, or ``None`` without credentials
+
+        :param str stale_token: token rejected with ``401 Unauthorized``
+        """
+        if not (self.auth_uri and self.username and self.password):
+            return None
+        with self._auth_lock:
+            if self.headers.get('X-Auth-Token') == stale_token:
+                if self.token_cache is not None:
+                    self.token_cache.invalidate(self._cache_key(),
+                                                token=stale_token)
+                self.authenticate()
+            return self.headers.get('X-Auth-Token')
+
+    def _cache_key(self):
+        """Build key of the token cache.
+
+        :rtype: str
+        :return: key of :class:`TokenCache <swiftsc.cache.TokenCache>`
+        """
+        if not self.tenant_name:
+            # tempauth has a single Storage URL
+            return TokenCache.key(self.auth_uri, self.username)
+        return TokenCache.key(self.auth_uri, self.username, self.tenant_name,
+                              self.interface, self.region)
+
+    def _login(self):
+        """Retrieve new token.
+
+        :rtype: dict
+        :return: entry of :class:`TokenCache <swiftsc.cache.TokenCache>`
+        """
+        if self.tenant_name:
+            # for KeyStone
+            _keystone_auth(self)
+        else:
+            # for tempauth
+            _temp_auth(self)
+        return {'token': self.headers['X-Auth-Token'],
+                'uri': self._uri,
+                'expires': self.expires,
+                'catalog': self.catalog}
+
+    def container(self, name):
+        """Create handle of a container.
+
+        Unlike :meth:`Container.container <Container.container>`, this does
+        not change shared state, so handles of one client may be used from
+        several threads.::
+
+            >>> with ThreadPoolExecutor(8) as executor:
+            ...     list(executor.map(
+            ...         lambda path: client.container('logs').object(
+            ...             os.path.basename(path)).create(file_path=path),
+            ...         paths))
+
+        :rtype: :class:`ContainerHandle <ContainerHandle>`
+        :return: handle of the container
+
+        :param str name: container name
+        """
+        return ContainerHandle(self, name)
+
+    def emit(self, event):
+        """Notify the hooks of an HTTP call.
+
+        Hooks are called in the thread of the request, so they must be
+        quick and must not raise.
+
+        :param event: :class:`RequestEvent <swiftsc.metrics.RequestEvent>`
+        """
+        for hook in self.hooks:
+            hook(event)
+
+    def capabilities(self):
+        """Retrieve capabilities of the cluster.
+
+        The result of ``/info`` is cached by the client. It is empty when
+        the cluster does not expose its capabilities.
+
+        :rtype: dict
+        :return: capabilities of middleware, such as ``bulk_delete``
+        """
+        if self._capabilities is None:
+            res = _http(self, self, 'GET', utils.info_uri(self.uri),
+                        operation='info.get')
+            self._capabilities = res.json() if res.ok else {}
+        return self._capabilities
+
+    def check_endpoints(self):
+        """Check health of the endpoints of the router.
+
+        This requests ``/healthcheck`` of every endpoint, so that an
+        endpoint which went down is avoided before a request fails, and one
+        which recovered is used again.
+
+        :rtype: dict
+        :return: health of the endpoints by Storage URL
+        """
+        if self.router is None:
+            return {}
+        self.ensure_authenticated()
+        health = {}
+        for endpoint in self.router.endpoints:
+            health[endpoint.uri] = self.router.probe(
+                endpoint, lambda url: _http(self, self, 'GET', url,
+                                            operation='healthcheck.get'))
+        return health
+
+    def close(self):
+        """Close the pooled connections of the session, and stop hedging."""
+        self.session.close()
+        if self.hedge is not None:
+            self.hedge.close()
+
+    def __enter__(self):
+        """Use client as context manager."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the pooled connections when leaving the context."""
+        self.close()
+
 
 class _CRUD(object):
     """The :class:`_CRUD <_CRUD>` object."""
@@ -169,14 +705,170 @@ class _CRUD(object):
         self.headers = None
         self.verify = True
         self.timeout = TIMEOUT
+        self.session = None
+        self.client = None
         """ Constructor of _CRUD """
 
-    def _set_path(self, path):
-        """Change endpoint.
+    def _request(self, method, uri, **kwargs):
+        """Send request over the shared session.
+
+        :rtype: `requests.Response`
+        :return: Response of the request
+
+        :param str method: HTTP method
+        :param str uri: request URL
+        :param **kwargs: keyword arguments of `requests.Session.request`
+        """
+        headers = kwargs.setdefault('headers', self.headers)
+        if 'X-Auth-Token' not in headers and self.client is not None:
+            # headers copied before the lazy authentication
+            token = self.client.ensure_authenticated()
+            if token is not None:
+                kwargs['headers'] = dict(headers, **{'X-Auth-Token': token})
+        object_cache = getattr(self.client, 'object_cache', None)
+        if object_cache is not None and method not in ('GET', 'HEAD'):
+            object_cache.discard(uri)
+        cache = getattr(self.client, 'response_cache', None)
+        if cache is not None and method not in ('GET', 'HEAD'):
+            # before and after the change, for concurrent reads
+            cache.invalidate(uri)
+            try:
+                return self._retry(method, uri, **kwargs)
+            finally:
+                cache.invalidate(uri)
+        return self._retry(method, uri, **kwargs)
+
+    def _retry(self, method, uri, **kwargs):
+        """Send request with the retry policy of the client.
+
+        :rtype: `requests.Response`
+        :return: Response of the request
+
+        :param str method: HTTP method
+        :param str uri: request URL
+        :param **kwargs: keyword arguments of `requests.Session.request`
+        """
+        retry = getattr(self.client, 'retry', None)
+        if retry is None:
+            return self._hedge(method, uri, **kwargs)
+        attempts = itertools.count()
+        return retry.call(lambda: self._hedge(method, uri,
+                                              retries=next(attempts),
+                                              **kwargs),
+                          method,
+                          data=kwargs.get('data'))
+
+    def _hedge(self, method, uri, retries=0, **kwargs):
+        """Send request with the hedging policy of the client.
+
+        :rtype: `requests.Response`
+        :return: the first response of the request and its hedge
+
+        :param str method: HTTP method
+        :param str uri: request URL
+        :param int retries: number of previous attempts of the request
+        :param **kwargs: keyword arguments of `requests.Session.request`
+        """
+        hedge = getattr(self.client, 'hedge', None)
+        if hedge is None:
+            return self._send(method, uri, retries, **kwargs)
+        return hedge.call(lambda: self._send(method, uri, retries, **kwargs),
+                          method)
+
+    def _cached_request(self, method, uri, params=None):
+        """Send request through the response cache of the client.
+
+        :rtype: `requests.Response`
+        :return: Response of the request, or the cached one
+
+        :param str method: ``GET`` or ``HEAD``
+        :param str uri: request URL
+        :param dict params: query parameters
+        """
+        cache = getattr(self.client, 'response_cache', None)
+        if cache is None:
+            return self._request(method, uri, params=params)
+        key = (method, uri, tuple(sorted((params or {}).items())))
+        cached, fresh = cache.get(key)
+        if fresh:
+            return cached
+        headers = self.headers
+        if cached is not None:
+            headers = dict(headers, **cache.conditional_headers(cached))
+        res = self._request(method, uri, params=params, headers=headers)
+        if cached is not None and res.status_code == 304:
+            cache.set(key, cached, revalidated=True)
+            return cached
+        if res.ok:
+            cache.set(key, res)
+        return res
+
+    def _send(self, method, uri, retries=0, **kwargs):
+        """Send request, refreshing the token once on 401.
+
+        :rtype: `requests.Response`
+        :return: Response of the request
+
+        :param str method: HTTP method
+        :param str uri: request URL
+        :param int retries: number of previous attempts of the request
+        :param **kwargs: keyword arguments of `requests.Session.request`
+        """
+        res = self._call(method, uri, retries, **kwargs)
+        if res.status_code != 401 or self.client is None:
+            return res
+        stale_token = kwargs['headers'].get('X-Auth-Token')
+        if not utils.rewind_body(kwargs.get('data')):
+            return res
+        token = self.client.refresh_token(stale_token)
+        if token is None:
+            return res
+        res.close()
+        headers = dict(kwargs['headers'])
+        headers['X-Auth-Token'] = token
+        kwargs['headers'] = headers
+        return self._call(method, uri, retries + 1, **kwargs)
+
+    def _call(self, method, uri, retries=0, **kwargs):
+        """Send single HTTP request through the governor and the router of
+        the client.
+
+        :rtype: `requests.Response`
+        :return: Response of the request
 
-        :param str path: the path of the endpoint URL.
+        :param str method: HTTP method
+        :param str uri: request URL
+        :param int retries: number of previous attempts of the request
+        :param **kwargs: keyword arguments of `requests.Session.request`
+        """
+        def send(url=uri):
+            return _http(self, self.client, method, url, retries=retries,
+                         **kwargs)
+
+        router = getattr(self.client, 'router', None)
+        if router is not None:
+            send = functools.partial(router.call, send, uri,
+                                     data=kwargs.get('data'))
+        governor = getattr(self.client, 'governor', None)
+        if governor is None:
+            return send()
+        return governor.call(send, size=_body_size(kwargs.get('data')))
+
+    def _concurrency(self, concurrency=None):
+        """Resolve number of concurrent requests of bulk and parallel modes.
+
+        :rtype: int
+        :return: ``concurrency``, or the maximum requests in flight of the
+                 governor of the client, or :data:`CONCURRENCY`
+
+        :param int concurrency: number given by the caller
         """
-        self.uri = "%(uri)s/%(path)s" % {"uri": self.uri, "path": path}
+        if concurrency:
+            return concurrency
+        governor = getattr(self.client, 'governor', None)
+        if governor is not None:
+            return governor.max_in_flight
+        return CONCURRENCY
 
     def no_verify(self):
         """Ignore SSL Cert Verification.
@@ -199,11 +891,66 @@ class _CRUD(object):
         :rtype: `requests.Response`
         :return: Response of list collection.
         """
-        return requests.get(self.uri,
-                            headers=self.headers,
-                            params={"format": "json"},
-                            verify=self.verify,
-                            timeout=self.timeout)
+        return self._cached_request('GET', self.uri,
+                                    params={"format": "json"})
+
+    def iter_list(self, prefix=None, delimiter=None, marker=None,
+                  end_marker=None, limit=LISTING_LIMIT):
+        """Iterate collection of resources page by page.
+
+        The listing follows ``marker`` over pages of ``limit`` entries, so it
+        is not truncated at 10,000 entries. The next page is fetched in the
+        background while the current one is consumed.::
+
+            >>> for obj in client.containers.objects.iter_list(prefix='logs/'):
+            ...     print(obj['name'])
+
+        :rtype: generator
+        :return: dict of each resource, or of each ``subdir`` with
+                 ``delimiter``
+
+        :param str prefix: list only names beginning with ``prefix``
+        :param str delimiter: roll up names containing ``delimiter``
+        :param str marker: list names after ``marker``
+        :param str end_marker: list names before ``end_marker``
+        :param int limit: number of entries of a page
+        """
+        params = {'format': 'json', 'limit': limit}
+        for key, value in (('prefix', prefix),
+                           ('delimiter', delimiter),
+                           ('end_marker', end_marker)):
+            if value is not None:
+                params[key] = value
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self._list_page, params, marker)
+            while future:
+                page = future.result()
+                if len(page) < limit:
+                    future = None
+                else:
+                    last = page[-1]
+                    future = executor.submit(self._list_page,
+                                             params,
+                                             last.get('name',
+                                                      last.get('subdir')))
+                for entry in page:
+                    yield entry
+
+    def _list_page(self, params, marker=None):
+        """Retrieve a page of listing.
+
+        :rtype: list
+        :return: entries of the page
+
+        :param dict params: query parameters of the listing
+        :param str marker: list names after ``marker``
+        """
+        if marker is not None:
+            params = dict(params, marker=marker)
+        res = _check_response(self._request('GET', self.uri, params=params))
+        if res.status_code == 204:
+            return []
+        return res.json()
 
     def detail(self, obj_id=None):
         """Show/Get a single resource.
@@ -215,11 +962,8 @@ class _CRUD(object):
         """
         if obj_id is None:
             raise KeyError
-        return requests.get("%(uri)s/%(id)s" % {"uri": self.uri,
-                                                "id": obj_id},
-                            headers=self.headers,
-                            verify=self.verify,
-                            timeout=self.timeout)
+        return self._request('GET', "%(uri)s/%(id)s" % {"uri": self.uri,
+                                                        "id": obj_id})
 
     def show_metadata(self, obj_id=None):
         """Show metadata.
@@ -231,11 +975,9 @@ class _CRUD(object):
         """
         if obj_id is None:
             raise KeyError
-        return requests.head("%(uri)s/%(id)s" % {"uri": self.uri,
-                                                 "id": obj_id},
-                             headers=self.headers,
-                             verify=self.verify,
-                             timeout=self.timeout)
+        return self._cached_request('HEAD',
+                                    "%(uri)s/%(id)s" % {"uri": self.uri,
+                                                        "id": obj_id})
 
     def create(self, **kwargs):
         """Create or replace resource.
@@ -246,12 +988,10 @@ class _CRUD(object):
         :param **kwargs: parameters
         """
         self._validate(**kwargs)
-        return requests.put('%(uri)s/%(id)s' % {'uri': self.uri,
-                                                'id': kwargs.get('name')},
-                            data=kwargs.get('data'),
-                            headers=self.headers,
-                            verify=self.verify,
-                            timeout=self.timeout)
+        return self._request('PUT',
+                             '%(uri)s/%(id)s' % {'uri': self.uri,
+                                                 'id': kwargs.get('name')},
+                             data=kwargs.get('data'))
 
     @staticmethod
     def _validate(**kwargs):
@@ -273,12 +1013,10 @@ class _CRUD(object):
         :param str obj_id: resource id (or resource name)
         :param **kwargs: keyword arguments of method
         """
-        return requests.post("%(uri)s/%(id)s" % {"uri": self.uri,
+        return self._request('POST',
+                             "%(uri)s/%(id)s" % {"uri": self.uri,
                                                  "id": obj_id},
-                             headers=self.headers,
-                             data=json.dumps(kwargs),
-                             verify=self.verify,
-                             timeout=self.timeout)
+                             data=json.dumps(kwargs))
 
     def delete(self, obj_id):
         """Delete resource.
@@ -290,11 +1028,8 @@ class _CRUD(object):
         """
         if obj_id is None:
             raise KeyError
-        return requests.delete("%(uri)s/%(id)s" % {"uri": self.uri,
-                                                   "id": obj_id},
-                               headers=self.headers,
-                               verify=self.verify,
-                               timeout=self.timeout)
+        return self._request('DELETE', "%(uri)s/%(id)s" % {"uri": self.uri,
+                                                           "id": obj_id})
 
 
 class Container(_CRUD):
@@ -314,14 +1049,21 @@ class Container(_CRUD):
 
     def __init__(self, obj):
         """constructor of Container."""
-        self.uri = obj.uri
         self.headers = obj.headers
         self.verify = obj.verify
         self.timeout = obj.timeout
+        self.session = obj.session
+        #: :class:`Client <Client>` of the container
+        self.client = obj
 
         self.container_name = None
         self.objects = None
 
+    @property
+    def uri(self):
+        """Swift Storage URL of the account."""
+        return self.client.uri
+
     def container(self, container_name):
         r"""Set container name and create instances.
 
@@ -330,11 +1072,39 @@ class Container(_CRUD):
 
         * objects: :class:`Object <Object>`
 
+        This changes the instance shared by the client; use
+        :meth:`Client.container <Client.container>` from several threads.
+
         :param str container_name: container name
         """
         self.container_name = container_name
         self.objects = Object(self)
 
+    def purge(self, name, concurrency=None, delete_container=False):
+        """Delete all objects of the container.
+
+        The names from the listing are streamed into bulk deletes.
+        See :meth:`Object.bulk_delete <Object.bulk_delete>`.::
+
+            >>> client.containers.purge('mycontainer')
+            {'deleted': 1201, 'not_found': 0, 'errors': []}
+
+        :rtype: dict
+        :return: numbers of deleted and not found objects, and errors
+
+        :param str name: container name
+        :param int concurrency: number of concurrent DELETE without bulk
+                                middleware
+        :param bool delete_container: delete the container too
+        """
+        objects = Object(self, name)
+        result = objects.bulk_delete((entry['name']
+                                      for entry in objects.iter_list()),
+                                     concurrency=concurrency)
+        if delete_container:
+            _check_response(self.delete(name))
+        return result
+
     def _validate(self, **kwargs):
         if kwargs.get('name') is None:
             raise ValidationError('name is None')
@@ -365,19 +1135,32 @@ class Object(_CRUD):
 
     """
 
-    def __init__(self, obj):
+    def __init__(self, obj, container_name=None):
         """Constructor of Object."""
-        if obj.container_name is None:
+        container_name = container_name or obj.container_name
+        if container_name is None:
             raise KeyError('Container name is None')
-        self.uri = obj.uri
         self.headers = obj.headers
         self.verify = obj.verify
         self.timeout = obj.timeout
+        self.session = obj.session
+        #: :class:`Client <Client>` of the object
+        self.client = obj.client
 
-        self.container_name = obj.container_name
-        self._set_path(self.container_name)
+        self.container_name = container_name
         self.object_name = None
 
+    @property
+    def account_uri(self):
+        """Swift Storage URL of the account."""
+        return self.client.uri
+
+    @property
+    def uri(self):
+        """URL of the container."""
+        return '%(uri)s/%(path)s' % {'uri': self.client.uri,
+                                     'path': self.container_name}
+
     def object(self, object_name):
         """Set object name.
 
@@ -385,59 +1168,355 @@ class Object(_CRUD):
         """
         self.object_name = object_name
 
+    def detail(self, obj_id=None):
+        """Get object.
+
+        With the object cache of the client, the body is read from the
+        local file of :meth:`fetch`. A failed response, such as
+        ``404 Not Found``, is returned as is.
+
+        :rtype: `requests.Response`
+        :return: Response of get object
+
+        :param str obj_id: object name
+        """
+        if obj_id is None:
+            raise KeyError
+        if self.client is None or self.client.object_cache is None:
+            return super(Object, self).detail(obj_id)
+        entry, res = self._fetch(obj_id, utils.CHUNK_SIZE)
+        if entry is None:
+            return res
+        res = requests.Response()
+        res.status_code = 200
+        res.reason = 'OK'
+        res.url = '%(uri)s/%(name)s' % dict(uri=self.uri, name=obj_id)
+        res.headers = requests.structures.CaseInsensitiveDict(
+            entry['headers'])
+        with open(entry['path'], 'rb') as fobj:
+            res.raw = BytesIO(fobj.read())
+        return res
+
+    def fetch(self, name, chunk_size=utils.CHUNK_SIZE):
+        """Retrieve object through the object cache of the client.
+
+        A cached body is used without request for ``stale_after`` seconds,
+        then revalidated with ``If-None-Match``. A new body is verified
+        against the ETag while it is stored.::
+
+            >>> with open(client.containers.objects.fetch('ref.bin'),
+            ...           'rb') as fobj:
+            ...     data = mmap.mmap(fobj.fileno(), 0,
+            ...                      access=mmap.ACCESS_READ)
+
+        :rtype: str
+        :return: path of local file holding the body, which must not be
+                 modified
+
+        :param str name: object name
+        :param int chunk_size: size of chunks written to the file
+        """
+        if self.client is None or self.client.object_cache is None:
+            raise ValidationError('object cache of client is not set')
+        entry, res = self._fetch(name, chunk_size)
+        if entry is None:
+            _check_response(res)
+        return entry['path']
+
+    def _fetch(self, name, chunk_size):
+        """Retrieve entry of object cache, downloading body if changed.
+
+        :rtype: tuple
+        :return: entry of :class:`ObjectCache <swiftsc.cache.ObjectCache>`
+                 and ``None``, or ``None`` and the failed response
+        """
+        cache = self.client.object_cache
+        uri = '%(uri)s/%(name)s' % dict(uri=self.uri, name=name)
+        entry = cache.get(uri)
+        if entry is not None and cache.fresh(entry):
+            return entry, None
+        headers = self.headers
+        if entry is not None and entry['etag']:
+            headers = dict(headers, **{'If-None-Match': entry['etag']})
+        res = self._request('GET', uri, headers=headers, stream=True)
+        if entry is not None and res.status_code == 304:
+            res.close()
+            cache.renew(uri)
+            return entry, None
+        if not res.ok:
+            return None, res
+        try:
+            chunks = res.raw.stream(chunk_size, decode_content=False)
+            checks = self._integrity_checks(name, res)
+            if checks:
+                chunks = utils.iter_verified(chunks, checks)
+            return cache.put(uri, res.headers, chunks), None
+        finally:
+            res.close()
+
     def create(self, **kwargs):
         """Create object.
 
+        The body is streamed in chunks of ``chunk_size`` bytes, so memory
+        use does not depend on the object size. A stream of unknown length
+        (pipe, socket) is sent with chunked transfer encoding.
+
         :param **kwargs: parameters for creating object
 
+        * name: object name (default: basename of ``file_path``)
+        * file_path: local file path, or file object such as stdin pipe
+        * chunk_size: size of chunks read from the file
+        * content_type: mimetype of the object (default: detected from the
+          extension or the content), ``False`` to let Swift decide
+        * etag: MD5 hex digest sent as ``ETag``, so that Swift rejects a
+          corrupted body with ``422``. ``True`` computes it from the local
+          file before the upload.
+
+        The ETag returned by Swift is compared with the MD5 computed while
+        the body is sent, and :class:`IntegrityError
+        <swiftsc.exception.IntegrityError>` is raised when they differ.
+
         :rtype: `requests.Response`
         :return: Response of create object
         """
         self._validate(**kwargs)
 
+        headers = copy.deepcopy(self.headers)
         name = kwargs.get('name')
-        if hasattr(kwargs.get('file_path'), 'fileno'):
-            # stdin pipe
-            mtype, length, data = utils.retrieve_info_from_buffer(
-                kwargs.get('file_path'))
-            self._set_content_length(length=length)
-            self._set_content_type(mtype)
-
-        elif kwargs.get('file_path'):
+        file_path = kwargs.get('file_path')
+        chunk_size = kwargs.get('chunk_size') or utils.CHUNK_SIZE
+        content_type = kwargs.get('content_type')
+        etag = kwargs.get('etag')
+        uri = '%(uri)s/%(name)s' % dict(uri=self.uri, name=name)
+        if etag is True and not hasattr(file_path, 'read'):
+            etag = utils.md5_file(file_path, chunk_size=chunk_size)
+        if etag and etag is not True:
+            headers['ETag'] = etag
+
+        if hasattr(file_path, 'read'):
+            # stdin pipe or file object
+            length = utils.stream_length(file_path)
+            head = file_path.read(chunk_size)
+            self._set_content_length(headers, length=length)
+            self._set_content_type(headers,
+                                   content_type,
+                                   name=name,
+                                   head=head)
+            data = utils.stream_body(file_path,
+                                     length=length,
+                                     chunk_size=chunk_size,
+                                     head=head)
+            return _check_etag(
+                self._request('PUT', uri, headers=headers, data=data),
+                data, name)
+
+        # local file
+        self._set_content_length(headers, file_path=file_path)
+        self._set_content_type(headers, content_type, file_path=file_path)
+        if name is None:
+            name = os.path.basename(file_path)
+            uri = '%(uri)s/%(name)s' % dict(uri=self.uri, name=name)
+        with open(file_path, 'rb') as fobj:
+            data = utils.stream_body(fobj,
+                                     length=os.path.getsize(file_path),
+                                     chunk_size=chunk_size)
+            return _check_etag(
+                self._request('PUT', uri, headers=headers, data=data),
+                data, name)
+
+    def create_large(self, **kwargs):
+        """Create Static Large Object.
+
+        The source is split into segments, which are uploaded concurrently
+        to the segment container, then the SLO manifest is created. A local
+        file not larger than ``segment_size`` is created as a normal object.
+        Segments of a stream are spooled to temporary files, so memory use
+        stays bounded.::
+
+            >>> client.containers.objects.create_large(
+            ...     file_path='/tmp/backup.tar', segment_size=1024 ** 3,
+            ...     concurrency=8)
+            <Response [201]>
+
+        :param **kwargs: parameters for creating object
+
+        * name: object name (default: basename of ``file_path``)
+        * file_path: local file path, or file object such as stdin pipe
+        * segment_size: size of segments (default: 100 MiB)
+        * concurrency: number of concurrent segment uploads
+        * segment_container: container of segments
+          (default: ``<container>_segments``)
+        * chunk_size: size of chunks read from the file
+        * content_type: mimetype of the object, ``False`` to let Swift
+          decide
+
+        :rtype: `requests.Response`
+        :return: Response of create manifest
+        """
+        self._validate(**kwargs)
+
+        headers = copy.deepcopy(self.headers)
+        name = kwargs.get('name')
+        file_path = kwargs.get('file_path')
+        segment_size = kwargs.get('segment_size') or SEGMENT_SIZE
+        concurrency = self._concurrency(kwargs.get('concurrency'))
+        segment_container = (kwargs.get('segment_container') or
+                             '%s_segments' % self.container_name)
+        chunk_size = kwargs.get('chunk_size') or utils.CHUNK_SIZE
+        content_type = kwargs.get('content_type')
+
+        if hasattr(file_path, 'read'):
+            # stdin pipe or file object
+            head = file_path.read(chunk_size)
+            self._set_content_type(headers,
+                                   content_type,
+                                   name=name,
+                                   head=head)
+            segments = utils.iter_stream_segments(file_path,
+                                                  segment_size,
+                                                  chunk_size=chunk_size,
+                                                  head=head)
+        else:
             # local file
-            self._set_content_length(file_path=kwargs.get('file_path'))
-            self._set_content_type(file_path=kwargs.get('file_path'))
             if name is None:
-                name = os.path.basename(kwargs.get('file_path'))
-            with open(kwargs.get('file_path'), 'rb') as fobj:
-                data = fobj.read()
+                name = os.path.basename(file_path)
+            if os.path.getsize(file_path) <= segment_size:
+                return self.create(name=name,
+                                   file_path=file_path,
+                                   chunk_size=chunk_size,
+                                   content_type=content_type)
+            self._set_content_type(headers, content_type, file_path=file_path)
+            segments = utils.iter_file_segments(file_path, segment_size)
+
+        _check_response(self._request('PUT', '%(uri)s/%(cont)s' % {
+            'uri': self.account_uri, 'cont': segment_container}))
+
+        prefix = '%(name)s/slo/%(stamp)f/%(size)d' % {
+            'name': name, 'stamp': time.time(), 'size': segment_size}
+        manifest = self._upload_segments(segments,
+                                         segment_container,
+                                         prefix,
+                                         concurrency,
+                                         chunk_size)
+        return self._request('PUT',
+                             '%(uri)s/%(name)s' % dict(uri=self.uri,
+                                                       name=name),
+                             headers=headers,
+                             params={'multipart-manifest': 'put'},
+                             data=json.dumps(manifest))
+
+    def _upload_segments(self, segments, segment_container, prefix,
+                         concurrency, chunk_size):
+        """Upload segments concurrently.
+
+        At most ``concurrency`` segments are read ahead of the uploads.
+
+        :rtype: list
+        :return: SLO manifest of the segments
+
+        :param segments: iterable of segments
+        :param str segment_container: container of segments
+        :param str prefix: prefix of segment names
+        :param int concurrency: number of concurrent uploads
+        :param int chunk_size: size of chunks read from the segments
+        """
+        futures = []
+        pending = set()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for index, segment in enumerate(segments):
+                future = executor.submit(
+                    self._put_segment,
+                    '%(cont)s/%(prefix)s/%(index)08d' % {
+                        'cont': segment_container,
+                        'prefix': prefix,
+                        'index': index},
+                    segment,
+                    chunk_size)
+                futures.append(future)
+                pending.add(future)
+                if len(pending) >= concurrency:
+                    done, pending = wait(pending,
+                                         return_when=FIRST_COMPLETED)
+                    for finished in done:
+                        # stop reading segments as soon as an upload failed
+                        finished.result()
+        return [future.result() for future in futures]
+
+    def _put_segment(self, path, segment, chunk_size):
+        """Upload a segment.
 
-        return requests.put('%(uri)s/%(name)s' % dict(uri=self.uri, name=name),
-                            headers=self.headers,
-                            data=data,
-                            verify=self.verify,
-                            timeout=self.timeout)
+        :rtype: dict
+        :return: SLO manifest entry of the segment
 
-    def _set_content_length(self, length=None, file_path=None):
+        :param str path: path of segment from the account
+        :param segment: :class:`utils.FileSegment <swiftsc.utils.FileSegment>`
+                        or :class:`utils.SpooledSegment
+                        <swiftsc.utils.SpooledSegment>`
+        :param int chunk_size: size of chunks read from the segment
+        """
+        headers = copy.deepcopy(self.headers)
+        headers.pop('Content-Type', None)
+        self._set_content_length(headers, length=segment.length)
+        if segment.etag:
+            headers['ETag'] = segment.etag
+        fobj = segment.open()
+        try:
+            data = utils.stream_body(fobj,
+                                     length=segment.length,
+                                     chunk_size=chunk_size)
+            res = _check_etag(_check_response(
+                self._request('PUT',
+                              '%(uri)s/%(path)s' % {'uri': self.account_uri,
+                                                    'path': path},
+                              headers=headers,
+                              data=data)), data, path)
+        finally:
+            fobj.close()
+        return {'path': '/%s' % path,
+                'etag': res.headers.get('Etag'),
+                'size_bytes': segment.length}
+
+    @staticmethod
+    def _set_content_length(headers, length=None, file_path=None):
         """Set 'Content-Length' to HTTP headers.
 
-        :param int lengthh: content length
+        Without a length the header is removed, which makes the body
+        sent with chunked transfer encoding.
+
+        :param dict headers: HTTP headers of the request
+        :param int length: content length
         :param str file_path: local file path
         """
-        if length:
-            self.headers['Content-Length'] = str(length)
+        if length is not None:
+            headers['Content-Length'] = str(length)
         elif file_path:
-            self.headers['Content-Length'] = str(os.path.getsize(file_path))
+            headers['Content-Length'] = str(os.path.getsize(file_path))
+        else:
+            headers.pop('Content-Length', None)
 
-    def _set_content_type(self, mimetype=None, file_path=None):
+    @staticmethod
+    def _set_content_type(headers, mimetype=None, file_path=None, name=None,
+                          head=None):
         """Set 'Content-Type' to HTTP headers.
 
+        Without ``mimetype``, it is detected from ``file_path``, or from
+        ``name`` and ``head`` of a stream.
+
+        :param dict headers: HTTP headers of the request
+        :param str mimetype: mimetype, ``False`` to remove the header
         :param str file_path: local file path
+        :param str name: object name of a stream
+        :param bytes head: leading bytes of a stream
         """
-        if mimetype:
-            self.headers['Content-Type'] = mimetype
+        if mimetype is False:
+            headers.pop('Content-Type', None)
+        elif mimetype:
+            headers['Content-Type'] = mimetype
         elif file_path:
-            self.headers['Content-Type'] = utils.check_mimetype(file_path)
+            headers['Content-Type'] = utils.check_mimetype(file_path)
+        elif head is not None:
+            headers['Content-Type'] = utils.check_mimetype_buffer(
+                BytesIO(head), name=name)
 
     def copy(self, src_object_name, dest_object_name):
         """Copy object.
@@ -455,7 +1534,869 @@ class Object(_CRUD):
             '%(uri)s/%(obj)s' % {'uri': self.uri,
                                  'obj': dest_object_name})
 
-        return requests.put(uri,
-                            headers=headers,
-                            verify=self.verify,
-                            timeout=self.timeout)
+        return self._request('PUT', uri, headers=headers)
+
+    def iter_content(self, name, chunk_size=utils.CHUNK_SIZE):
+        """Iterate object body in chunks.
+
+        The body is read from the connection as it is consumed, so only one
+        chunk is held in memory. It is not decoded even if the object has
+        ``Content-Encoding``.::
+
+            >>> for chunk in client.containers.objects.iter_content('dummy'):
+            ...     sys.stdout.buffer.write(chunk)
+
+        :rtype: generator
+        :return: chunks of object body
+
+        :param str name: object name
+        :param int chunk_size: size of chunks
+        """
+        res = _check_response(
+            self._request('GET',
+                          '%(uri)s/%(name)s' % dict(uri=self.uri, name=name),
+                          stream=True))
+        try:
+            for chunk in res.raw.stream(chunk_size, decode_content=False):
+                yield chunk
+        finally:
+            res.close()
+
+    def download(self, name, dest, chunk_size=utils.CHUNK_SIZE):
+        """Download object body in chunks.
+
+        The body is verified against the ETag, or against the segments of
+        the SLO manifest, while it is written.::
+
+            >>> client.containers.objects.download('dummy', '/tmp/dummy.txt')
+            <Response [200]>
+
+        :rtype: `requests.Response`
+        :return: Response of get object, of which body is consumed
+
+        :param str name: object name
+        :param dest: local file path, writable file object or callable
+        :param int chunk_size: size of chunks
+        """
+        res = _check_response(
+            self._request('GET',
+                          '%(uri)s/%(name)s' % dict(uri=self.uri, name=name),
+                          stream=True))
+        try:
+            chunks = res.raw.stream(chunk_size, decode_content=False)
+            checks = self._integrity_checks(name, res)
+            if checks:
+                chunks = utils.iter_verified(chunks, checks)
+            utils.write_chunks(chunks, dest)
+        finally:
+            res.close()
+        return res
+
+    def download_parallel(self, name, dest, **kwargs):
+        """Download object in parallel byte ranges.
+
+        The object size is retrieved by HEAD, then byte ranges are
+        downloaded concurrently and written at their offsets of the local
+        file, which is preallocated. The ranges of an SLO are aligned with
+        its segments, which are verified against the manifest while they
+        are written. Other objects are verified against the ETag, hashing
+        the ranges in order as soon as they are written.::
+
+            >>> client.containers.objects.download_parallel(
+            ...     'backup.tar', '/tmp/backup.tar', concurrency=8)
+            <Response [200]>
+
+        :rtype: `requests.Response`
+        :return: Response of show metadata of the object
+
+        :param str name: object name
+        :param str dest: local file path
+        :param **kwargs: parameters for downloading object
+
+        * part_size: size of byte ranges (default: 64 MiB)
+        * concurrency: number of concurrent range requests
+        * chunk_size: size of chunks written to the file
+        """
+        part_size = kwargs.get('part_size') or PART_SIZE
+        concurrency = self._concurrency(kwargs.get('concurrency'))
+        chunk_size = kwargs.get('chunk_size') or utils.CHUNK_SIZE
+
+        # not cached, the ETag must be the one of the ranges
+        res = _check_response(
+            self._request('HEAD',
+                          '%(uri)s/%(name)s' % dict(uri=self.uri, name=name)))
+        size = int(res.headers.get('Content-Length', 0))
+        checks = self._integrity_checks(name, res, size)
+        md5 = None
+        if checks and (len(checks) > 1 or size <= part_size):
+            # each range holds whole segments verified while written
+            ranges = list(utils.iter_check_ranges(checks, part_size))
+        else:
+            ranges = [(first, last, None)
+                      for first, last in utils.iter_ranges(size, part_size)]
+            if checks:
+                md5 = hashlib.md5()
+        with open(dest, 'wb') as fobj:
+            fobj.truncate(size)
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = [executor.submit(self._get_range,
+                                           name, dest, first, last,
+                                           size, chunk_size, range_checks)
+                           for first, last, range_checks in ranges]
+                for future, (first, last, _) in zip(futures, ranges):
+                    future.result()
+                    if md5 is not None:
+                        # the range is still in the page cache
+                        with open(dest, 'rb') as fobj:
+                            fobj.seek(first)
+                            for chunk in utils.FileStream(
+                                    fobj, length=last - first + 1,
+                                    chunk_size=chunk_size):
+                                md5.update(chunk)
+            if md5 is not None and md5.hexdigest() != checks[0][1]:
+                raise IntegrityError('%s is corrupted' % name)
+        except Exception:
+            os.remove(dest)
+            raise
+        return res
+
+    def _get_range(self, name, dest, first, last, size, chunk_size,
+                   checks=None):
+        """Download byte range and write it at its offset.
+
+        A response other than ``206 Partial Content`` is rejected before
+        writing, unless the range is the whole object, since the full body
+        would overwrite the parts of the other ranges.
+
+        :param str name: object name
+        :param str dest: local file path
+        :param int first: first byte position
+        :param int last: last byte position
+        :param int size: content length of the object
+        :param int chunk_size: size of chunks written to the file
+        :param list checks: parts of the range verified while written, see
+                            :func:`utils.iter_verified
+                            <swiftsc.utils.iter_verified>`
+        """
+        headers = copy.deepcopy(self.headers)
+        headers['Range'] = 'bytes=%d-%d' % (first, last)
+        res = _check_response(
+            self._request('GET',
+                          '%(uri)s/%(name)s' % dict(uri=self.uri, name=name),
+                          headers=headers,
+                          stream=True))
+        if res.status_code != 206 and (first, last) != (0, size - 1):
+            res.close()
+            raise ResponseError('range %d-%d of %s is not honored: %d'
+                                % (first, last, name, res.status_code),
+                                response=res)
+        try:
+            chunks = res.raw.stream(chunk_size, decode_content=False)
+            if checks:
+                chunks = utils.iter_verified(chunks, checks)
+            with open(dest, 'r+b') as fobj:
+                fobj.seek(first)
+                written = utils.write_chunks(chunks, fobj)
+        finally:
+            res.close()
+        if written != last - first + 1:
+            raise ResponseError('incomplete range %d-%d of %s'
+                                % (first, last, name), response=res)
+
+    def _integrity_checks(self, name, res, size=None):
+        """Retrieve checksums to verify object content.
+
+        Dynamic Large Objects are not verified, as their ETag is not the
+        checksum of the content, neither are SLOs with ranged or nested
+        segments.
+
+        :rtype: list
+        :return: length, hex digest of MD5 and name of each part, ``None``
+                 when the content cannot be verified
+
+        :param str name: object name
+        :param res: Response of get or show metadata of the object
+        :param int size: content length, ``None`` if unknown
+        """
+        if res.headers.get('X-Object-Manifest'):
+            return None
+        if res.headers.get('X-Static-Large-Object', '').lower() == 'true':
+            manifest = _check_response(
+                self._request('GET',
+                              '%(uri)s/%(name)s' % dict(uri=self.uri,
+                                                        name=name),
+                              params={'multipart-manifest': 'get'})).json()
+            if any(segment.get('range') or segment.get('sub_slo')
+                   for segment in manifest):
+                # the offsets and checksums of ranged or nested segments
+                # are not given by the manifest
+                return None
+            return [(segment['bytes'], segment['hash'], segment['name'])
+                    for segment in manifest]
+        etag = res.headers.get('Etag', '').strip('"')
+        return [(size, etag, name)] if etag else None
+
+    def bulk_delete(self, names, concurrency=None):
+        """Delete objects with bulk delete middleware.
+
+        Names are sent in batches of up to 10,000 paths (or the
+        ``max_deletes_per_request`` of the cluster). Without the middleware,
+        objects are deleted by concurrent DELETE requests.::
+
+            >>> client.containers.objects.bulk_delete(['dummy', 'dummy2'])
+            {'deleted': 2, 'not_found': 0, 'errors': []}
+
+        :rtype: dict
+        :return: numbers of deleted and not found objects, and errors as
+                 list of path and status
+
+        :param names: iterable of object names
+        :param int concurrency: number of concurrent DELETE without bulk
+                                middleware
+        """
+        concurrency = self._concurrency(concurrency)
+        result = {'deleted': 0, 'not_found': 0, 'errors': []}
+        bulk = self.client.capabilities().get('bulk_delete')
+        if bulk is None:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                for batch in utils.iter_batches(names, concurrency * 4):
+                    paths = [utils.quote_path(self.container_name, name)
+                             for name in batch]
+                    try:
+                        for path, res in zip(paths, executor.map(
+                                self._delete_path, paths)):
+                            _count_deleted(result, path, res.status_code,
+                                           res.reason)
+                    finally:
+                        self._discard_cached(batch)
+            return result
+
+        headers = copy.deepcopy(self.headers)
+        headers['Accept'] = 'application/json'
+        headers['Content-Type'] = 'text/plain'
+        batch_size = bulk.get('max_deletes_per_request', LISTING_LIMIT)
+        for batch in utils.iter_batches(names, batch_size):
+            paths = [utils.quote_path(self.container_name, name)
+                     for name in batch]
+            try:
+                res = _check_response(
+                    self._request('POST', self.account_uri,
+                                  headers=headers,
+                                  params={'bulk-delete': 'true'},
+                                  data='\n'.join(paths))).json()
+            finally:
+                self._discard_cached(batch)
+            result['deleted'] += res.get('Number Deleted', 0)
+            result['not_found'] += res.get('Number Not Found', 0)
+            result['errors'].extend(_bulk_errors(res, paths))
+        return result
+
+    def _discard_cached(self, names, uri=None):
+        """Remove objects changed by a request of several objects from the
+        object cache of the client.
+
+        :param names: object names
+        :param str uri: URL of the container or of the prefix under which
+                        the objects are named (default: the container)
+        """
+        cache = getattr(self.client, 'object_cache', None)
+        if cache is None:
+            return
+        uri = uri or self.uri
+        for name in names:
+            # same key as _fetch
+            cache.discard('%(uri)s/%(name)s' % dict(uri=uri, name=name))
+
+    def _delete_path(self, path):
+        """Delete object by path of account.
+
+        :rtype: `requests.Response`
+        :return: Response of deleting object
+
+        :param str path: URL-encoded path such as ``/container/object``
+        """
+        return self._request('DELETE', self.account_uri + path)
+
+    def bulk_upload(self, paths, prefix=None, **kwargs):
+        """Upload files with extract archive middleware.
+
+        Files are packed into a tar stream on the fly, without temporary
+        file, and each batch is extracted by Swift from a single PUT. Object
+        types are guessed by Swift from the extensions.::
+
+            >>> client.containers.objects.bulk_upload('/tmp/thumbnails',
+            ...                                       prefix='thumbs')
+            {'created': 100000, 'errors': []}
+
+        :rtype: dict
+        :return: number of created objects, and errors as list of path and
+                 status
+
+        :param paths: directory path, or iterable of file paths or of tuples
+                      of file path and object name
+        :param str prefix: prefix of object names
+        :param **kwargs: parameters for uploading files
+
+        * batch_size: maximum size of files of an archive (default: 256 MiB)
+        * batch_count: maximum number of files of an archive
+          (default: 10,000)
+        * chunk_size: size of chunks read from the files
+        """
+        batch_size = kwargs.get('batch_size') or BULK_BATCH_SIZE
+        batch_count = kwargs.get('batch_count') or LISTING_LIMIT
+        chunk_size = kwargs.get('chunk_size') or utils.CHUNK_SIZE
+
+        uri = self.uri
+        if prefix:
+            uri = '%(uri)s/%(prefix)s' % dict(uri=uri,
+                                              prefix=prefix.strip('/'))
+        headers = copy.deepcopy(self.headers)
+        headers['Accept'] = 'application/json'
+        headers.pop('Content-Type', None)
+        headers.pop('Content-Length', None)
+
+        result = {'created': 0, 'errors': []}
+        for batch in utils.iter_size_batches(utils.iter_local_files(paths),
+                                             batch_size,
+                                             batch_count):
+            try:
+                res = _check_response(
+                    self._request('PUT', uri,
+                                  headers=headers,
+                                  params={'extract-archive': 'tar'},
+                                  data=utils.iter_tar(batch,
+                                                      chunk_size))).json()
+            finally:
+                self._discard_cached([name for _, name, _ in batch], uri)
+            result['created'] += res.get('Number Files Created', 0)
+            result['errors'].extend(
+                _bulk_errors(res, [name for _, name, _ in batch]))
+        return result
+
+    def upload_tree(self, local_dir, prefix=None, **kwargs):
+        """Upload directory tree concurrently.
+
+        Objects are named after the relative paths of the files under
+        ``prefix``.::
+
+            >>> client.containers.objects.upload_tree('/var/backup',
+            ...                                       prefix='backup')
+            {'transferred': 120, 'bytes': 3758096384, 'errors': []}
+
+        :rtype: dict
+        :return: number of objects and bytes transferred, and errors as list
+                 of object name and error
+
+        :param str local_dir: local directory path
+        :param str prefix: prefix of object names
+        :param **kwargs: parameters for transferring objects
+
+        * concurrency: number of concurrent uploads
+        * max_bytes: maximum size of files uploaded at once (default: 1 GiB)
+        * progress: callable called with object name, size and error (or
+          ``None``) when each object is done, from the worker threads
+        * chunk_size: size of chunks read from the files
+        """
+        chunk_size = kwargs.get('chunk_size') or utils.CHUNK_SIZE
+
+        def _tasks():
+            for file_path, name in utils.iter_local_files(local_dir):
+                if prefix:
+                    name = '%s/%s' % (prefix.rstrip('/'), name)
+                yield (name, os.path.getsize(file_path),
+                       self._upload_file, (name, file_path, chunk_size))
+
+        return self._transfer(_tasks(), **kwargs)
+
+    def _upload_file(self, name, file_path, chunk_size):
+        """Upload local file, raising error when it failed."""
+        _check_response(self.create(name=name,
+                                    file_path=file_path,
+                                    chunk_size=chunk_size))
+
+    def sync(self, local_dir, prefix=None, **kwargs):
+        """Synchronize directory tree to objects.
+
+        Local files are compared with the listing of objects under the
+        ``prefix`` directory, then only new and changed files are uploaded,
+        and objects of removed files are deleted. The MD5 of local files is
+        kept in a :class:`HashIndex <swiftsc.cache.HashIndex>`, so only files
+        changed since the last run are hashed, in a process pool.::
+
+            >>> client.containers.objects.sync('/var/backup', prefix='backup')
+            {'uploaded': 3, 'unchanged': 117, 'deleted': 1,
+             'bytes': 3145728, 'errors': []}
+
+        :rtype: dict
+        :return: numbers of uploaded, unchanged and deleted objects, bytes
+                 uploaded, and errors as list of object name and error
+
+        :param str local_dir: local directory path
+        :param str prefix: prefix of object names
+        :param **kwargs: parameters for synchronizing objects, and the ones
+                         of :meth:`upload_tree`
+
+        * delete: delete objects of removed files (default: ``True``)
+        * index: path of the hash index
+          (default: under ``~/.cache/swiftsc/index``)
+        * processes: number of processes hashing files
+          (default: number of CPUs)
+        """
+        chunk_size = kwargs.get('chunk_size') or utils.CHUNK_SIZE
+        prefix = '%s/' % prefix.rstrip('/') if prefix else ''
+        remote = dict((entry['name'], entry)
+                      for entry in self.iter_list(prefix=prefix or None)
+                      if 'name' in entry)
+        files = []
+        for file_path, name in utils.iter_local_files(local_dir):
+            fstat = os.stat(file_path)
+            files.append((file_path, prefix + name, fstat.st_size,
+                          file_mtime(fstat)))
+
+        index = HashIndex(kwargs.get('index'), local_dir=local_dir)
+        try:
+            hashes = self._hash_files(
+                index,
+                [entry for entry in files
+                 if remote.get(entry[1], {}).get('bytes') == entry[2]],
+                kwargs.get('processes'))
+            changed = [entry for entry in files
+                       if hashes.get(entry[0]) is None or
+                       hashes[entry[0]] != remote[entry[1]].get('hash')]
+            uploaded = []
+
+            def _tasks():
+                for file_path, name, size, mtime in changed:
+                    yield (name, size, self._sync_file,
+                           (name, file_path, size, mtime, chunk_size,
+                            uploaded))
+
+            result = self._transfer(_tasks(), **kwargs)
+            index.update(uploaded)
+        finally:
+            index.close()
+
+        result = {'uploaded': result['transferred'],
+                  'unchanged': len(files) - len(changed),
+                  'deleted': 0,
+                  'bytes': result['bytes'],
+                  'errors': result['errors']}
+        local = set(entry[1] for entry in files)
+        removed = [name for name, entry in sorted(remote.items())
+                   if name not in local and not name.endswith('/') and
+                   entry.get('content_type') != 'application/directory']
+        if removed and kwargs.get('delete', True):
+            deleted = self.bulk_delete(removed)
+            result['deleted'] = deleted['deleted'] + deleted['not_found']
+            result['errors'].extend(deleted['errors'])
+        return result
+
+    @staticmethod
+    def _hash_files(index, files, processes=None):
+        """Retrieve MD5 of local files, hashing the ones not indexed.
+
+        :rtype: dict
+        :return: hex digest of MD5 by file path
+
+        :param index: :class:`HashIndex <swiftsc.cache.HashIndex>`
+        :param list files: tuples of file path, object name, size and mtime
+        :param int processes: number of processes hashing files
+        """
+        hashes = {}
+        missing = []
+        for file_path, _, size, mtime in files:
+            hashes[file_path] = index.get(file_path, size, mtime)
+            if hashes[file_path] is None:
+                missing.append((file_path, size, mtime))
+        if not missing:
+            return hashes
+        # imported on use, for fast startup
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            digests = list(executor.map(utils.md5_file,
+                                        [entry[0] for entry in missing]))
+        index.update((file_path, size, mtime, digest)
+                     for (file_path, size, mtime), digest
+                     in zip(missing, digests))
+        hashes.update((entry[0], digest)
+                      for entry, digest in zip(missing, digests))
+        return hashes
+
+    def _sync_file(self, name, file_path, size, mtime, chunk_size, uploaded):
+        """Upload local file, recording its MD5 for the hash index."""
+        res = _check_response(self.create(name=name,
+                                          file_path=file_path,
+                                          chunk_size=chunk_size))
+        etag = res.headers.get('Etag', '').strip('"')
+        if etag:
+            # verified against the MD5 computed while uploading
+            uploaded.append((file_path, size, mtime, etag))
+
+    def download_tree(self, prefix, local_dir, **kwargs):
+        """Download objects into directory tree concurrently.
+
+        Objects under the ``prefix`` directory are listed page by page, and
+        saved at their names relative to it. Directory markers are skipped.::
+
+            >>> client.containers.objects.download_tree('backup',
+            ...                                         '/var/restore')
+            {'transferred': 120, 'bytes': 3758096384, 'errors': []}
+
+        :rtype: dict
+        :return: number of objects and bytes transferred, and errors as list
+                 of object name and error
+
+        :param str prefix: prefix of object names
+        :param str local_dir: local directory path
+        :param **kwargs: parameters for transferring objects, the same as
+                         :meth:`upload_tree`
+        """
+        chunk_size = kwargs.get('chunk_size') or utils.CHUNK_SIZE
+        root = os.path.abspath(local_dir)
+        # the prefix is a directory, so that "backupX/y" is not under "backup"
+        prefix = '%s/' % prefix.rstrip('/') if prefix else ''
+
+        def _tasks():
+            for entry in self.iter_list(prefix=prefix or None):
+                name = entry['name']
+                if (name.endswith('/') or
+                        entry.get('content_type') == 'application/directory'):
+                    continue
+                relpath = name[len(prefix):]
+                yield (name, entry.get('bytes', 0),
+                       self._download_file,
+                       (name, os.path.join(root, *relpath.split('/')), root,
+                        chunk_size))
+
+        return self._transfer(_tasks(), **kwargs)
+
+    def _download_file(self, name, file_path, root, chunk_size):
+        """Download object into local file under root directory."""
+        file_path = os.path.abspath(file_path)
+        if not file_path.startswith(root + os.sep):
+            raise ValidationError('%s is outside of %s' % (name, root))
+        dirname = os.path.dirname(file_path)
+        if not os.path.isdir(dirname):
+            try:
+                os.makedirs(dirname)
+            except OSError:
+                # created by another worker
+                if not os.path.isdir(dirname):
+                    raise
+        self.download(name, file_path, chunk_size)
+
+    def _transfer(self, tasks, **kwargs):
+        """Run transfers over thread pool.
+
+        Reading ``tasks`` is suspended while the objects in flight exceed
+        ``max_bytes``, or twice ``concurrency`` objects are queued.
+
+        :rtype: dict
+        :return: number of objects and bytes transferred, and errors
+
+        :param tasks: iterable of tuples of object name, size, function and
+                      its arguments
+        :param **kwargs: parameters of :meth:`upload_tree`
+        """
+        concurrency = self._concurrency(kwargs.get('concurrency'))
+        budget = utils.ByteBudget(kwargs.get('max_bytes') or
+                                  MAX_BYTES_IN_FLIGHT)
+        progress = kwargs.get('progress')
+        queued = threading.BoundedSemaphore(concurrency * 2)
+        lock = threading.Lock()
+        result = {'transferred': 0, 'bytes': 0, 'errors': []}
+
+        def _run(name, size, func, args):
+            error = None
+            try:
+                func(*args)
+            except Exception as exc:  # pylint: disable=broad-except
+                error = exc
+            finally:
+                budget.release(size)
+                queued.release()
+            with lock:
+                if error is None:
+                    result['transferred'] += 1
+                    result['bytes'] += size
+                else:
+                    result['errors'].append([name, error])
+            if progress:
+                progress(name, size, error)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for name, size, func, args in tasks:
+                queued.acquire()
+                budget.acquire(size)
+                executor.submit(_run, name, size, func, args)
+        return result
+
+
+class ContainerHandle(object):
+    """Immutable handle of a container.
+
+    A handle only holds the client and the container name, so it is cheap
+    to create and safe to share between threads. Each request builds its
+    own headers from the client, whose session and token are shared.::
+
+        >>> bucket = client.container('mycontainer')
+        >>> bucket.object('dummy').create(file_path='/tmp/dummy.txt')
+        <Response [201]>
+
+    :param client: :class:`Client <Client>` of the container
+    :param str name: container name
+    """
+
+    __slots__ = ('client', 'name')
+
+    def __init__(self, client, name):
+        """Constructor of ContainerHandle."""
+        if name is None:
+            raise ValidationError('name is None')
+        object.__setattr__(self, 'client', client)
+        object.__setattr__(self, 'name', name)
+
+    def __setattr__(self, name, value):
+        """Reject changes, handles are immutable."""
+        raise AttributeError('%s is immutable' % type(self).__name__)
+
+    def __delattr__(self, name):
+        """Reject changes, handles are immutable."""
+        raise AttributeError('%s is immutable' % type(self).__name__)
+
+    def __repr__(self):
+        return '<%s %s>' % (type(self).__name__, self.name)
+
+    @property
+    def objects(self):
+        """:class:`Object <Object>` of the container, new on each access."""
+        return Object(self.client.containers, self.name)
+
+    def object(self, name):
+        """Create handle of an object of the container.
+
+        :rtype: :class:`ObjectHandle <ObjectHandle>`
+        :return: handle of the object
+
+        :param str name: object name
+        """
+        return ObjectHandle(self, name)
+
+    def create(self, data=None):
+        """Create container.
+
+        :rtype: `requests.Response`
+        :return: Response of create container
+        """
+        return self.client.containers.create(name=self.name, data=data)
+
+    def detail(self):
+        """List object names of the container.
+
+        :rtype: `requests.Response`
+        :return: Response of get container
+        """
+        return self.client.containers.detail(self.name)
+
+    def show_metadata(self):
+        """Show metadata of the container.
+
+        :rtype: `requests.Response`
+        :return: Response of head container
+        """
+        return self.client.containers.show_metadata(self.name)
+
+    def update_metadata(self, **kwargs):
+        """Update metadata of the container.
+
+        :rtype: `requests.Response`
+        :return: Response of post container
+        """
+        return self.client.containers.update_metadata(self.name, **kwargs)
+
+    def delete(self):
+        """Delete container.
+
+        :rtype: `requests.Response`
+        :return: Response of delete container
+        """
+        return self.client.containers.delete(self.name)
+
+    def purge(self, **kwargs):
+        """Delete all objects of the container.
+
+        See :meth:`Container.purge <Container.purge>`.
+
+        :rtype: dict
+        :return: numbers of deleted and not found objects, and errors
+        """
+        return self.client.containers.purge(self.name, **kwargs)
+
+    def list(self):
+        """List objects of the container.
+
+        :rtype: `requests.Response`
+        :return: Response of list objects
+        """
+        return self.objects.list()
+
+    def iter_list(self, **kwargs):
+        """Iterate objects of the container page by page.
+
+        See :meth:`Object.iter_list <Object.iter_list>`.
+
+        :rtype: generator
+        :return: dict of each object
+        """
+        return self.objects.iter_list(**kwargs)
+
+
+class ObjectHandle(object):
+    """Immutable handle of an object.
+
+    ::
+
+        >>> obj = client.container('mycontainer').object('dummy')
+        >>> obj.download('/tmp/dummy.txt')
+        <Response [200]>
+
+    :param container: :class:`ContainerHandle <ContainerHandle>` of the
+                      object
+    :param str name: object name
+    """
+
+    __slots__ = ('container', 'name')
+
+    def __init__(self, container, name):
+        """Constructor of ObjectHandle."""
+        if name is None:
+            raise ValidationError('name is None')
+        object.__setattr__(self, 'container', container)
+        object.__setattr__(self, 'name', name)
+
+    def __setattr__(self, name, value):
+        """Reject changes, handles are immutable."""
+        raise AttributeError('%s is immutable' % type(self).__name__)
+
+    def __delattr__(self, name):
+        """Reject changes, handles are immutable."""
+        raise AttributeError('%s is immutable' % type(self).__name__)
+
+    def __repr__(self):
+        return '<%s %s/%s>' % (type(self).__name__,
+                               self.container.name, self.name)
+
+    @property
+    def client(self):
+        """:class:`Client <Client>` of the object."""
+        return self.container.client
+
+    def create(self, file_path, **kwargs):
+        """Create object.
+
+        See :meth:`Object.create <Object.create>`.
+
+        :rtype: `requests.Response`
+        :return: Response of create object
+
+        :param file_path: local file path or file object
+        """
+        return self.container.objects.create(name=self.name,
+                                             file_path=file_path,
+                                             **kwargs)
+
+    def create_large(self, file_path, **kwargs):
+        """Create Static Large Object.
+
+        See :meth:`Object.create_large <Object.create_large>`.
+
+        :rtype: `requests.Response`
+        :return: Response of create manifest
+
+        :param file_path: local file path or file object
+        """
+        return self.container.objects.create_large(name=self.name,
+                                                   file_path=file_path,
+                                                   **kwargs)
+
+    def detail(self):
+        """Get object.
+
+        :rtype: `requests.Response`
+        :return: Response of get object
+        """
+        return self.container.objects.detail(self.name)
+
+    def fetch(self, chunk_size=utils.CHUNK_SIZE):
+        """Retrieve object through the object cache of the client.
+
+        :rtype: str
+        :return: path of local file holding the body
+        """
+        return self.container.objects.fetch(self.name, chunk_size)
+
+    def show_metadata(self):
+        """Show metadata of the object.
+
+        :rtype: `requests.Response`
+        :return: Response of head object
+        """
+        return self.container.objects.show_metadata(self.name)
+
+    def update_metadata(self, **kwargs):
+        """Update metadata of the object.
+
+        :rtype: `requests.Response`
+        :return: Response of post object
+        """
+        return self.container.objects.update_metadata(self.name, **kwargs)
+
+    def delete(self):
+        """Delete object.
+
+        :rtype: `requests.Response`
+        :return: Response of delete object
+        """
+        return self.container.objects.delete(self.name)
+
+    def copy(self, dest_name):
+        """Copy object in the container.
+
+        :rtype: `requests.Response`
+        :return: Response of copy object
+
+        :param str dest_name: object name of the copy
+        """
+        return self.container.objects.copy(self.name, dest_name)
+
+    def iter_content(self, chunk_size=utils.CHUNK_SIZE):
+        """Iterate object body in chunks.
+
+        :rtype: generator
+        :return: chunks of the body
+        """
+        return self.container.objects.iter_content(self.name, chunk_size)
+
+    def download(self, dest, chunk_size=utils.CHUNK_SIZE):
+        """Download object.
+
+        :rtype: `requests.Response`
+        :return: Response of get object, of which body is consumed
+
+        :param dest: local file path, writable file object or callable
+        """
+        return self.container.objects.download(self.name, dest, chunk_size)
+
+    def download_parallel(self, dest, **kwargs):
+        """Download object in parallel byte ranges.
+
+        See :meth:`Object.download_parallel <Object.download_parallel>`.
+
+        :rtype: `requests.Response`
+        :return: Response of show metadata of the object
+
+        :param str dest: local file path
+        """
+        return self.container.objects.download_parallel(self.name, dest,
+                                                        **kwargs)
@@ -21,3 +21,22 @@ class AuthenticationError(Error):
     """Authentication failed."""
 
     pass
+
+
+class ResponseError(Error):
+    """Unexpected response status.
+
+    :param str message: error message
+    :param response: `requests.Response` of the failed request
+    """
+
+    def __init__(self, message, response=None):
+        """Constructor of ResponseError."""
+        super(ResponseError, self).__init__(message)
+        self.response = response
+
+
+class IntegrityError(Error):
+    """Checksum of data does not match ETag."""
+
+    pass
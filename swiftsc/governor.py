@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""swiftsc governor module."""
+import collections
+import threading
+import time
+import requests
+
+#: status codes of rate limiting
+RATE_LIMIT_STATUSES = (429, 498)
+
+#: status codes of overloaded servers
+OVERLOAD_STATUSES = (503,)
+
+
+class Governor(object):
+    """The :class:`Governor <Governor>` object.
+
+    This limits the requests of a client shared by all its threads: a token
+    bucket bounds the requests per second, and the requests and bytes of
+    request bodies in flight are bounded too. The limit of requests in
+    flight, and the rate, follow AIMD (additive increase, multiplicative
+    decrease)::
+
+        >>> from swiftsc import Client
+        >>> from swiftsc.governor import Governor
+        >>> client = Client(auth_uri='https://swift.example.org/auth/v1.0',
+        ... username='swiftuser', password='passw0rd',
+        ... governor=Governor(rate=200, max_in_flight=64))
+        >>> client.containers.objects.upload_tree('/var/backup')
+
+    * every success adds ``increase`` to the limit per window of requests,
+      and 1 request per second to the rate per second of requests,
+    * a congestion signal multiplies them by ``decrease``. Without
+      ``rate``, the first rate limiting starts limiting the rate at the
+      rate of the last second multiplied by ``decrease``. The signals are
+      rate limiting (``429``, ``498``), overload (``503``), connection
+      errors and timeouts, and, with ``latency_target``, slow responses of
+      requests without body. Signals of requests sent before the last
+      decrease are ignored, so a burst of errors decreases once.
+
+    Bulk and parallel operations use ``max_in_flight`` workers when their
+    ``concurrency`` is not given, so that the governor finds the number of
+    requests the cluster can serve. A streamed response is counted until its
+    headers are received.
+
+    :param float rate: maximum requests per second, ``None`` for no limit
+                       until rate limited
+    :param float burst: requests allowed at once above the rate
+                        (default: ``rate``)
+    :param int max_in_flight: maximum requests in flight
+    :param int min_in_flight: minimum limit of requests in flight
+    :param int initial: initial limit of requests in flight
+                        (default: ``max_in_flight``)
+    :param int max_bytes: maximum bytes of request bodies in flight,
+                          ``None`` for no limit. A larger body is allowed
+                          when nothing else is in flight.
+    :param float latency_target: seconds above which a response of a
+                                 request without body is a congestion
+                                 signal, ``None`` to ignore latency
+    :param float decrease: factor applied to the limits on congestion
+    :param float increase: requests added to the limit per window
+    """
+
+    def __init__(self,
+                 rate=None,
+                 burst=None,
+                 max_in_flight=16,
+                 min_in_flight=1,
+                 initial=None,
+                 max_bytes=None,
+                 latency_target=None,
+                 decrease=0.5,
+                 increase=1.0):
+        """Constructor of Governor."""
+        #: configured requests per second, the upper bound of :attr:`rate`
+        self.max_rate = rate
+        #: current requests per second
+        self.rate = rate
+        self.burst = burst or (max(1.0, rate) if rate else None)
+        self.max_in_flight = max_in_flight
+        self.min_in_flight = max(1, min_in_flight)
+        #: current limit of requests in flight
+        self.limit = float(initial or max_in_flight)
+        self.max_bytes = max_bytes
+        self.latency_target = latency_target
+        self.decrease = decrease
+        self.increase = increase
+        #: number of requests in flight
+        self.in_flight = 0
+        #: bytes of request bodies in flight
+        self.in_flight_bytes = 0
+        #: number of multiplicative decreases
+        self.decreases = 0
+        self._sent = collections.deque()
+        self._tokens = self.burst
+        self._refilled = time.time()
+        self._epoch = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, size=0):
+        """Wait until a request may be sent.
+
+        :rtype: int
+        :return: epoch of the limits, given back to :meth:`release`
+
+        :param int size: bytes of the request body
+        """
+        with self._cond:
+            while True:
+                delay = self._wait_time(size)
+                if delay == 0:
+                    break
+                self._cond.wait(delay)
+            self.in_flight += 1
+            self.in_flight_bytes += size
+            if self.rate:
+                self._tokens -= 1
+            now = time.time()
+            self._sent.append(now)
+            while self._sent[0] < now - 1:
+                self._sent.popleft()
+            return self._epoch
+
+    def _wait_time(self, size):
+        """Calculate seconds to wait. The lock is held.
+
+        :rtype: float
+        :return: 0 when the request may be sent, ``None`` to wait for a
+                 release
+        """
+        if self.in_flight >= max(self.min_in_flight, int(self.limit)):
+            return None
+        if (self.max_bytes is not None and self.in_flight_bytes and
+                self.in_flight_bytes + size > self.max_bytes):
+            return None
+        if not self.rate:
+            return 0
+        now = time.time()
+        self._tokens = min(self.burst,
+                           self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+        if self._tokens >= 1:
+            return 0
+        return (1 - self._tokens) / self.rate
+
+    def release(self, epoch, size=0, congested=False, rate_limited=False):
+        """Finish request and adjust the limits.
+
+        :param int epoch: epoch returned by :meth:`acquire`
+        :param int size: bytes of the request body
+        :param bool congested: the request met a congestion signal
+        :param bool rate_limited: the request was rate limited
+        """
+        with self._cond:
+            self.in_flight -= 1
+            self.in_flight_bytes -= size
+            if congested or rate_limited:
+                if epoch == self._epoch:
+                    self._epoch += 1
+                    self.decreases += 1
+                    self.limit = max(float(self.min_in_flight),
+                                     self.limit * self.decrease)
+                    if rate_limited:
+                        self.rate = max(1.0, (self.rate or len(self._sent)) *
+                                        self.decrease)
+                        self.burst = self.burst or 1.0
+                        self._tokens = min(self._tokens or 0.0, 1.0)
+                        self._refilled = time.time()
+            else:
+                self.limit = min(float(self.max_in_flight),
+                                 self.limit + self.increase / self.limit)
+                if self.rate:
+                    self.rate = min(self.max_rate or float('inf'),
+                                    self.rate + 1.0 / self.rate)
+            self._cond.notify_all()
+
+    def call(self, send, size=0):
+        """Send request within the limits.
+
+        :rtype: `requests.Response`
+        :return: response of ``send``
+
+        :param send: callable sending the request
+        :param int size: bytes of the request body
+        """
+        epoch = self.acquire(size)
+        congested = rate_limited = False
+        started = time.time()
+        try:
+            res = send()
+            rate_limited = res.status_code in RATE_LIMIT_STATUSES
+            congested = (res.status_code in OVERLOAD_STATUSES or
+                         (self.latency_target is not None and not size and
+                          time.time() - started > self.latency_target))
+            return res
+        except (requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout):
+            congested = True
+            raise
+        finally:
+            self.release(epoch, size, congested, rate_limited)
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""swiftsc hedging module."""
+import threading
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+
+from swiftsc.metrics import Histogram
+
+#: methods hedged by default, which are safe to send twice
+HEDGED_METHODS = ('GET', 'HEAD')
+
+
+class HedgePolicy(object):
+    """The :class:`HedgePolicy <HedgePolicy>` object.
+
+    This hedges reads: when no response arrived within a delay, the same
+    request is sent again, to another endpoint of the :class:`Router
+    <swiftsc.routing.Router>` if any, or over another connection. The
+    first response wins, and the other is closed when it arrives.::
+
+        >>> from swiftsc import Client
+        >>> from swiftsc.hedging import HedgePolicy
+        >>> client = Client(auth_uri='https://swift.example.org/auth/v1.0',
+        ... username='swiftuser', password='passw0rd',
+        ... hedge=HedgePolicy(quantile=0.95, max_ratio=0.05))
+
+    Without ``delay``, the delay is the ``quantile`` of the latency of the
+    requests sent once, by method, when ``min_samples`` were observed. So
+    only the slowest requests are hedged. Hedges take from a budget which
+    each request refills by ``max_ratio``, up to ``burst``, so hedges are
+    bounded to a ratio of the requests even when the cluster is slow.
+
+    A request which may be hedged and its hedge are each sent from a
+    thread of their own, so the caller returns as soon as one of them
+    answers, and hedging does not bound the requests sent at once. The
+    loser cannot be interrupted: a response which was not streamed is read
+    to its end before being closed. Once :meth:`close` is called, requests
+    are sent once from the caller's thread.
+
+    :param float delay: seconds to wait before hedging, ``None`` to use
+                        ``quantile`` of the observed latency
+    :param float quantile: quantile of the latency used as delay
+    :param float min_delay: minimum seconds of the observed delay
+    :param float max_delay: maximum seconds of the observed delay
+    :param int min_samples: number of latencies observed before hedging
+    :param float max_ratio: maximum hedges per request
+    :param float burst: hedges allowed at once above the ratio
+    :param tuple methods: hedged methods
+    """
+
+    def __init__(self,
+                 delay=None,
+                 quantile=0.95,
+                 min_delay=0.005,
+                 max_delay=1.0,
+                 min_samples=20,
+                 max_ratio=0.05,
+                 burst=10.0,
+                 methods=HEDGED_METHODS):
+        """Constructor of HedgePolicy."""
+        self.delay = delay
+        self.quantile = quantile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.max_ratio = max_ratio
+        self.burst = burst
+        self.methods = frozenset(methods)
+        #: number of hedged requests, sent again after the delay
+        self.hedges = 0
+        #: number of hedged requests answered first by the hedge
+        self.wins = 0
+        #: number of requests not hedged for lack of budget
+        self.throttled = 0
+        self._budget = burst
+        self._latency = {}
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def delay_of(self, method):
+        """Calculate seconds to wait before hedging a request.
+
+        :rtype: float
+        :return: seconds, ``None`` not to hedge
+
+        :param str method: HTTP method
+        """
+        if method not in self.methods:
+            return None
+        if self.delay is not None:
+            return self.delay
+        with self._lock:
+            histogram = self._latency.get(method)
+            if histogram is None or histogram.count < self.min_samples:
+                return None
+            delay = histogram.quantile(self.quantile)
+        return min(self.max_delay, max(self.min_delay, delay))
+
+    def observe(self, method, latency):
+        """Record latency of a request sent once.
+
+        :param str method: HTTP method
+        :param float latency: seconds until the response headers, as
+                              ``elapsed`` of the response
+        """
+        with self._lock:
+            histogram = self._latency.get(method)
+            if histogram is None:
+                histogram = self._latency[method] = Histogram()
+            histogram.observe(latency)
+
+    def call(self, send, method):
+        """Send request, hedging it when it is slow.
+
+        :rtype: `requests.Response`
+        :return: the first response of ``send``
+
+        :param send: callable sending the request, called twice when hedged
+        :param str method: HTTP method
+        """
+        if method not in self.methods or self._closed:
+            return send()
+        delay = self.delay_of(method)
+        with self._lock:
+            self._budget = min(self.burst, self._budget + self.max_ratio)
+        if delay is None:
+            return self._timed(send, method)
+        primary = _spawn(self._timed, send, method)
+        if wait([primary], timeout=delay).done:
+            return primary.result()
+        with self._lock:
+            if self._budget < 1:
+                self.throttled += 1
+                hedge = None
+            else:
+                self._budget -= 1
+                self.hedges += 1
+                hedge = _spawn(send)
+        if hedge is None:
+            return primary.result()
+        pending = [primary, hedge]
+        while True:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in done
+                           if future.exception() is None), None)
+            pending = [future for future in pending if future not in done]
+            if winner is not None or not pending:
+                break
+        if winner is None:
+            # both failed, raise the error of the first request
+            return primary.result()
+        for future in (primary, hedge):
+            if future is not winner:
+                future.add_done_callback(_discard)
+        if winner is hedge:
+            with self._lock:
+                self.wins += 1
+        return winner.result()
+
+    def _timed(self, send, method):
+        """Send request, observing its latency until the headers."""
+        res = send()
+        self.observe(method, res.elapsed.total_seconds())
+        return res
+
+    def close(self):
+        """Stop hedging, the requests in flight are left to finish."""
+        self._closed = True
+
+
+def _spawn(func, *args):
+    """Call function from a new thread.
+
+    :rtype: `concurrent.futures.Future`
+    :return: future of the result of ``func``
+    """
+    future = Future()
+
+    def _run():
+        future.set_running_or_notify_cancel()
+        try:
+            result = func(*args)
+        except BaseException as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+    thread = threading.Thread(target=_run)
+    thread.daemon = True
+    thread.start()
+    return future
+
+
+def _discard(future):
+    """Close response of the request which lost the race."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
@@ -0,0 +1,403 @@
+# -*- coding: utf-8 -*-
+"""swiftsc metrics module."""
+import bisect
+import threading
+import time
+try:
+    from urllib.parse import urlparse, unquote
+except ImportError:
+    from urlparse import urlparse
+    from urllib import unquote
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3 import connection, connectionpool
+
+#: upper bounds of the buckets of latency histograms in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_TIMING = threading.local()
+
+
+class RequestEvent(object):
+    """Event of a single HTTP call, passed to the hooks of the client.
+
+    ``total`` is measured until :meth:`requests.Session.request` returns, so
+    it does not include reading the body of a streamed response, of which
+    ``bytes_received`` is the ``Content-Length``.
+
+    :param str operation: name such as ``object.put`` or ``container.list``
+    :param str method: HTTP method
+    :param str container: container name, ``None`` for account and auth
+    :param str name: object name, ``None`` for account, container and auth
+    :param str endpoint: host and port of the proxy or auth server
+    :param int status: status code, ``None`` when no response was received
+    :param int bytes_sent: bytes of the request body
+    :param int bytes_received: bytes of the response body
+    :param float connect: seconds to open a new connection, ``0.0`` when a
+                          pooled connection was reused
+    :param float ttfb: seconds until the response headers were received
+    :param float total: seconds of the call
+    :param int retries: number of previous attempts of the request
+    :param str error: exception class name when the call failed
+    """
+
+    __slots__ = ('operation', 'method', 'container', 'name', 'endpoint',
+                 'status', 'bytes_sent', 'bytes_received', 'connect', 'ttfb',
+                 'total', 'retries', 'error')
+
+    def __init__(self, operation, method, container=None, name=None,
+                 endpoint=None, status=None, bytes_sent=0, bytes_received=0,
+                 connect=0.0, ttfb=0.0, total=0.0, retries=0, error=None):
+        """Constructor of RequestEvent."""
+        self.operation = operation
+        self.method = method
+        self.container = container
+        self.name = name
+        self.endpoint = endpoint
+        self.status = status
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.connect = connect
+        self.ttfb = ttfb
+        self.total = total
+        self.retries = retries
+        self.error = error
+
+    def __repr__(self):
+        return '<RequestEvent %s %s %.3fs>' % (
+            self.operation, self.status or self.error, self.total)
+
+
+def describe(account_uri, method, uri, params=None, headers=None):
+    """Name the operation of a request to Swift.
+
+    :rtype: tuple
+    :return: operation, container name and object name
+
+    :param str account_uri: Swift Storage URL of the account
+    :param str method: HTTP method
+    :param str uri: request URL
+    :param dict params: query parameters
+    :param dict headers: request headers
+    """
+    params = params or {}
+    headers = headers or {}
+    path = urlparse(uri).path
+    base = urlparse(account_uri).path if account_uri else ''
+    parts = path[len(base):].strip('/').split('/', 1) \
+        if path.startswith(base) else ['']
+    container = unquote(parts[0]) if parts[0] else None
+    name = unquote(parts[1]) if len(parts) > 1 and parts[1] else None
+    level = ('object' if name is not None else
+             'container' if container is not None else 'account')
+    if 'bulk-delete' in params:
+        verb = 'bulk_delete'
+    elif 'extract-archive' in params:
+        verb = 'bulk_upload'
+    elif method == 'PUT' and params.get('multipart-manifest') == 'put':
+        verb = 'manifest_put'
+    elif method == 'PUT' and 'X-Copy-From' in headers:
+        verb = 'copy'
+    elif method == 'GET' and level != 'object':
+        verb = 'list'
+    elif method == 'GET' and 'Range' in headers:
+        verb = 'get_range'
+    else:
+        verb = method.lower()
+    return '%s.%s' % (level, verb), container, name
+
+
+def endpoint_of(uri):
+    """Retrieve endpoint of URL.
+
+    :rtype: str
+    :return: host and port
+
+    :param str uri: request URL
+    """
+    return urlparse(uri).netloc
+
+
+def reset_connect_time():
+    """Start measuring the connections opened by the current thread."""
+    _TIMING.connect = 0.0
+
+
+def connect_time():
+    """Retrieve seconds spent opening connections in the current thread.
+
+    :rtype: float
+    :return: seconds since :func:`reset_connect_time`
+    """
+    return getattr(_TIMING, 'connect', 0.0)
+
+
+class _ConnectTimer(object):
+    """Connection recording the time to connect, including TLS handshake."""
+
+    def connect(self):
+        """Connect and record the elapsed time."""
+        started = time.time()
+        try:
+            super(_ConnectTimer, self).connect()
+        finally:
+            _TIMING.connect = connect_time() + time.time() - started
+
+
+class _TimedHTTPConnection(_ConnectTimer, connection.HTTPConnection):
+    """HTTP connection recording the time to connect."""
+
+
+class _TimedHTTPSConnection(_ConnectTimer, connection.HTTPSConnection):
+    """HTTPS connection recording the time to connect."""
+
+
+class _TimedHTTPConnectionPool(connectionpool.HTTPConnectionPool):
+    """HTTP connection pool recording the time to connect."""
+
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(connectionpool.HTTPSConnectionPool):
+    """HTTPS connection pool recording the time to connect."""
+
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter of which connections record the time to connect.
+
+    See :func:`connect_time`.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        """Initialize pool manager creating timed connection pools."""
+        super(TimedHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool}
+
+
+class Histogram(object):
+    """Histogram of observations with cumulative export.
+
+    :param tuple buckets: sorted upper bounds of the buckets
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        """Constructor of Histogram."""
+        self.buckets = tuple(buckets)
+        #: number of observations of each bucket, the last one is ``+Inf``
+        self.counts = [0] * (len(self.buckets) + 1)
+        #: sum of observations
+        self.sum = 0.0
+        #: number of observations
+        self.count = 0
+
+    def observe(self, value):
+        """Add observation.
+
+        :param float value: observed value
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other):
+        """Add observations of a histogram with the same buckets.
+
+        :param other: :class:`Histogram <Histogram>`
+        """
+        self.counts = [mine + theirs
+                       for mine, theirs in zip(self.counts, other.counts)]
+        self.sum += other.sum
+        self.count += other.count
+
+    def quantile(self, fraction):
+        """Estimate quantile by linear interpolation within its bucket.
+
+        :rtype: float
+        :return: estimated value, ``None`` without observation
+
+        :param float fraction: quantile between 0 and 1, such as ``0.99``
+        """
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if index == len(self.buckets):
+                    # above the largest bound
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def cumulative(self):
+        """Iterate cumulative counts of the buckets.
+
+        :rtype: generator
+        :return: tuple of upper bound, ``+Inf`` at last, and count
+        """
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            yield bound, total
+
+
+def _escape(value):
+    """Escape label value of Prometheus text format."""
+    return (str(value).replace('\\', '\\\\')
+            .replace('"', '\\"').replace('\n', '\\n'))
+
+
+def _labels(names, values, extra=()):
+    """Format labels of Prometheus text format."""
+    return '{%s}' % ','.join('%s="%s"' % (name, _escape(value))
+                             for name, value in list(zip(names, values)) +
+                             list(extra))
+
+
+def _bound(value):
+    """Format upper bound of Prometheus histogram bucket."""
+    return '+Inf' if value == float('inf') else repr(float(value))
+
+
+class Metrics(object):
+    """Aggregator of :class:`RequestEvent <RequestEvent>` as counters and
+    latency histograms by operation and endpoint.
+
+    It is a hook of the client, and exports the Prometheus text format.::
+
+        >>> from swiftsc import Client
+        >>> from swiftsc.metrics import Metrics
+        >>> metrics = Metrics()
+        >>> client = Client(auth_uri='https://swift.example.org/auth/v1.0',
+        ... username='swiftuser', password='passw0rd', hooks=[metrics])
+        >>> client.containers.list()
+        >>> metrics.quantile(0.99, operation='account.list')
+        0.0475
+        >>> print(metrics.prometheus())
+
+    :param tuple buckets: upper bounds of latency buckets in seconds
+    :param str namespace: prefix of the metric names
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS, namespace='swiftsc'):
+        """Constructor of Metrics."""
+        self.buckets = tuple(buckets)
+        self.namespace = namespace
+        #: number of responses by operation, endpoint and status
+        self.requests = {}
+        #: number of failed calls by operation, endpoint and exception
+        self.errors = {}
+        #: number of retried calls by operation and endpoint
+        self.retries = {}
+        #: bytes of request bodies by operation and endpoint
+        self.bytes_sent = {}
+        #: bytes of response bodies by operation and endpoint
+        self.bytes_received = {}
+        #: histograms of total seconds by operation and endpoint
+        self.latency = {}
+        #: histograms of seconds to first byte by operation and endpoint
+        self.ttfb = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        """Record event.
+
+        :param event: :class:`RequestEvent <RequestEvent>`
+        """
+        key = (event.operation, event.endpoint)
+        with self._lock:
+            if event.status is not None:
+                _increment(self.requests, key + (event.status,))
+                self._histogram(self.ttfb, key).observe(event.ttfb)
+            else:
+                _increment(self.errors, key + (event.error,))
+            if event.retries:
+                _increment(self.retries, key)
+            _increment(self.bytes_sent, key, event.bytes_sent)
+            _increment(self.bytes_received, key, event.bytes_received)
+            self._histogram(self.latency, key).observe(event.total)
+
+    def _histogram(self, histograms, key):
+        """Retrieve histogram of key, created on first use."""
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(self.buckets)
+        return histogram
+
+    def quantile(self, fraction, operation=None, endpoint=None):
+        """Estimate quantile of total latency.
+
+        :rtype: float
+        :return: seconds, ``None`` without observation
+
+        :param float fraction: quantile between 0 and 1, such as ``0.99``
+        :param str operation: operation, ``None`` for all
+        :param str endpoint: endpoint, ``None`` for all
+        """
+        merged = Histogram(self.buckets)
+        with self._lock:
+            for (op_name, op_endpoint), histogram in self.latency.items():
+                if (operation in (None, op_name) and
+                        endpoint in (None, op_endpoint)):
+                    merged.merge(histogram)
+        return merged.quantile(fraction)
+
+    def prometheus(self):
+        """Export metrics in Prometheus text format.
+
+        :rtype: str
+        :return: exposition of counters and histograms
+        """
+        prefix = self.namespace
+        key_names = ('operation', 'endpoint')
+        lines = []
+        with self._lock:
+            for name, help_text, values, names in (
+                    ('requests_total', 'HTTP responses by status.',
+                     self.requests, key_names + ('status',)),
+                    ('errors_total', 'HTTP calls failed without response.',
+                     self.errors, key_names + ('error',)),
+                    ('retries_total', 'HTTP calls retrying a request.',
+                     self.retries, key_names),
+                    ('sent_bytes_total', 'Bytes of request bodies.',
+                     self.bytes_sent, key_names),
+                    ('received_bytes_total', 'Bytes of response bodies.',
+                     self.bytes_received, key_names)):
+                lines.append('# HELP %s_%s %s' % (prefix, name, help_text))
+                lines.append('# TYPE %s_%s counter' % (prefix, name))
+                for key in sorted(values, key=str):
+                    lines.append('%s_%s%s %d' % (prefix, name,
+                                                 _labels(names, key),
+                                                 values[key]))
+            for name, help_text, histograms in (
+                    ('request_duration_seconds', 'Seconds of HTTP calls.',
+                     self.latency),
+                    ('ttfb_seconds', 'Seconds until response headers.',
+                     self.ttfb)):
+                lines.append('# HELP %s_%s %s' % (prefix, name, help_text))
+                lines.append('# TYPE %s_%s histogram' % (prefix, name))
+                for key in sorted(histograms, key=str):
+                    histogram = histograms[key]
+                    for bound, count in histogram.cumulative():
+                        lines.append('%s_%s_bucket%s %d' % (
+                            prefix, name,
+                            _labels(key_names, key, [('le', _bound(bound))]),
+                            count))
+                    labels = _labels(key_names, key)
+                    lines.append('%s_%s_sum%s %r' % (prefix, name, labels,
+                                                     histogram.sum))
+                    lines.append('%s_%s_count%s %d' % (prefix, name, labels,
+                                                       histogram.count))
+        return '\n'.join(lines) + '\n'
+
+
+def _increment(counters, key, value=1):
+    """Add value to counter."""
+    counters[key] = counters.get(key, 0) + value
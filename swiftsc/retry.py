@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""swiftsc retry module."""
+import random
+import threading
+import time
+from email.utils import parsedate_tz, mktime_tz
+import requests
+
+from swiftsc import utils
+
+#: status codes of transient errors
+RETRY_STATUSES = (429, 498, 500, 502, 503, 504)
+
+#: status codes of rate limiting, the request was not processed
+RATE_LIMIT_STATUSES = (429, 498)
+
+#: methods which may be sent again after an unknown outcome
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS', 'COPY')
+
+
+def parse_retry_after(value):
+    """Convert ``Retry-After`` into seconds to wait.
+
+    :rtype: float
+    :return: seconds to wait, ``None`` if the value is invalid
+
+    :param str value: delay seconds or HTTP-date
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    date = parsedate_tz(value)
+    if date is None:
+        return None
+    return max(0.0, mktime_tz(date) - time.time())
+
+
+class RetryPolicy(object):
+    """The :class:`RetryPolicy <RetryPolicy>` object.
+
+    This retries requests failed with a transient status or a connection
+    error, waiting an exponential backoff with full jitter between
+    attempts.::
+
+        >>> from swiftsc import Client
+        >>> from swiftsc.retry import RetryPolicy
+        >>> client = Client(auth_uri='https://swift.example.org/auth/v1.0',
+        ... username='swiftuser', password='passw0rd',
+        ... retry=RetryPolicy(attempts=5, deadline=60))
+
+    Rate limited requests (``429``, ``498``) are retried with any method,
+    because Swift did not process them. Other errors are retried only with
+    idempotent methods, so a ``POST`` is never applied twice. A request
+    body is rewound before it is sent again; a body which cannot be
+    rewound, such as a pipe, is not retried.
+
+    :param int attempts: maximum number of attempts including the first
+    :param tuple statuses: status codes to retry
+    :param float backoff: base delay in seconds, doubled by every attempt
+    :param float max_backoff: maximum delay in seconds
+    :param float deadline: maximum seconds since the first attempt to
+                           start another one, ``None`` for no limit
+    :param bool respect_retry_after: wait as long as ``Retry-After``
+    :param tuple methods: methods retried after errors other than
+                          rate limiting
+    """
+
+    def __init__(self,
+                 attempts=3,
+                 statuses=RETRY_STATUSES,
+                 backoff=0.5,
+                 max_backoff=30.0,
+                 deadline=None,
+                 respect_retry_after=True,
+                 methods=IDEMPOTENT_METHODS):
+        """Constructor of RetryPolicy."""
+        self.attempts = attempts
+        self.statuses = frozenset(statuses)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.respect_retry_after = respect_retry_after
+        self.methods = frozenset(methods)
+        #: number of requests sent again
+        self.retries = 0
+        #: number of requests failed after the last attempt
+        self.give_ups = 0
+        self._lock = threading.Lock()
+
+    def delay(self, attempt, res=None):
+        """Calculate seconds to wait before the next attempt.
+
+        :rtype: float
+        :return: seconds to wait
+
+        :param int attempt: number of attempts made
+        :param res: `requests.Response` of the failed attempt
+        """
+        if res is not None and self.respect_retry_after:
+            retry_after = parse_retry_after(res.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+    def retryable(self, method, res=None):
+        """Check whether a failed attempt may be sent again.
+
+        :rtype: bool
+        :return: ``True`` when the request may be sent again
+
+        :param str method: HTTP method
+        :param res: `requests.Response`, ``None`` on connection error
+        """
+        if res is not None and res.status_code not in self.statuses:
+            return False
+        if res is not None and res.status_code in RATE_LIMIT_STATUSES:
+            return True
+        return method.upper() in self.methods
+
+    def call(self, send, method, data=None):
+        """Send request until it succeeds or the policy gives up.
+
+        :rtype: `requests.Response`
+        :return: response of the last attempt
+
+        :param send: callable sending the request
+        :param str method: HTTP method
+        :param data: request body to rewind between attempts
+        """
+        started = time.time()
+        attempt = 0
+        while True:
+            attempt += 1
+            res = None
+            try:
+                res = send()
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout):
+                if not self._again(attempt, started, method, data):
+                    raise
+            else:
+                if not self.retryable(method, res):
+                    return res
+                if not self._again(attempt, started, method, data, res):
+                    return res
+                res.close()
+            self._count('retries')
+
+    def _again(self, attempt, started, method, data, res=None):
+        """Wait for the next attempt.
+
+        :rtype: bool
+        :return: ``False`` when the policy gives up
+        """
+        delay = self.delay(attempt, res)
+        if (attempt >= self.attempts or
+                not self.retryable(method, res) or
+                (self.deadline is not None and
+                 time.time() + delay - started > self.deadline) or
+                not utils.rewind_body(data)):
+            self._count('give_ups')
+            return False
+        time.sleep(delay)
+        return True
+
+    def _count(self, name):
+        """Increment counter."""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
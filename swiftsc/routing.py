@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+"""swiftsc routing module."""
+import math
+import random
+import threading
+import time
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+import requests
+
+from swiftsc import utils
+from swiftsc.exception import ValidationError
+
+#: status codes of a failing proxy
+FAILURE_STATUSES = (500, 502, 503, 504)
+
+#: seconds an endpoint is avoided after its first failure
+COOLDOWN = 1.0
+
+#: maximum seconds an endpoint is avoided after failures in a row
+MAX_COOLDOWN = 60.0
+
+#: weight of a new sample in the moving average of latency
+EWMA_WEIGHT = 0.3
+
+#: seconds after which the moving average of an idle endpoint is halved
+HALF_LIFE = 10.0
+
+
+def catalog_endpoints(r_json, interface='public', region=None):
+    """Retrieve Swift endpoints from the catalog of KeyStone.
+
+    :rtype: list
+    :return: ``[url, region]`` of the object-store endpoints, those of
+             ``region`` first
+
+    :param dict r_json: response payload from KeyStone auth
+    :param str interface: ``public``, ``internal`` or ``admin``
+    :param str region: preferred region, ``None`` for the catalog order
+    """
+    endpoints = []
+    if r_json.get('access'):
+        # Identity API v2.0
+        for service in r_json['access'].get('serviceCatalog', []):
+            if service.get('type') != 'object-store':
+                continue
+            for entry in service.get('endpoints', []):
+                url = entry.get('%sURL' % interface)
+                if url:
+                    endpoints.append([url, entry.get('region')])
+    else:
+        # Identity API v3
+        for service in r_json.get('token', {}).get('catalog', []):
+            if service.get('type') != 'object-store':
+                continue
+            for entry in service.get('endpoints', []):
+                if entry.get('interface', interface) != interface:
+                    continue
+                endpoints.append([entry.get('url'),
+                                  entry.get('region_id') or
+                                  entry.get('region')])
+    if region is not None:
+        # stable, so the catalog order is kept within each tier
+        endpoints.sort(key=lambda endpoint: endpoint[1] != region)
+    return endpoints
+
+
+class Endpoint(object):
+    """Swift proxy of a :class:`Router <Router>`, with its health.
+
+    :param str url: Storage URL, or URL of the proxy to which the path of
+                    the Storage URL is appended
+    :param str region: region of the proxy
+    :param int tier: preference, endpoints of the lowest healthy tier are
+                     used
+    """
+
+    def __init__(self, url, region=None, tier=0):
+        """Constructor of Endpoint."""
+        self.url = url.rstrip('/')
+        self.region = region
+        self.tier = tier
+        #: Storage URL of the proxy
+        self.uri = self.url
+        #: moving average of latency in seconds
+        self.latency = 0.0
+        #: number of requests in flight
+        self.in_flight = 0
+        #: number of failures in a row
+        self.failures = 0
+        #: time until which the endpoint is avoided
+        self.down_until = 0.0
+        #: number of requests sent
+        self.requests = 0
+        self._observed = time.time()
+
+    def healthy(self, now=None):
+        """Check whether the endpoint may be used.
+
+        :rtype: bool
+        :return: ``True`` unless the endpoint failed within its cooldown
+        """
+        return self.down_until <= (now or time.time())
+
+    def score(self, now=None):
+        """Estimate cost of a request, the lower the better.
+
+        The moving average decays while the endpoint is idle, so an
+        endpoint which was slow is tried again.
+
+        :rtype: float
+        :return: decayed latency multiplied by requests in flight plus one
+        """
+        return self._decayed(now or time.time()) * (self.in_flight + 1)
+
+    def _decayed(self, now):
+        """Decay moving average of latency by the idle time."""
+        idle = max(0.0, now - self._observed)
+        return self.latency * math.pow(0.5, idle / HALF_LIFE)
+
+    def _observe(self, latency, now):
+        """Add sample to moving average of latency."""
+        self.latency = (self._decayed(now) * (1 - EWMA_WEIGHT) +
+                        latency * EWMA_WEIGHT)
+        self._observed = now
+
+    def __repr__(self):
+        return '<Endpoint %s %.3fs%s>' % (
+            self.uri, self.latency, '' if self.healthy() else ' down')
+
+
+class Router(object):
+    """The :class:`Router <Router>` object.
+
+    This spreads the requests of a client over several Swift proxies, such
+    as the endpoints of the KeyStone catalog, or proxies given to
+    :class:`Client <swiftsc.client.Client>`::
+
+        >>> from swiftsc import Client
+        >>> client = Client(auth_uri='https://swift.example.org/auth/v1.0',
+        ... username='swiftuser', password='passw0rd',
+        ... endpoints=['https://proxy1.example.org',
+        ...            'https://proxy2.example.org'])
+
+    Requests are built on the Storage URL of authentication, then sent to
+    one of the healthy endpoints of the lowest tier: of two endpoints
+    picked at random, the one with the lower moving average of latency
+    multiplied by requests in flight.
+
+    An endpoint failing with a connection error or ``5xx`` is avoided for
+    ``cooldown`` seconds, doubled by every failure in a row up to
+    ``max_cooldown``, then tried again. A request which could not connect
+    is sent again at once to another endpoint; other failures are left to
+    :class:`RetryPolicy <swiftsc.retry.RetryPolicy>`, whose next attempt
+    avoids the failed endpoint. When every endpoint is down, the one
+    recovering first is used.
+
+    :param list endpoints: URLs, ``[url, region]`` pairs or
+                           :class:`Endpoint <Endpoint>`
+    :param str region: preferred region, the others are used when every
+                       endpoint of the region is down
+    :param float cooldown: seconds an endpoint is avoided after a failure
+    :param float max_cooldown: maximum seconds an endpoint is avoided
+    """
+
+    def __init__(self, endpoints, region=None, cooldown=COOLDOWN,
+                 max_cooldown=MAX_COOLDOWN):
+        """Constructor of Router."""
+        self.endpoints = []
+        for endpoint in endpoints:
+            if isinstance(endpoint, (list, tuple)):
+                endpoint = Endpoint(*endpoint)
+            elif not isinstance(endpoint, Endpoint):
+                endpoint = Endpoint(endpoint)
+            if region is not None:
+                endpoint.tier = 0 if endpoint.region == region else 1
+            self.endpoints.append(endpoint)
+        if not self.endpoints:
+            raise ValidationError('Router requires endpoints')
+        self.region = region
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        #: number of requests sent again to another endpoint
+        self.failovers = 0
+        self._primary = None
+        self._lock = threading.Lock()
+
+    def bind(self, storage_url):
+        """Set the Storage URL on which requests are built.
+
+        Endpoints given without path get the path of ``storage_url``.
+
+        :param str storage_url: Storage URL of authentication
+        """
+        storage_url = storage_url.rstrip('/')
+        path = urlparse(storage_url).path
+        for endpoint in self.endpoints:
+            if urlparse(endpoint.url).path in ('', '/'):
+                endpoint.uri = endpoint.url + path
+        self._primary = storage_url
+
+    def urls(self):
+        """List URLs of the endpoints.
+
+        :rtype: list
+        :return: URLs given to the router
+        """
+        return [endpoint.url for endpoint in self.endpoints]
+
+    def select(self, exclude=()):
+        """Pick endpoint of the next request.
+
+        :rtype: :class:`Endpoint <Endpoint>`
+        :return: endpoint to send the request to
+
+        :param exclude: endpoints already tried by the request
+        """
+        now = time.time()
+        with self._lock:
+            candidates = [endpoint for endpoint in self.endpoints
+                          if endpoint not in exclude and
+                          endpoint.healthy(now)]
+            if not candidates:
+                candidates = [min(
+                    [endpoint for endpoint in self.endpoints
+                     if endpoint not in exclude] or self.endpoints,
+                    key=lambda endpoint: endpoint.down_until)]
+            tier = min(endpoint.tier for endpoint in candidates)
+            candidates = [endpoint for endpoint in candidates
+                          if endpoint.tier == tier]
+            if len(candidates) > 2:
+                candidates = random.sample(candidates, 2)
+            endpoint = min(candidates,
+                           key=lambda endpoint: endpoint.score(now))
+            endpoint.in_flight += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def release(self, endpoint, latency=None, ok=True):
+        """Record outcome of a request.
+
+        :param endpoint: :class:`Endpoint <Endpoint>` of :meth:`select`
+        :param float latency: seconds until the response headers
+        :param bool ok: ``False`` when the endpoint failed
+        """
+        now = time.time()
+        with self._lock:
+            endpoint.in_flight -= 1
+            if not ok:
+                endpoint.failures += 1
+                endpoint.down_until = now + min(
+                    self.max_cooldown,
+                    self.cooldown * 2 ** (endpoint.failures - 1))
+                return
+            endpoint.failures = 0
+            endpoint.down_until = 0.0
+            if latency is not None:
+                endpoint._observe(latency, now)
+
+    def probe(self, endpoint, get):
+        """Check health of an endpoint with ``/healthcheck``.
+
+        :rtype: bool
+        :return: ``True`` when the endpoint answered ``200 OK``
+
+        :param endpoint: :class:`Endpoint <Endpoint>`
+        :param get: callable sending ``GET`` to the URL it is given
+        """
+        with self._lock:
+            endpoint.in_flight += 1
+        try:
+            ok = get(utils.healthcheck_uri(endpoint.uri)).ok
+        except requests.exceptions.RequestException:
+            ok = False
+        self.release(endpoint, ok=ok)
+        return ok
+
+    def rewrite(self, uri, endpoint):
+        """Redirect URL built on the Storage URL to an endpoint.
+
+        :rtype: str
+        :return: URL of the endpoint, ``uri`` when it is not under the
+                 Storage URL
+
+        :param str uri: request URL
+        :param endpoint: :class:`Endpoint <Endpoint>`
+        """
+        if (self._primary is None or not uri.startswith(self._primary) or
+                uri[len(self._primary):len(self._primary) + 1] not in
+                ('', '/', '?')):
+            return uri
+        return endpoint.uri + uri[len(self._primary):]
+
+    def call(self, send, uri, data=None):
+        """Send request to an endpoint, failing over on connection errors.
+
+        :rtype: `requests.Response`
+        :return: response of ``send``
+
+        :param send: callable sending the request to the URL it is given
+        :param str uri: request URL built on the Storage URL
+        :param data: request body, rewound before failing over
+        """
+        tried = []
+        while True:
+            endpoint = self.select(tried)
+            tried.append(endpoint)
+            started = time.time()
+            try:
+                res = send(self.rewrite(uri, endpoint))
+            except requests.exceptions.ConnectionError:
+                self.release(endpoint, ok=False)
+                if (len(tried) >= len(self.endpoints) or
+                        not utils.rewind_body(data)):
+                    raise
+                with self._lock:
+                    self.failovers += 1
+                continue
+            except BaseException as exc:
+                self.release(endpoint, ok=not isinstance(
+                    exc, requests.exceptions.RequestException))
+                raise
+            self.release(endpoint, time.time() - started,
+                         ok=res.status_code not in FAILURE_STATUSES)
+            return res
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""swiftsc.aio unit tests."""
+import asyncio
+import os.path
+import unittest
+from io import BytesIO
+from swiftsc.exception import AuthenticationError, ResponseError
+from swiftsc.tests import test_vars as v
+try:
+    from aioresponses import aioresponses
+    from swiftsc.aio import AsyncClient
+except ImportError:
+    aioresponses = None
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@unittest.skipIf(aioresponses is None, 'aiohttp is not installed')
+class AsyncClientTests(unittest.TestCase):
+
+    """Unit test of aio.AsyncClient"""
+
+    def setUp(self):
+        """Initialize"""
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        self.tclient = AsyncClient(uri=v.STORAGE_URL, token=v.TOKEN)
+
+    def tearDown(self):
+        """Finalize"""
+        _run(self.tclient.close())
+        asyncio.get_event_loop().close()
+
+    def test_temp_auth(self):
+        """Unit test of tempauth"""
+        async def _auth():
+            async with AsyncClient(auth_uri=v.AUTH_URL,
+                                   username=v.USERNAME,
+                                   password=v.PASSWORD) as cli:
+                return cli.uri, cli.headers, cli.containers
+
+        with aioresponses() as _mock:
+            _mock.get(v.AUTH_URL, headers={'X-Auth-Token': v.TOKEN,
+                                           'X-Storage-Url': v.STORAGE_URL})
+            uri, headers, containers = _run(_auth())
+        self.assertEqual(v.STORAGE_URL, uri)
+        self.assertEqual(v.TOKEN, headers['X-Auth-Token'])
+        self.assertEqual(v.STORAGE_URL, containers.uri)
+
+    def test_get_token_keystone_v3(self):
+        """Unit test of KeyStone auth"""
+        cli = AsyncClient(auth_uri=v.KEYSTONE_V3_URL,
+                          username=v.USERNAME,
+                          password=v.PASSWORD,
+                          tenant_name=v.TENANT_NAME)
+        with aioresponses() as _mock:
+            _mock.post(v.KEYSTONE_V3_URL,
+                       headers={'x-subject-token': v.KEYSTONE_TOKEN},
+                       payload=v.KEYSTONE_V3)
+            _run(cli.authenticate())
+        _run(cli.close())
+        self.assertEqual(v.STORAGE_URL_KS, cli.uri)
+        self.assertEqual(v.KEYSTONE_TOKEN, cli.headers['X-Auth-Token'])
+
+    def test_get_token_keystone_fail(self):
+        """Unit test of failing KeyStone auth"""
+        cli = AsyncClient(auth_uri=v.KEYSTONE_URL,
+                          username=v.USERNAME,
+                          password=v.PASSWORD,
+                          tenant_name=v.TENANT_NAME)
+        with aioresponses() as _mock:
+            _mock.post(v.KEYSTONE_URL, status=401)
+            with self.assertRaises(AuthenticationError):
+                _run(cli.authenticate())
+        _run(cli.close())
+
+    def test_list_containers(self):
+        """unit test of list containers"""
+        with aioresponses() as _mock:
+            _mock.get(v.STORAGE_URL + '?format=json', payload=v.CONTAINERS)
+            res = _run(self.tclient.containers.list())
+            self.assertEqual(v.CONTAINERS, _run(res.json()))
+
+    def test_iter_list_objects(self):
+        """unit test of iterating paginated list of objects"""
+        async def _names():
+            return [obj['name'] async for obj in
+                    self.tclient.containers.objects.iter_list(limit=2)]
+
+        uri = '%s/%s?format=json&limit=2' % (v.STORAGE_URL, v.CNTR_NAME)
+        self.tclient.containers.container(v.CNTR_NAME)
+        with aioresponses() as _mock:
+            _mock.get(uri, payload=v.OBJECTS[:2])
+            _mock.get(uri + '&marker=sample_2.txt', payload=v.OBJECTS[2:])
+            self.assertEqual([obj['name'] for obj in v.OBJECTS],
+                             _run(_names()))
+
+    def test_create_container(self):
+        """unit test of create container"""
+        with aioresponses() as _mock:
+            _mock.put('%s/%s' % (v.STORAGE_URL, v.CNTR_NAME), status=201)
+            res = _run(self.tclient.containers.create(name=v.CNTR_NAME))
+        self.assertEqual(201, res.status)
+
+    def test_create_object(self):
+        """unit test of create object"""
+        object_name = os.path.basename(v.TEST_FILE)
+        self.tclient.containers.container(v.CNTR_NAME)
+        with aioresponses() as _mock:
+            _mock.put('%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, object_name),
+                      status=201)
+            res = _run(self.tclient.containers.objects.create(
+                file_path=v.TEST_FILE))
+            self.assertEqual(201, res.status)
+            request = list(_mock.requests.values())[0][0]
+        headers = request.kwargs['headers']
+        self.assertEqual(str(v.TEST_FILE_SIZE), headers['Content-Length'])
+        self.assertEqual(v.TEST_FILE_MIMETYPE, headers['Content-Type'])
+
+    def test_download_object(self):
+        """unit test of download object"""
+        object_name = os.path.basename(v.TEST_FILE)
+        with open(v.TEST_FILE, 'rb') as fobj:
+            body = fobj.read()
+        self.tclient.containers.container(v.CNTR_NAME)
+        bio = BytesIO()
+        with aioresponses() as _mock:
+            _mock.get('%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, object_name),
+                      body=body)
+            written = _run(self.tclient.containers.objects.download(
+                object_name, bio, chunk_size=100))
+        self.assertEqual(len(body), written)
+        self.assertEqual(body, bio.getvalue())
+
+    def test_download_object_not_found(self):
+        """unit test of downloading missing object"""
+        self.tclient.containers.container(v.CNTR_NAME)
+        with aioresponses() as _mock:
+            _mock.get('%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME,
+                                    v.OBJECT_NAME),
+                      status=404)
+            with self.assertRaises(ResponseError):
+                _run(self.tclient.containers.objects.download(
+                    v.OBJECT_NAME, BytesIO()))
+
+    def test_delete_object(self):
+        """unit test delete object"""
+        self.tclient.containers.container(v.CNTR_NAME)
+        with aioresponses() as _mock:
+            _mock.delete('%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME,
+                                       v.OBJECT_NAME),
+                         status=204)
+            res = _run(self.tclient.containers.objects.delete(
+                v.OBJECT_NAME))
+        self.assertEqual(204, res.status)
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""swiftsc.cache unit tests."""
+import os.path
+import shutil
+import tempfile
+import time
+import unittest
+import requests
+from swiftsc.cache import (TokenCache, HashIndex, ResponseCache,
+                           ObjectCache)
+from swiftsc.tests import test_vars as v
+
+
+class TokenCacheTests(unittest.TestCase):
+
+    """Unit test of cache.TokenCache"""
+
+    def setUp(self):
+        """Initialize"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'swiftsc', 'tokens.json')
+        self.cache = TokenCache(self.path, margin=60)
+        self.key = TokenCache.key(v.AUTH_URL, v.USERNAME)
+
+    def tearDown(self):
+        """Finalize"""
+        shutil.rmtree(self.tmpdir)
+
+    def _entry(self, expires_in=3600, token=v.TOKEN):
+        return {'token': token, 'uri': v.STORAGE_URL,
+                'expires': time.time() + expires_in}
+
+    def test_set_and_get(self):
+        """test sharing entry between caches of the same file"""
+        entry = self._entry()
+        self.cache.set(self.key, entry)
+        self.assertEqual(entry, TokenCache(self.path).get(self.key))
+        self.assertIsNone(self.cache.get(
+            TokenCache.key(v.AUTH_URL, v.USERNAME, v.TENANT_NAME)))
+        self.assertEqual(0o600, os.stat(self.path).st_mode & 0o777)
+
+    def test_get_expiring(self):
+        """test ignoring token about to expire"""
+        self.cache.set(self.key, self._entry(expires_in=30))
+        self.assertIsNone(self.cache.get(self.key))
+
+    def test_get_broken_file(self):
+        """test ignoring broken cache file"""
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w') as fobj:
+            fobj.write('{broken')
+        self.assertIsNone(self.cache.get(self.key))
+
+    def test_fetch(self):
+        """test authenticating only when no token is cached"""
+        calls = []
+
+        def _authenticate():
+            calls.append(1)
+            return self._entry()
+
+        first = self.cache.fetch(self.key, _authenticate)
+        self.assertEqual(first, self.cache.fetch(self.key, _authenticate))
+        self.assertEqual(1, len(calls))
+
+    def test_fetch_unknown_expiry(self):
+        """test not caching token without expiry"""
+        entry = {'token': v.TOKEN, 'uri': v.STORAGE_URL, 'expires': None}
+        self.assertEqual(entry, self.cache.fetch(self.key, lambda: entry))
+        self.assertIsNone(self.cache.get(self.key))
+        self.cache.set(self.key, entry)
+        self.assertIsNone(self.cache.get(self.key))
+
+    def test_invalidate(self):
+        """test removing entry only while it holds the token"""
+        self.cache.set(self.key, self._entry(token='new'))
+        self.cache.invalidate(self.key, token='old')
+        self.assertIsNotNone(self.cache.get(self.key))
+        self.cache.invalidate(self.key, token='new')
+        self.assertIsNone(self.cache.get(self.key))
+
+
+class HashIndexTests(unittest.TestCase):
+
+    """Unit test of cache.HashIndex"""
+
+    def setUp(self):
+        """Initialize"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'index', 'files.sqlite')
+
+    def tearDown(self):
+        """Finalize"""
+        shutil.rmtree(self.tmpdir)
+
+    def test_get_and_update(self):
+        """test retrieving MD5 only of unchanged file"""
+        index = HashIndex(self.path)
+        index.update([(v.TEST_FILE, 10, 100, 'md5')])
+        index.close()
+        index = HashIndex(self.path)
+        self.assertEqual('md5', index.get(v.TEST_FILE, 10, 100))
+        self.assertIsNone(index.get(v.TEST_FILE, 10, 101))
+        self.assertIsNone(index.get(v.TEST_FILE, 11, 100))
+        index.close()
+
+    def test_default_path(self):
+        """test naming database after local directory"""
+        os.environ['XDG_CACHE_HOME'] = self.tmpdir
+        self.addCleanup(os.environ.pop, 'XDG_CACHE_HOME')
+        index = HashIndex(local_dir=self.tmpdir)
+        index.close()
+        self.assertEqual(os.path.join(self.tmpdir, 'swiftsc', 'index'),
+                         os.path.dirname(index.path))
+        other = HashIndex(local_dir=v.TEST_FILE)
+        other.close()
+        self.assertNotEqual(index.path, other.path)
+
+
+class ResponseCacheTests(unittest.TestCase):
+
+    """Unit test of cache.ResponseCache"""
+
+    def test_invalidate(self):
+        """test discarding responses of changed resource and ancestors"""
+        cache = ResponseCache()
+        container = '%s/%s' % (v.STORAGE_URL, v.CNTR_NAME)
+        keys = [('GET', v.STORAGE_URL, ()),
+                ('GET', container, (('format', 'json'),)),
+                ('HEAD', '%s/%s' % (container, v.OBJECT_NAME), ()),
+                ('HEAD', '%s/%s' % (container, v.DEST_OBJ_NAME), ()),
+                ('HEAD', '%s_segments' % container, ())]
+        for key in keys:
+            cache.set(key, requests.Response())
+        cache.invalidate('%s/%s' % (container, v.OBJECT_NAME))
+        self.assertEqual([False, False, False, True, True],
+                         [cache.get(key)[1] for key in keys])
+        cache.invalidate(container)
+        self.assertEqual((None, False), cache.get(keys[3]))
+        self.assertTrue(cache.get(keys[4])[1])
+
+
+class ObjectCacheTests(unittest.TestCase):
+
+    """Unit test of cache.ObjectCache"""
+
+    def setUp(self):
+        """Initialize"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.cache = ObjectCache(self.tmpdir, max_bytes=10)
+
+    def tearDown(self):
+        """Finalize"""
+        shutil.rmtree(self.tmpdir)
+
+    def test_put_and_get(self):
+        """test storing body by URL and ETag"""
+        entry = self.cache.put('a', {'Etag': '"x"'}, [b'01', b'234'])
+        self.assertEqual('x', entry['etag'])
+        self.assertEqual(entry, self.cache.get('a'))
+        self.assertTrue(self.cache.fresh(entry))
+        with open(entry['path'], 'rb') as fobj:
+            self.assertEqual(b'01234', fobj.read())
+        self.assertIsNone(self.cache.get('b'))
+
+        replaced = self.cache.put('a', {'Etag': 'y'}, [b'56'])
+        self.assertNotEqual(entry['path'], replaced['path'])
+        self.assertFalse(os.path.exists(entry['path']))
+        self.cache.discard('a')
+        self.assertIsNone(self.cache.get('a'))
+
+    def test_evict(self):
+        """test evicting least recently used bodies beyond budget"""
+        self.cache.put('a', {'Etag': 'a'}, [b'0123'])
+        os.utime(os.path.join(self.tmpdir, os.listdir(self.tmpdir)[0]),
+                 (0, 0))
+        self.cache.put('b', {'Etag': 'b'}, [b'0123'])
+        self.cache.put('c', {'Etag': 'c'}, [b'0123'])
+        self.assertIsNone(self.cache.get('a'))
+        self.assertIsNotNone(self.cache.get('b'))
+        self.assertIsNotNone(self.cache.get('c'))
+        # the budget is restored from the directory
+        self.assertIsNotNone(ObjectCache(self.tmpdir, 10).get('c'))
+
+    def test_renew(self):
+        """test renewing validation of stale entry"""
+        cache = ObjectCache(self.tmpdir, stale_after=0)
+        cache.put('a', {'Etag': 'a'}, [b'0'])
+        self.assertFalse(cache.fresh(cache.get('a')))
+        cache.stale_after = 60
+        cache.renew('a')
+        self.assertTrue(cache.fresh(cache.get('a')))
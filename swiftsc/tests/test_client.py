@@ -1,10 +1,21 @@
 # -*- coding: utf-8 -*-
 """swiftsc.client unit tests."""
 import os.path
+import hashlib
+import json
+import re
+import shutil
+import tarfile
+import tempfile
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 import requests_mock
+from swiftsc.cache import ResponseCache, ObjectCache
 from swiftsc.client import Client
-from swiftsc.exception import AuthenticationError
+from swiftsc.exception import (AuthenticationError, ResponseError,
+                               IntegrityError, ValidationError)
 from swiftsc.tests import test_vars as v
 
 
@@ -23,6 +34,9 @@ class ClientTests(unittest.TestCase):
             self.tclient = Client(auth_uri=v.AUTH_URL,
                                   username=v.USERNAME,
                                   password=v.PASSWORD)
+            self.tclient.authenticate()
+        #: bodies of SLO segments by path, recorded by _mock_slo
+        self.segments = {}
 
     @requests_mock.Mocker()
     def test_get_token_keystone(self, _mock):
@@ -40,6 +54,7 @@ class ClientTests(unittest.TestCase):
     def test_get_token_keystone_v3(self, _mock):
         """Unit test of retrieve_token"""
         _mock.post(v.KEYSTONE_V3_URL,
+                   status_code=201,
                    headers={'x-subject-token': v.KEYSTONE_TOKEN},
                    json=v.KEYSTONE_V3)
         cli = Client(auth_uri=v.KEYSTONE_V3_URL,
@@ -60,11 +75,292 @@ class ClientTests(unittest.TestCase):
                                    'authentication.'),
                        'code': 401,
                        'title': 'Unauthorized'}})
+        cli = Client(auth_uri=v.KEYSTONE_V3_URL,
+                     username=v.USERNAME,
+                     password=v.PASSWORD,
+                     tenant_name=v.TENANT_NAME)
         with self.assertRaises(AuthenticationError):
-            Client(auth_uri=v.KEYSTONE_V3_URL,
-                   username=v.USERNAME,
-                   password=v.PASSWORD,
-                   tenant_name=v.TENANT_NAME)
+            cli.containers.list()
+
+    @requests_mock.Mocker()
+    def test_lazy_authentication(self, _mock):
+        """Unit test of authenticating on the first request"""
+        cli = Client(auth_uri=v.AUTH_URL,
+                     username=v.USERNAME,
+                     password=v.PASSWORD)
+        self.assertEqual(0, _mock.call_count)
+        _mock.get(v.AUTH_URL, headers={'X-Auth-Token': v.TOKEN,
+                                       'X-Storage-Url': v.STORAGE_URL})
+        _mock.put('%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, v.OBJECT_NAME),
+                  status_code=201)
+        cli.container(v.CNTR_NAME).object(v.OBJECT_NAME).create(v.TEST_FILE)
+        self.assertEqual(v.TOKEN,
+                         _mock.last_request.headers['X-Auth-Token'])
+        cli.containers.container(v.CNTR_NAME)
+        cli.containers.objects.create(name=v.OBJECT_NAME,
+                                      file_path=v.TEST_FILE)
+        self.assertEqual(3, _mock.call_count)
+
+    @requests_mock.Mocker()
+    def test_token_cache(self, _mock):
+        """Unit test of reusing token cached by another client"""
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        path = os.path.join(tmpdir, 'tokens.json')
+        _mock.get(v.AUTH_URL, headers={'X-Auth-Token': v.TOKEN,
+                                       'X-Storage-Url': v.STORAGE_URL,
+                                       'X-Auth-Token-Expires': '3600'})
+        for _ in range(2):
+            cli = Client(auth_uri=v.AUTH_URL, username=v.USERNAME,
+                         password=v.PASSWORD, token_cache=path)
+            self.assertEqual(v.STORAGE_URL, cli.uri)
+            self.assertEqual(v.TOKEN, cli.headers['X-Auth-Token'])
+        self.assertEqual(1, _mock.call_count)
+        self.assertAlmostEqual(time.time() + 3600, cli.expires, delta=5)
+
+    @requests_mock.Mocker()
+    def test_token_cache_keystone(self, _mock):
+        """Unit test of caching KeyStone token until expiry"""
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        _mock.post(v.KEYSTONE_URL, json=v.KEYSTONE)
+        cli = Client(auth_uri=v.KEYSTONE_URL,
+                     username=v.USERNAME,
+                     password=v.PASSWORD,
+                     tenant_name=v.TENANT_NAME,
+                     token_cache=os.path.join(tmpdir, 'tokens.json'))
+        cli.authenticate()
+        self.assertEqual(1370333144, cli.expires)
+        # the token of the sample payload has already expired
+        cli.authenticate()
+        self.assertEqual(2, _mock.call_count)
+
+    @requests_mock.Mocker()
+    def test_token_cache_interface(self, _mock):
+        """Unit test of caching Storage URL by interface and region"""
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        path = os.path.join(tmpdir, 'tokens.json')
+        payload = json.loads(json.dumps(v.KEYSTONE))
+        payload['access']['token']['expires'] = time.strftime(
+            '%Y-%m-%dT%H:%M:%SZ', time.gmtime(time.time() + 3600))
+        for service in payload['access']['serviceCatalog']:
+            if service['type'] == 'object-store':
+                service['endpoints'][0]['internalURL'] = (
+                    'https://internal.example.org/v1/AUTH_t')
+        _mock.post(v.KEYSTONE_URL, json=payload)
+
+        def _client(**kwargs):
+            return Client(auth_uri=v.KEYSTONE_URL, username=v.USERNAME,
+                          password=v.PASSWORD, tenant_name=v.TENANT_NAME,
+                          token_cache=path, **kwargs)
+
+        self.assertEqual('https://internal.example.org/v1/AUTH_t',
+                         _client(interface='internal').uri)
+        self.assertEqual(v.STORAGE_URL_KS, _client().uri)
+        self.assertEqual(2, _mock.call_count)
+        self.assertEqual(v.STORAGE_URL_KS, _client().uri)
+        self.assertEqual('https://internal.example.org/v1/AUTH_t',
+                         _client(interface='internal').uri)
+        self.assertEqual(2, _mock.call_count)
+
+    def _mock_token_rollover(self, _mock, uri, status_code=200,
+                             **kwargs):
+        """Mock auth issuing a new token, and uri rejecting the old one."""
+        _mock.get(v.AUTH_URL, headers={'X-Auth-Token': 'new_token',
+                                       'X-Storage-Url': v.STORAGE_URL})
+
+        def _status(request, context):
+            if request.headers['X-Auth-Token'] != 'new_token':
+                context.status_code = 401
+            else:
+                context.status_code = status_code
+            return b''.join(request.body) if request.body else b''
+
+        _mock.register_uri(kwargs.pop('method', 'GET'), uri,
+                           content=_status)
+
+    @requests_mock.Mocker()
+    def test_refresh_token(self, _mock):
+        """Unit test of retrying request with refreshed token"""
+        self._mock_token_rollover(_mock, v.STORAGE_URL)
+        self.tclient.containers.container(v.CNTR_NAME)
+        res = self.tclient.containers.list()
+        self.assertEqual(200, res.status_code)
+        self.assertEqual(['GET', 'GET', 'GET'],
+                         [req.method for req in _mock.request_history])
+        self.assertEqual('new_token',
+                         self.tclient.containers.objects.headers[
+                             'X-Auth-Token'])
+
+    @requests_mock.Mocker()
+    def test_refresh_token_concurrent(self, _mock):
+        """Unit test of re-authenticating once for concurrent requests"""
+        self._mock_token_rollover(_mock, v.STORAGE_URL)
+        with ThreadPoolExecutor(8) as executor:
+            codes = list(executor.map(
+                lambda _: self.tclient.containers.list().status_code,
+                range(8)))
+        self.assertEqual([200] * 8, codes)
+        self.assertEqual(1, len([req for req in _mock.request_history
+                                 if req.url.startswith(v.AUTH_URL)]))
+
+    @requests_mock.Mocker()
+    def test_refresh_token_upload(self, _mock):
+        """Unit test of sending object body again with refreshed token"""
+        uri = '%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, v.OBJECT_NAME)
+        self._mock_token_rollover(_mock, uri, status_code=201, method='PUT')
+        self.tclient.containers.container(v.CNTR_NAME)
+        res = self.tclient.containers.objects.create(name=v.OBJECT_NAME,
+                                                     file_path=v.TEST_FILE,
+                                                     chunk_size=1000)
+        self.assertEqual(201, res.status_code)
+        with open(v.TEST_FILE, 'rb') as fobj:
+            self.assertEqual(fobj.read(), res.content)
+
+    @requests_mock.Mocker()
+    def test_refresh_token_without_credentials(self, _mock):
+        """Unit test of returning 401 to client having only token"""
+        _mock.get(v.STORAGE_URL, status_code=401)
+        cli = Client(uri=v.STORAGE_URL, token=v.TOKEN)
+        self.assertEqual(401, cli.containers.list().status_code)
+        self.assertEqual(1, _mock.call_count)
+
+    @requests_mock.Mocker()
+    def test_response_cache(self, _mock):
+        """Unit test of caching listings until changed"""
+        cli = Client(uri=v.STORAGE_URL, token=v.TOKEN, response_cache=True)
+        _mock.get(v.STORAGE_URL, json=v.CONTAINERS)
+        _mock.post('%s/%s' % (v.STORAGE_URL, v.CNTR_NAME), status_code=204)
+        self.assertEqual(v.CONTAINERS, cli.containers.list().json())
+        self.assertEqual(v.CONTAINERS, cli.containers.list().json())
+        self.assertEqual(1, _mock.call_count)
+        self.assertEqual(1, cli.response_cache.hits)
+        cli.containers.update_metadata(v.CNTR_NAME)
+        cli.containers.list()
+        self.assertEqual(3, _mock.call_count)
+
+    @requests_mock.Mocker()
+    def test_response_cache_revalidate(self, _mock):
+        """Unit test of revalidating stale metadata"""
+        cache = ResponseCache(ttl=0)
+        cli = Client(uri=v.STORAGE_URL, token=v.TOKEN, response_cache=cache)
+        uri = '%s/%s' % (v.STORAGE_URL, v.CNTR_NAME)
+        _mock.head(uri, [{'headers': {'Etag': 'abc',
+                                      'X-Container-Object-Count': '3'}},
+                         {'status_code': 304}])
+        first = cli.containers.show_metadata(v.CNTR_NAME)
+        second = cli.containers.show_metadata(v.CNTR_NAME)
+        self.assertIs(first, second)
+        self.assertEqual('abc',
+                         _mock.last_request.headers['If-None-Match'])
+        self.assertEqual(v.TOKEN, _mock.last_request.headers['X-Auth-Token'])
+        self.assertEqual(1, cache.revalidated)
+
+    @requests_mock.Mocker()
+    def test_object_cache(self, _mock):
+        """Unit test of reading objects through local disk cache"""
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        cache = ObjectCache(tmpdir, stale_after=60)
+        cli = Client(uri=v.STORAGE_URL, token=v.TOKEN, object_cache=cache)
+        uri = '%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, v.OBJECT_NAME)
+        etag = hashlib.md5(b'sample').hexdigest()
+        _mock.get(uri, [{'content': b'sample', 'headers': {'Etag': etag}},
+                        {'status_code': 304}])
+        _mock.put(uri, status_code=201)
+        cli.containers.container(v.CNTR_NAME)
+        objects = cli.containers.objects
+        path = objects.fetch(v.OBJECT_NAME)
+        self.assertEqual(b'sample', objects.detail(v.OBJECT_NAME).content)
+        self.assertEqual(1, _mock.call_count)
+
+        cache.stale_after = 0
+        self.assertEqual(path, objects.fetch(v.OBJECT_NAME))
+        self.assertEqual(etag, _mock.last_request.headers['If-None-Match'])
+
+        objects.create(name=v.OBJECT_NAME, file_path=v.TEST_FILE)
+        self.assertIsNone(cache.get(uri))
+
+        _mock.get(uri + '.missing', status_code=404, text='Not Found')
+        res = objects.detail(v.OBJECT_NAME + '.missing')
+        self.assertEqual((404, 'Not Found'), (res.status_code, res.text))
+        with self.assertRaises(ResponseError):
+            objects.fetch(v.OBJECT_NAME + '.missing')
+        self.assertIsNone(cache.get(uri + '.missing'))
+        self.tclient.containers.container(v.CNTR_NAME)
+        with self.assertRaises(ValidationError):
+            self.tclient.containers.objects.fetch(v.OBJECT_NAME)
+
+    @requests_mock.Mocker()
+    def test_object_cache_bulk(self, _mock):
+        """Unit test of discarding objects changed by bulk requests"""
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        cache = ObjectCache(os.path.join(tmpdir, 'cache'), stale_after=60)
+        cli = Client(uri=v.STORAGE_URL, token=v.TOKEN, object_cache=cache)
+        _mock.get(v.INFO_URL, json=v.INFO)
+        _mock.get(re.compile('/%s/' % v.CNTR_NAME), content=b'hello',
+                  headers={'Etag': hashlib.md5(b'hello').hexdigest()})
+        _mock.post(v.STORAGE_URL + '?bulk-delete=true',
+                   json={'Number Deleted': 2, 'Number Not Found': 0,
+                         'Errors': []})
+        _mock.put(re.compile('extract-archive'),
+                  json={'Number Files Created': 1, 'Errors': []})
+        objects = cli.container(v.CNTR_NAME).objects
+        names = ['ref', u'r\u00e9f', 'backup/a.txt']
+        keys = ['%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, name)
+                for name in names]
+        for name in names:
+            objects.fetch(name)
+        self.assertEqual(b'hello', objects.detail('ref').content)
+        self.assertEqual(3, len([key for key in keys if cache.get(key)]))
+
+        objects.bulk_delete(names[:2])
+        self.assertEqual([None, None], [cache.get(key) for key in keys[:2]])
+        with open(os.path.join(tmpdir, 'a.txt'), 'wb') as fobj:
+            fobj.write(b'new')
+        objects.bulk_upload([(os.path.join(tmpdir, 'a.txt'), 'a.txt')],
+                            prefix='backup')
+        self.assertIsNone(cache.get(keys[2]))
+        self.assertEqual(b'hello', objects.detail('ref').content)
+        self.assertEqual(4, len([req for req in _mock.request_history
+                                 if req.method == 'GET' and
+                                 '/info' not in req.url]))
+
+    def test_shared_session(self):
+        """Unit test of sharing session with containers and objects"""
+        self.assertIs(self.tclient.session, self.tclient.containers.session)
+        self.tclient.containers.container(v.CNTR_NAME)
+        self.assertIs(self.tclient.session,
+                      self.tclient.containers.objects.session)
+
+    def test_connection_pool(self):
+        """Unit test of connection pool size"""
+        cli = Client(uri=v.STORAGE_URL, token=v.TOKEN,
+                     pool_connections=2, pool_maxsize=20)
+        adapter = cli.session.get_adapter(v.STORAGE_URL)
+        self.assertEqual(
+            2, adapter._pool_connections)  # pylint: disable=protected-access
+        self.assertEqual(20,
+                         adapter.poolmanager.connection_pool_kw['maxsize'])
+        self.assertEqual('keep-alive', cli.session.headers['Connection'])
+
+    def test_no_keep_alive(self):
+        """Unit test of disabling keep-alive"""
+        cli = Client(uri=v.STORAGE_URL, token=v.TOKEN, keep_alive=False)
+        self.assertEqual('close', cli.session.headers['Connection'])
+
+    @requests_mock.Mocker()
+    def test_context_manager(self, _mock):
+        """Unit test of closing session with context manager"""
+        _mock.get(v.STORAGE_URL, json=v.CONTAINERS)
+        with Client(uri=v.STORAGE_URL, token=v.TOKEN) as cli:
+            self.assertEqual(200, cli.containers.list().status_code)
+            adapter = cli.session.get_adapter(v.STORAGE_URL)
+            adapter.get_connection(v.STORAGE_URL)
+            self.assertEqual(1, len(adapter.poolmanager.pools))
+        self.assertEqual(0, len(adapter.poolmanager.pools))
 
     @requests_mock.Mocker()
     def test_list_containers(self, _mock):
@@ -77,6 +373,52 @@ class ClientTests(unittest.TestCase):
         self.assertListEqual(v.CONTAINERS,
                              self.tclient.containers.list().json())
 
+    @staticmethod
+    def _mock_listing(_mock, uri, names):
+        """Mock paginated listing of names."""
+        def _listing(request, context):
+            query = request.qs
+            limit = int(query['limit'][0])
+            marker = query.get('marker', [''])[0]
+            prefix = query.get('prefix', [''])[0]
+            entries = [{'name': name} for name in names
+                       if name > marker and name.startswith(prefix)]
+            if not entries:
+                context.status_code = 204
+                return ''
+            return json.dumps(entries[:limit])
+
+        _mock.get(uri, text=_listing)
+
+    @requests_mock.Mocker()
+    def test_iter_list_containers(self, _mock):
+        """unit test of iterating paginated list of containers"""
+        names = ['container-%03d' % i for i in range(25)]
+        self._mock_listing(_mock, v.STORAGE_URL, names)
+        self.assertEqual(names, [cont['name'] for cont in
+                                 self.tclient.containers.iter_list(limit=10)])
+        self.assertEqual(3, _mock.call_count)
+
+    @requests_mock.Mocker()
+    def test_iter_list_objects(self, _mock):
+        """unit test of iterating paginated list of objects"""
+        names = ['a/%03d' % i for i in range(20)] + ['b/000']
+        self._mock_listing(_mock, '%s/%s' % (v.STORAGE_URL, v.CNTR_NAME),
+                           names)
+        self.tclient.containers.container(v.CNTR_NAME)
+        objects = self.tclient.containers.objects
+        self.assertEqual(names[:20], [obj['name'] for obj in
+                                      objects.iter_list(prefix='a/',
+                                                        limit=5)])
+        self.assertEqual(5, _mock.call_count)
+        self.assertEqual(['a/015', 'a/016'],
+                         [obj['name'] for obj in
+                          objects.iter_list(prefix='a/', marker='a/014',
+                                            end_marker='a/017',
+                                            delimiter='/')][:2])
+        self.assertEqual(['/'], _mock.last_request.qs['delimiter'])
+        self.assertEqual(['a/017'], _mock.last_request.qs['end_marker'])
+
     @requests_mock.Mocker()
     def test_create_container(self, _mock):
         """unit test of create container"""
@@ -127,6 +469,232 @@ class ClientTests(unittest.TestCase):
         self.assertEqual(201, res.status_code)
         data.close()
 
+    @requests_mock.Mocker()
+    def test_create_object_streaming(self, _mock):
+        """unit test of streaming object body in chunks"""
+        object_name = os.path.basename(v.TEST_FILE)
+        _mock.put('%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, object_name),
+                  status_code=201)
+        self.tclient.containers.container(v.CNTR_NAME)
+        res = self.tclient.containers.objects.create(file_path=v.TEST_FILE,
+                                                     chunk_size=1024)
+        self.assertEqual(201, res.status_code)
+        req = _mock.last_request
+        self.assertEqual(str(v.TEST_FILE_SIZE), req.headers['Content-Length'])
+        self.assertEqual(v.TEST_FILE_MIMETYPE, req.headers['Content-Type'])
+        self.assertNotIn('Content-Length', self.tclient.headers)
+
+    @requests_mock.Mocker()
+    def test_create_object_content_type(self, _mock):
+        """unit test of passing or disabling content type"""
+        uri = '%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, v.OBJECT_NAME)
+        _mock.put(uri, status_code=201)
+        self.tclient.containers.container(v.CNTR_NAME)
+        self.tclient.containers.objects.create(name=v.OBJECT_NAME,
+                                               file_path=v.TEST_FILE,
+                                               content_type='text/x-log')
+        self.assertEqual('text/x-log',
+                         _mock.last_request.headers['Content-Type'])
+        with open(v.TEST_FILE, 'rb') as fobj:
+            self.tclient.containers.objects.create(name=v.OBJECT_NAME,
+                                                   file_path=fobj,
+                                                   content_type=False)
+        self.assertNotIn('Content-Type', _mock.last_request.headers)
+
+    @requests_mock.Mocker()
+    def test_handles_concurrent(self, _mock):
+        """Unit test of uploading with handles from several threads"""
+        _mock.put(re.compile('%s/%s/' % (v.STORAGE_URL, v.CNTR_NAME)),
+                  status_code=201)
+        bucket = self.tclient.container(v.CNTR_NAME)
+        types = ['text/x-%d' % i for i in range(8)]
+        with ThreadPoolExecutor(4) as executor:
+            codes = list(executor.map(
+                lambda mimetype: bucket.object(mimetype[5:]).create(
+                    v.TEST_FILE, content_type=mimetype).status_code,
+                types))
+        self.assertEqual([201] * 8, codes)
+        self.assertEqual(
+            sorted(types),
+            sorted(req.headers['Content-Type']
+                   for req in _mock.request_history))
+        for req in _mock.request_history:
+            self.assertTrue(req.path.endswith(req.headers['Content-Type'][5:]))
+        self.assertEqual({'X-Auth-Token': v.TOKEN}, self.tclient.headers)
+        self.assertIsNone(self.tclient.containers.objects)
+
+    def test_handles_immutable(self):
+        """Unit test of immutable handles"""
+        obj = self.tclient.container(v.CNTR_NAME).object(v.OBJECT_NAME)
+        with self.assertRaises(AttributeError):
+            obj.name = 'other'
+        with self.assertRaises(AttributeError):
+            obj.container.extra = 1
+        self.assertIs(self.tclient, obj.client)
+        with self.assertRaises(ValidationError):
+            self.tclient.container(None)
+
+    @requests_mock.Mocker()
+    def test_handle_requests(self, _mock):
+        """Unit test of requests of handles"""
+        uri = '%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, v.OBJECT_NAME)
+        _mock.head(uri, headers={'Content-Length': '6'})
+        _mock.put('%s/%s/copy' % (v.STORAGE_URL, v.CNTR_NAME),
+                  status_code=201)
+        _mock.delete('%s/%s' % (v.STORAGE_URL, v.CNTR_NAME),
+                     status_code=204)
+        bucket = self.tclient.container(v.CNTR_NAME)
+        obj = bucket.object(v.OBJECT_NAME)
+        self.assertEqual('6', obj.show_metadata().headers['Content-Length'])
+        self.assertEqual(201, obj.copy('copy').status_code)
+        self.assertEqual('/%s/%s' % (v.CNTR_NAME, v.OBJECT_NAME),
+                         _mock.last_request.headers['X-Copy-From'])
+        self.assertEqual(204, bucket.delete().status_code)
+
+    @requests_mock.Mocker()
+    def test_create_object_etag(self, _mock):
+        """unit test of sending and verifying ETag of object"""
+        uri = '%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, v.OBJECT_NAME)
+        with open(v.TEST_FILE, 'rb') as fobj:
+            etag = hashlib.md5(fobj.read()).hexdigest()
+
+        def _put(request, context):
+            context.headers['Etag'] = hashlib.md5(
+                b''.join(request.body)).hexdigest()
+            return b''
+
+        _mock.put(uri, status_code=201, content=_put)
+        self.tclient.containers.container(v.CNTR_NAME)
+        self.tclient.containers.objects.create(name=v.OBJECT_NAME,
+                                               file_path=v.TEST_FILE,
+                                               etag=True)
+        self.assertEqual(etag, _mock.last_request.headers['ETag'])
+
+        _mock.put(uri, status_code=201,
+                  headers={'Etag': '"%s"' % v.OBJECTS[0]['hash']},
+                  content=lambda request, context: b''.join(request.body))
+        with self.assertRaises(IntegrityError):
+            self.tclient.containers.objects.create(name=v.OBJECT_NAME,
+                                                   file_path=v.TEST_FILE)
+
+    @requests_mock.Mocker()
+    def test_create_empty_object(self, _mock):
+        """unit test of create empty object"""
+        _mock.put('%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME,
+                                v.OBJECT_ZERO_NAME),
+                  status_code=201)
+        self.tclient.containers.container(v.CNTR_NAME)
+        res = self.tclient.containers.objects.create(file_path=v.ZERO_FILE)
+        self.assertEqual(201, res.status_code)
+        self.assertEqual('0', _mock.last_request.headers['Content-Length'])
+
+    @requests_mock.Mocker()
+    def test_create_object_from_pipe(self, _mock):
+        """unit test of create object from pipe of unknown length"""
+        object_name = os.path.basename(v.TEST_FILE)
+        _mock.put('%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, object_name),
+                  status_code=201)
+        self.tclient.containers.container(v.CNTR_NAME)
+        rfd, wfd = os.pipe()
+        with open(v.TEST_FILE, 'rb') as fobj:
+            os.write(wfd, fobj.read())
+        os.close(wfd)
+        with os.fdopen(rfd, 'rb') as pipe:
+            res = self.tclient.containers.objects.create(name=object_name,
+                                                         file_path=pipe)
+        self.assertEqual(201, res.status_code)
+        req = _mock.last_request
+        self.assertEqual('chunked', req.headers['Transfer-Encoding'])
+        self.assertNotIn('Content-Length', req.headers)
+        self.assertEqual(v.TEST_FILE_MIMETYPE, req.headers['Content-Type'])
+
+    def _mock_slo(self, _mock, object_name):
+        """Mock segment container, segments and manifest."""
+        seg_uri = '%s/%s_segments' % (v.STORAGE_URL, v.CNTR_NAME)
+        _mock.put(seg_uri, status_code=201)
+        self.segments.clear()
+
+        def _segment(request, context):
+            self.segments[request.path] = b''.join(request.body)
+            context.headers['Etag'] = hashlib.md5(
+                self.segments[request.path]).hexdigest()
+            return ''
+
+        _mock.put(re.compile('^%s/%s/slo/' % (re.escape(seg_uri),
+                                              object_name)),
+                  status_code=201,
+                  text=_segment)
+        _mock.put('%s/%s/%s?multipart-manifest=put'
+                  % (v.STORAGE_URL, v.CNTR_NAME, object_name),
+                  status_code=201)
+
+    def _assert_manifest(self, _mock):
+        """Assert SLO manifest of sample file split by 1000 bytes."""
+        manifest = json.loads(_mock.last_request.text)
+        self.assertEqual((v.TEST_FILE_SIZE + 999) // 1000, len(manifest))
+        self.assertEqual(v.TEST_FILE_SIZE,
+                         sum(seg['size_bytes'] for seg in manifest))
+        self.assertEqual(sorted(seg['path'] for seg in manifest),
+                         [seg['path'] for seg in manifest])
+        with open(v.TEST_FILE, 'rb') as fobj:
+            body = fobj.read()
+        self.assertEqual(hashlib.md5(body[:1000]).hexdigest(),
+                         manifest[0]['etag'])
+        self.assertEqual(body,
+                         b''.join(self.segments[path]
+                                  for path in sorted(self.segments)))
+
+    @requests_mock.Mocker()
+    def test_create_large_object(self, _mock):
+        """unit test of create Static Large Object"""
+        object_name = os.path.basename(v.TEST_FILE)
+        self._mock_slo(_mock, object_name)
+        self.tclient.containers.container(v.CNTR_NAME)
+        res = self.tclient.containers.objects.create_large(
+            file_path=v.TEST_FILE, segment_size=1000, concurrency=3)
+        self.assertEqual(201, res.status_code)
+        self.assertEqual(v.TEST_FILE_MIMETYPE,
+                         _mock.last_request.headers['Content-Type'])
+        self._assert_manifest(_mock)
+
+    @requests_mock.Mocker()
+    def test_create_large_object_from_stdin(self, _mock):
+        """unit test of create Static Large Object from stream"""
+        object_name = os.path.basename(v.TEST_FILE)
+        self._mock_slo(_mock, object_name)
+        self.tclient.containers.container(v.CNTR_NAME)
+        with open(v.TEST_FILE, 'rb') as fobj:
+            res = self.tclient.containers.objects.create_large(
+                name=object_name, file_path=BytesIO(fobj.read()),
+                segment_size=1000, chunk_size=300)
+        self.assertEqual(201, res.status_code)
+        self._assert_manifest(_mock)
+
+    @requests_mock.Mocker()
+    def test_create_large_object_small(self, _mock):
+        """unit test of create Static Large Object from small file"""
+        object_name = os.path.basename(v.TEST_FILE)
+        _mock.put('%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, object_name),
+                  status_code=201)
+        self.tclient.containers.container(v.CNTR_NAME)
+        res = self.tclient.containers.objects.create_large(
+            file_path=v.TEST_FILE)
+        self.assertEqual(201, res.status_code)
+        self.assertEqual(1, _mock.call_count)
+
+    @requests_mock.Mocker()
+    def test_create_large_object_fail(self, _mock):
+        """unit test of failing segment upload"""
+        object_name = os.path.basename(v.TEST_FILE)
+        self._mock_slo(_mock, object_name)
+        _mock.put(re.compile('/00000003$'), status_code=503)
+        self.tclient.containers.container(v.CNTR_NAME)
+        with self.assertRaises(ResponseError):
+            self.tclient.containers.objects.create_large(
+                file_path=v.TEST_FILE, segment_size=1000, concurrency=2)
+        self.assertFalse(any('multipart-manifest' in req.url
+                             for req in _mock.request_history))
+
     @requests_mock.Mocker()
     def test_list_objects(self, _mock):
         """Unit test of list_objects"""
@@ -161,6 +729,419 @@ class ClientTests(unittest.TestCase):
         self.assertEqual(200, res.status_code)
         self.assertEqual(body, res.content)
 
+    @requests_mock.Mocker()
+    def test_iter_content_object(self, _mock):
+        """unit test of iterating object body in chunks"""
+        object_name = os.path.basename(v.TEST_FILE)
+        with open(v.TEST_FILE, 'rb') as fobj:
+            body = fobj.read()
+        _mock.get('%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, object_name),
+                  content=body)
+        self.tclient.containers.container(v.CNTR_NAME)
+        chunks = list(self.tclient.containers.objects.iter_content(
+            object_name, chunk_size=1000))
+        self.assertEqual(body, b''.join(chunks))
+        self.assertTrue(all(len(chunk) <= 1000 for chunk in chunks))
+
+    @requests_mock.Mocker()
+    def test_download_object(self, _mock):
+        """unit test of downloading object to path, file and callable"""
+        object_name = os.path.basename(v.TEST_FILE)
+        with open(v.TEST_FILE, 'rb') as fobj:
+            body = fobj.read()
+        _mock.get('%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, object_name),
+                  content=body)
+        self.tclient.containers.container(v.CNTR_NAME)
+        objects = self.tclient.containers.objects
+
+        dest = tempfile.NamedTemporaryFile(delete=False)
+        dest.close()
+        try:
+            res = objects.download(object_name, dest.name)
+            self.assertEqual(200, res.status_code)
+            with open(dest.name, 'rb') as fobj:
+                self.assertEqual(body, fobj.read())
+        finally:
+            os.remove(dest.name)
+
+        bio = BytesIO()
+        objects.download(object_name, bio, chunk_size=100)
+        self.assertEqual(body, bio.getvalue())
+
+        chunks = []
+        objects.download(object_name, chunks.append, chunk_size=100)
+        self.assertEqual(body, b''.join(chunks))
+
+    @requests_mock.Mocker()
+    def test_download_object_corrupted(self, _mock):
+        """unit test of verifying downloaded body against ETag"""
+        with open(v.TEST_FILE, 'rb') as fobj:
+            body = fobj.read()
+        uri = '%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, v.OBJECT_NAME)
+        _mock.get(uri, content=body,
+                  headers={'Etag': hashlib.md5(body).hexdigest()})
+        self.tclient.containers.container(v.CNTR_NAME)
+        bio = BytesIO()
+        self.tclient.containers.objects.download(v.OBJECT_NAME, bio)
+        self.assertEqual(body, bio.getvalue())
+        _mock.get(uri, content=body, headers={'Etag': v.OBJECTS[0]['hash']})
+        with self.assertRaises(IntegrityError):
+            self.tclient.containers.objects.download(v.OBJECT_NAME,
+                                                     BytesIO())
+
+    @requests_mock.Mocker()
+    def test_download_object_not_found(self, _mock):
+        """unit test of downloading missing object"""
+        _mock.get('%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, v.OBJECT_NAME),
+                  status_code=404)
+        self.tclient.containers.container(v.CNTR_NAME)
+        with self.assertRaises(ResponseError) as err:
+            self.tclient.containers.objects.download(v.OBJECT_NAME,
+                                                     BytesIO())
+        self.assertEqual(404, err.exception.response.status_code)
+
+    @staticmethod
+    def _mock_ranged_object(_mock, body, headers):
+        """Mock HEAD and ranged GET of object."""
+        uri = '%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, v.OBJECT_NAME)
+
+        def _ranged(request, context):
+            first, last = request.headers['Range'][6:].split('-')
+            context.status_code = 206
+            return body[int(first):int(last) + 1]
+
+        headers = dict(headers, **{'Content-Length': str(len(body))})
+        _mock.head(uri, headers=headers)
+        _mock.get(uri, content=_ranged)
+        return uri
+
+    def _download_parallel(self):
+        """Download object in ranges of 1000 bytes."""
+        dest = tempfile.NamedTemporaryFile(delete=False)
+        dest.close()
+        self.tclient.containers.container(v.CNTR_NAME)
+        self.tclient.containers.objects.download_parallel(
+            v.OBJECT_NAME, dest.name, part_size=1000, concurrency=3)
+        return dest.name
+
+    @requests_mock.Mocker()
+    def test_download_parallel_object(self, _mock):
+        """unit test of downloading object in parallel ranges"""
+        with open(v.TEST_FILE, 'rb') as fobj:
+            body = fobj.read()
+        self._mock_ranged_object(
+            _mock, body, {'Etag': hashlib.md5(body).hexdigest()})
+        dest = self._download_parallel()
+        try:
+            with open(dest, 'rb') as fobj:
+                self.assertEqual(body, fobj.read())
+        finally:
+            os.remove(dest)
+        ranges = [req.headers['Range'] for req in _mock.request_history
+                  if req.method == 'GET']
+        self.assertIn('bytes=0-999', ranges)
+        self.assertEqual((v.TEST_FILE_SIZE + 999) // 1000, len(ranges))
+
+    @requests_mock.Mocker()
+    def test_download_parallel_corrupted(self, _mock):
+        """unit test of detecting corrupted parallel download"""
+        with open(v.TEST_FILE, 'rb') as fobj:
+            body = fobj.read()
+        self._mock_ranged_object(_mock, body, {'Etag': v.OBJECTS[0]['hash']})
+        dest = tempfile.NamedTemporaryFile(delete=False)
+        dest.close()
+        self.tclient.containers.container(v.CNTR_NAME)
+        with self.assertRaises(IntegrityError):
+            self.tclient.containers.objects.download_parallel(
+                v.OBJECT_NAME, dest.name, part_size=1000)
+        self.assertFalse(os.path.exists(dest.name))
+
+    @requests_mock.Mocker()
+    def test_download_parallel_range_ignored(self, _mock):
+        """unit test of rejecting full body to range request"""
+        with open(v.TEST_FILE, 'rb') as fobj:
+            body = fobj.read()
+        uri = '%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, v.OBJECT_NAME)
+        _mock.head(uri, headers={'Content-Length': str(len(body))})
+        _mock.get(uri, content=body)
+        dest = tempfile.NamedTemporaryFile(delete=False)
+        dest.close()
+        self.tclient.containers.container(v.CNTR_NAME)
+        with self.assertRaises(ResponseError):
+            self.tclient.containers.objects.download_parallel(
+                v.OBJECT_NAME, dest.name, part_size=1000)
+        self.assertFalse(os.path.exists(dest.name))
+
+        # a single range of the whole object may be answered by 200
+        self.tclient.containers.objects.download_parallel(
+            v.OBJECT_NAME, dest.name, part_size=len(body))
+        try:
+            with open(dest.name, 'rb') as fobj:
+                self.assertEqual(body, fobj.read())
+        finally:
+            os.remove(dest.name)
+
+    @requests_mock.Mocker()
+    def test_download_parallel_slo(self, _mock):
+        """unit test of verifying parallel download of SLO"""
+        with open(v.TEST_FILE, 'rb') as fobj:
+            body = fobj.read()
+        uri = self._mock_ranged_object(
+            _mock, body, {'Etag': '"%s"' % v.OBJECTS[0]['hash'],
+                          'X-Static-Large-Object': 'True'})
+        manifest = [{'name': '/%s_segments/%d' % (v.CNTR_NAME, offset),
+                     'bytes': len(body[offset:offset + 2000]),
+                     'hash': hashlib.md5(
+                         body[offset:offset + 2000]).hexdigest()}
+                    for offset in range(0, len(body), 2000)]
+        _mock.get(uri + '?multipart-manifest=get', json=manifest)
+        os.remove(self._download_parallel())
+        # ranges are aligned with the segments larger than part_size
+        self.assertIn('bytes=0-1999',
+                      [req.headers.get('Range')
+                       for req in _mock.request_history])
+
+        manifest[-1]['hash'] = v.OBJECTS[0]['hash']
+        _mock.get(uri + '?multipart-manifest=get', json=manifest)
+        with self.assertRaises(IntegrityError):
+            self._download_parallel()
+
+    @requests_mock.Mocker()
+    def test_capabilities(self, _mock):
+        """unit test of retrieving capabilities of cluster"""
+        _mock.get(v.INFO_URL, json=v.INFO)
+        self.assertEqual(v.INFO, self.tclient.capabilities())
+        self.assertEqual(v.INFO, self.tclient.capabilities())
+        self.assertEqual(1, _mock.call_count)
+
+    @requests_mock.Mocker()
+    def test_bulk_delete_object(self, _mock):
+        """unit test of bulk delete objects"""
+        _mock.get(v.INFO_URL, json=v.INFO)
+        bodies = []
+
+        def _bulk_delete(request, context):
+            paths = request.text.split('\n')
+            bodies.append(paths)
+            return {'Number Deleted': len(paths) - 1,
+                    'Number Not Found': 1,
+                    'Errors': [],
+                    'Response Status': '200 OK'}
+
+        _mock.post('%s?bulk-delete=true' % v.STORAGE_URL, json=_bulk_delete)
+        self.tclient.containers.container(v.CNTR_NAME)
+        names = [obj['name'] for obj in v.OBJECTS] + [u'\u30c6 1']
+        res = self.tclient.containers.objects.bulk_delete(iter(names))
+        self.assertEqual({'deleted': 2, 'not_found': 2, 'errors': []}, res)
+        self.assertEqual([['/%s/sample.txt' % v.CNTR_NAME,
+                           '/%s/sample_2.txt' % v.CNTR_NAME],
+                          ['/%s/sample_3.txt' % v.CNTR_NAME,
+                           '/%s/%%E3%%83%%86%%201' % v.CNTR_NAME]], bodies)
+        self.assertEqual('application/json',
+                         _mock.last_request.headers['Accept'])
+
+    @requests_mock.Mocker()
+    def test_bulk_delete_object_rejected(self, _mock):
+        """unit test of bulk delete rejected as a whole"""
+        _mock.get(v.INFO_URL, json=v.INFO)
+        _mock.post('%s?bulk-delete=true' % v.STORAGE_URL,
+                   json={'Number Deleted': 0,
+                         'Number Not Found': 0,
+                         'Errors': [],
+                         'Response Status': '413 Request Entity Too Large',
+                         'Response Body': ''})
+        self.tclient.containers.container(v.CNTR_NAME)
+        res = self.tclient.containers.objects.bulk_delete(['a', 'b'])
+        self.assertEqual(
+            {'deleted': 0, 'not_found': 0,
+             'errors': [['/%s/a' % v.CNTR_NAME,
+                         '413 Request Entity Too Large'],
+                        ['/%s/b' % v.CNTR_NAME,
+                         '413 Request Entity Too Large']]},
+            res)
+
+    @requests_mock.Mocker()
+    def test_bulk_delete_object_fallback(self, _mock):
+        """unit test of bulk delete objects without bulk middleware"""
+        _mock.get(v.INFO_URL, status_code=404)
+        uri = '%s/%s' % (v.STORAGE_URL, v.CNTR_NAME)
+        _mock.delete('%s/%s' % (uri, v.OBJECTS[0]['name']), status_code=204)
+        _mock.delete('%s/%s' % (uri, v.OBJECTS[1]['name']), status_code=404)
+        _mock.delete('%s/%s' % (uri, v.OBJECTS[2]['name']), status_code=409)
+        self.tclient.containers.container(v.CNTR_NAME)
+        res = self.tclient.containers.objects.bulk_delete(
+            [obj['name'] for obj in v.OBJECTS], concurrency=2)
+        self.assertEqual(
+            {'deleted': 1, 'not_found': 1,
+             'errors': [['/%s/%s' % (v.CNTR_NAME, v.OBJECTS[2]['name']),
+                         '409 None']]},
+            res)
+
+    @requests_mock.Mocker()
+    def test_purge_container(self, _mock):
+        """unit test of purge container"""
+        _mock.get(v.INFO_URL, json=v.INFO)
+        uri = '%s/%s' % (v.STORAGE_URL, v.CNTR_NAME)
+        self._mock_listing(_mock, uri, [obj['name'] for obj in v.OBJECTS])
+        _mock.post('%s?bulk-delete=true' % v.STORAGE_URL,
+                   json={'Number Deleted': 2, 'Number Not Found': 0,
+                         'Errors': []})
+        _mock.delete(uri, status_code=204)
+        res = self.tclient.containers.purge(v.CNTR_NAME,
+                                            delete_container=True)
+        self.assertEqual({'deleted': 4, 'not_found': 0, 'errors': []}, res)
+        self.assertEqual('DELETE', _mock.last_request.method)
+        self.assertIsNone(self.tclient.containers.container_name)
+
+    @requests_mock.Mocker()
+    def test_bulk_upload_object(self, _mock):
+        """unit test of bulk upload files in tar stream"""
+        archives = []
+
+        def _extract(request, context):
+            tar = tarfile.open(fileobj=BytesIO(b''.join(request.body)))
+            members = dict((member.name, tar.extractfile(member).read())
+                           for member in tar.getmembers())
+            archives.append(members)
+            context.status_code = 201
+            return {'Number Files Created': len(members),
+                    'Errors': [],
+                    'Response Status': '201 Created'}
+
+        _mock.put('%s/%s/backup?extract-archive=tar'
+                  % (v.STORAGE_URL, v.CNTR_NAME),
+                  json=_extract)
+        tmpdir = tempfile.mkdtemp()
+        try:
+            os.mkdir(os.path.join(tmpdir, 'sub'))
+            for name in ('a.txt', 'b.txt', 'sub/c.txt'):
+                with open(os.path.join(tmpdir, name), 'wb') as fobj:
+                    fobj.write(name.encode('utf-8') * 200)
+            self.tclient.containers.container(v.CNTR_NAME)
+            res = self.tclient.containers.objects.bulk_upload(
+                tmpdir, prefix='/backup/', batch_count=2, chunk_size=100)
+        finally:
+            shutil.rmtree(tmpdir)
+        self.assertEqual({'created': 3, 'errors': []}, res)
+        self.assertEqual([['a.txt', 'b.txt'], ['sub/c.txt']],
+                         [sorted(members) for members in archives])
+        self.assertEqual(b'sub/c.txt' * 200, archives[1]['sub/c.txt'])
+        self.assertEqual('application/json',
+                         _mock.last_request.headers['Accept'])
+
+    @requests_mock.Mocker()
+    def test_upload_tree(self, _mock):
+        """unit test of uploading directory tree"""
+        uri = '%s/%s/backup' % (v.STORAGE_URL, v.CNTR_NAME)
+        _mock.put(uri + '/a.txt', status_code=201)
+        _mock.put(uri + '/sub/b.txt', status_code=201)
+        _mock.put(uri + '/sub/c.txt', status_code=507)
+        tmpdir = tempfile.mkdtemp()
+        progress = []
+        try:
+            os.mkdir(os.path.join(tmpdir, 'sub'))
+            for name in ('a.txt', 'sub/b.txt', 'sub/c.txt'):
+                with open(os.path.join(tmpdir, name), 'wb') as fobj:
+                    fobj.write(b'sample')
+            self.tclient.containers.container(v.CNTR_NAME)
+            res = self.tclient.containers.objects.upload_tree(
+                tmpdir, prefix='backup/', concurrency=2, max_bytes=6,
+                progress=lambda *args: progress.append(args))
+        finally:
+            shutil.rmtree(tmpdir)
+        self.assertEqual(2, res['transferred'])
+        self.assertEqual(12, res['bytes'])
+        self.assertEqual(['backup/sub/c.txt'],
+                         [name for name, _ in res['errors']])
+        self.assertIsInstance(res['errors'][0][1], ResponseError)
+        self.assertEqual(3, len(progress))
+
+    @requests_mock.Mocker()
+    def test_sync(self, _mock):
+        """unit test of synchronizing only differences of directory tree"""
+        uri = '%s/%s' % (v.STORAGE_URL, v.CNTR_NAME)
+        _mock.get(v.INFO_URL, json={})
+        _mock.get(uri + '?prefix=backup/',
+                  json=[{'name': 'backup/a.txt', 'bytes': 6,
+                         'hash': hashlib.md5(b'sample').hexdigest()},
+                        {'name': 'backup/sub/b.txt', 'bytes': 6,
+                         'hash': hashlib.md5(b'sampl3').hexdigest()},
+                        {'name': 'backup/old.txt', 'bytes': 6,
+                         'hash': hashlib.md5(b'sample').hexdigest()}])
+
+        def _put(request, context):
+            context.headers['Etag'] = hashlib.md5(
+                b''.join(request.body)).hexdigest()
+            return b''
+
+        _mock.put(re.compile(re.escape(uri + '/backup/')), status_code=201,
+                  content=_put)
+        _mock.delete(uri + '/backup/old.txt', status_code=204)
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        local_dir = os.path.join(tmpdir, 'local')
+        os.makedirs(os.path.join(local_dir, 'sub'))
+        for name in ('a.txt', 'sub/b.txt', 'new.txt'):
+            with open(os.path.join(local_dir, name), 'wb') as fobj:
+                fobj.write(b'sample')
+        index = os.path.join(tmpdir, 'index.sqlite')
+        self.tclient.containers.container(v.CNTR_NAME)
+        res = self.tclient.containers.objects.sync(local_dir, prefix='backup',
+                                                   index=index, processes=2)
+        self.assertEqual({'uploaded': 2, 'unchanged': 1, 'deleted': 1,
+                          'bytes': 12, 'errors': []}, res)
+        self.assertEqual([uri + '/backup/new.txt', uri + '/backup/sub/b.txt'],
+                         sorted(req.url for req in _mock.request_history
+                                if req.method == 'PUT'))
+
+        res = self.tclient.containers.objects.sync(local_dir, prefix='backup',
+                                                   index=index,
+                                                   delete=False)
+        self.assertEqual(0, res['deleted'])
+        self.assertEqual(1, res['unchanged'])
+
+    @requests_mock.Mocker()
+    def test_download_tree(self, _mock):
+        """unit test of downloading objects into directory tree"""
+        uri = '%s/%s' % (v.STORAGE_URL, v.CNTR_NAME)
+        _mock.get(uri + '?prefix=backup/',
+                  json=[{'name': 'backup/', 'bytes': 0,
+                         'content_type': 'application/directory'},
+                        {'name': 'backup/a.txt', 'bytes': 6},
+                        {'name': 'backup/sub/b.txt', 'bytes': 6},
+                        {'name': 'backup/../../c.txt', 'bytes': 6}])
+        _mock.get(uri + '/backup/a.txt', content=b'sample')
+        _mock.get(uri + '/backup/sub/b.txt', content=b'sample')
+        tmpdir = tempfile.mkdtemp()
+        try:
+            self.tclient.containers.container(v.CNTR_NAME)
+            res = self.tclient.containers.objects.download_tree(
+                'backup', tmpdir, concurrency=2)
+            with open(os.path.join(tmpdir, 'sub', 'b.txt'), 'rb') as fobj:
+                self.assertEqual(b'sample', fobj.read())
+        finally:
+            shutil.rmtree(tmpdir)
+        self.assertEqual(['backup/'], _mock.request_history[0].qs['prefix'])
+        self.assertEqual(2, res['transferred'])
+        self.assertEqual(['backup/../../c.txt'],
+                         [name for name, _ in res['errors']])
+
+    @requests_mock.Mocker()
+    def test_bulk_upload_object_rejected(self, _mock):
+        """unit test of bulk upload rejected as a whole"""
+        _mock.put('%s/%s?extract-archive=tar' % (v.STORAGE_URL, v.CNTR_NAME),
+                  json={'Number Files Created': 0,
+                        'Errors': [],
+                        'Response Status': '400 Bad Request',
+                        'Response Body': 'Invalid Tar File: truncated\n'})
+        self.tclient.containers.container(v.CNTR_NAME)
+        res = self.tclient.containers.objects.bulk_upload(v.TEST_FILE)
+        self.assertEqual(
+            {'created': 0,
+             'errors': [['sample.txt',
+                         '400 Bad Request: Invalid Tar File: truncated']]},
+            res)
+
     @requests_mock.Mocker()
     def test_copy_object(self, _mock):
         """unit test copy object"""
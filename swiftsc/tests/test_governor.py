@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""swiftsc.governor unit tests."""
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import requests
+import requests_mock
+from swiftsc.client import Client, CONCURRENCY
+from swiftsc.governor import Governor
+from swiftsc.retry import RetryPolicy
+from swiftsc.tests import test_vars as v
+
+
+def _response(status_code):
+    res = requests.Response()
+    res.status_code = status_code
+    return res
+
+
+class GovernorTests(unittest.TestCase):
+
+    """Unit test of governor.Governor"""
+
+    def test_rate(self):
+        """test token bucket limiting requests per second"""
+        governor = Governor(rate=50, burst=1)
+        started = time.time()
+        for _ in range(6):
+            governor.release(governor.acquire())
+        self.assertGreaterEqual(time.time() - started, 0.09)
+
+    def test_in_flight(self):
+        """test limiting requests in flight across threads"""
+        governor = Governor(max_in_flight=2)
+        lock = threading.Lock()
+        peak = [0, 0]
+
+        def _send():
+            with lock:
+                peak[0] += 1
+                peak[1] = max(peak)
+            time.sleep(0.01)
+            with lock:
+                peak[0] -= 1
+            return _response(200)
+
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda _: governor.call(_send), range(16)))
+        self.assertEqual(2, peak[1])
+        self.assertEqual(0, governor.in_flight)
+
+    def test_max_bytes(self):
+        """test limiting bytes in flight, allowing a large body alone"""
+        governor = Governor(max_bytes=10)
+        epoch = governor.acquire(20)
+        self.assertIsNone(governor._wait_time(1))
+        governor.release(epoch, 20)
+        self.assertEqual(0, governor._wait_time(1))
+
+    def test_aimd(self):
+        """test decreasing once per window and increasing on success"""
+        governor = Governor(rate=100, max_in_flight=8)
+        epochs = [governor.acquire() for _ in range(3)]
+        governor.release(epochs[0], rate_limited=True)
+        governor.release(epochs[1], congested=True)
+        self.assertEqual(4, governor.limit)
+        self.assertEqual(50, governor.rate)
+        self.assertEqual(1, governor.decreases)
+        governor.release(epochs[2])
+        self.assertEqual(4.25, governor.limit)
+        self.assertEqual(50.02, governor.rate)
+        governor.release(governor.acquire(), congested=True)
+        self.assertEqual(2.125, governor.limit)
+
+    def test_rate_limited_without_rate(self):
+        """test limiting the rate of the last second once rate limited"""
+        governor = Governor(max_in_flight=8)
+        epochs = [governor.acquire() for _ in range(6)]
+        self.assertIsNone(governor.rate)
+        governor.release(epochs[0], rate_limited=True)
+        self.assertEqual(3, governor.rate)
+        governor.release(epochs[1])
+        self.assertAlmostEqual(3 + 1.0 / 3, governor.rate)
+
+    def test_latency_target(self):
+        """test slow response as congestion signal"""
+        governor = Governor(max_in_flight=4, latency_target=0.001)
+
+        def _slow():
+            time.sleep(0.01)
+            return _response(200)
+
+        governor.call(_slow)
+        self.assertEqual(2, governor.limit)
+        governor.call(_slow, size=1024)
+        self.assertEqual(2.5, governor.limit)
+
+    @requests_mock.Mocker()
+    def test_client_governor(self, _mock):
+        """test requests of client passing through governor"""
+        governor = Governor(rate=100, max_in_flight=8)
+        cli = Client(uri=v.STORAGE_URL, token=v.TOKEN, governor=governor,
+                     retry=RetryPolicy(backoff=0))
+        _mock.get(v.STORAGE_URL, [{'status_code': 498},
+                                  {'json': v.CONTAINERS}])
+        self.assertEqual(v.CONTAINERS, cli.containers.list().json())
+        self.assertEqual(1, governor.decreases)
+        self.assertEqual(4.25, governor.limit)
+        self.assertEqual(0, governor.in_flight)
+        self.assertEqual(8, cli.containers._concurrency())
+        self.assertEqual(2, cli.containers._concurrency(2))
+        self.assertEqual(CONCURRENCY, Client(
+            uri=v.STORAGE_URL, token=v.TOKEN).containers._concurrency())
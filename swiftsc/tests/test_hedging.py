@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""swiftsc.hedging unit tests."""
+import datetime
+import threading
+import time
+import unittest
+import requests
+import requests_mock
+from swiftsc.client import Client
+from swiftsc.hedging import HedgePolicy
+from swiftsc.tests import test_vars as v
+
+
+class _Sender(object):
+    """Callable answering after the given delays, one per call."""
+
+    def __init__(self, *delays):
+        self.delays = list(delays)
+        self.responses = []
+        self.closed = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            delay = self.delays.pop(0)
+            res = requests.Response()
+            res.status_code = 200
+            res.reason = len(self.responses)
+            res.close = self.closed.set
+            self.responses.append(res)
+        if isinstance(delay, Exception):
+            raise delay
+        time.sleep(delay)
+        res.elapsed = datetime.timedelta(seconds=delay)
+        return res
+
+
+class HedgePolicyTests(unittest.TestCase):
+
+    """Unit test of hedging.HedgePolicy"""
+
+    def tearDown(self):
+        self.hedge.close()
+
+    def test_hedge_wins(self):
+        """test the hedge answering first and closing the slow request"""
+        self.hedge = HedgePolicy(delay=0.01)
+        send = _Sender(0.5, 0)
+        started = time.time()
+        self.assertEqual(1, self.hedge.call(send, 'GET').reason)
+        self.assertLess(time.time() - started, 0.4)
+        self.assertEqual((1, 1), (self.hedge.hedges, self.hedge.wins))
+        self.assertTrue(send.closed.wait(2))
+
+        send = _Sender(0.05, requests.exceptions.ConnectionError())
+        self.assertEqual(0, self.hedge.call(send, 'HEAD').reason)
+        self.assertEqual((2, 1), (self.hedge.hedges, self.hedge.wins))
+
+        send = _Sender(0)
+        self.assertEqual(0, self.hedge.call(send, 'PUT').reason)
+        self.assertEqual(2, self.hedge.hedges)
+
+    def test_concurrency(self):
+        """test sending requests of many callers at once"""
+        self.hedge = HedgePolicy(delay=5)
+        callers = 64
+        lock = threading.Lock()
+        in_flight = [0]
+        everyone = threading.Event()
+        met = []
+
+        def _send():
+            with lock:
+                in_flight[0] += 1
+                if in_flight[0] == callers:
+                    everyone.set()
+            met.append(everyone.wait(2))
+            return _Sender(0)()
+
+        threads = [threading.Thread(target=self.hedge.call,
+                                    args=(_send, 'GET'))
+                   for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([True] * callers, met)
+        self.assertEqual(0, self.hedge.hedges)
+
+    def test_close(self):
+        """test sending requests once after closing"""
+        self.hedge = HedgePolicy(delay=0.01)
+        cli = Client(uri=v.STORAGE_URL, token=v.TOKEN, hedge=self.hedge)
+        cli.close()
+        self.assertEqual(0, self.hedge.call(_Sender(0.05), 'GET').reason)
+        self.assertEqual(0, self.hedge.hedges)
+
+    def test_budget(self):
+        """test bounding hedges to a ratio of the requests"""
+        self.hedge = HedgePolicy(delay=0.001, max_ratio=0.5, burst=1)
+        self.hedge.call(_Sender(0.02, 0.02), 'GET')
+        self.hedge.call(_Sender(0.02), 'GET')
+        self.assertEqual((1, 1), (self.hedge.hedges, self.hedge.throttled))
+        self.hedge.call(_Sender(0.02, 0.02), 'GET')
+        self.assertEqual(2, self.hedge.hedges)
+
+    def test_observed_delay(self):
+        """test waiting the quantile of the observed latency"""
+        self.hedge = HedgePolicy(min_samples=10, quantile=0.5,
+                                 max_delay=0.5)
+        self.assertIsNone(self.hedge.delay_of('GET'))
+        for _ in range(10):
+            self.hedge.call(_Sender(0), 'GET')
+        self.assertEqual(0, self.hedge.hedges)
+        self.assertEqual(0.005, self.hedge.delay_of('GET'))
+        self.hedge.call(_Sender(0.02), 'HEAD')
+        self.assertEqual(1, self.hedge._latency['HEAD'].count)
+        for _ in range(30):
+            self.hedge.observe('GET', 0.3)
+        # within the bucket of 0.3
+        self.assertTrue(0.25 < self.hedge.delay_of('GET') <= 0.5)
+        self.assertIsNone(self.hedge.delay_of('HEAD'))
+        self.assertIsNone(self.hedge.delay_of('DELETE'))
+
+    @requests_mock.Mocker()
+    def test_client_hedge(self, _mock):
+        """test hedging reads of client"""
+        self.hedge = HedgePolicy(delay=0.02)
+        cli = Client(uri=v.STORAGE_URL, token=v.TOKEN, hedge=self.hedge)
+        uri = '%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, v.OBJECT_NAME)
+
+        def _head(request, context):
+            # requests_mock answers one request at a time
+            time.sleep(0.05)
+            return ''
+
+        _mock.head(uri, text=_head)
+        _mock.delete(uri, status_code=204)
+        obj = cli.container(v.CNTR_NAME).object(v.OBJECT_NAME)
+        self.assertEqual(200, obj.show_metadata().status_code)
+        self.assertEqual(1, self.hedge.hedges)
+        self.assertEqual(204, obj.delete().status_code)
+        self.assertEqual(1, self.hedge.hedges)
+        self.assertEqual(1, [req.method for req in _mock.request_history]
+                         .count('DELETE'))
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""swiftsc.metrics unit tests."""
+import unittest
+import requests
+import requests_mock
+from swiftsc.client import Client
+from swiftsc.metrics import Histogram, Metrics, RequestEvent, describe
+from swiftsc.retry import RetryPolicy
+from swiftsc.tests import test_vars as v
+
+
+class HistogramTests(unittest.TestCase):
+
+    """Unit test of metrics.Histogram"""
+
+    def test_quantile(self):
+        """test estimating quantiles within buckets"""
+        histogram = Histogram((0.1, 0.2, 0.4))
+        self.assertIsNone(histogram.quantile(0.5))
+        for value in (0.05, 0.15, 0.15, 0.3):
+            histogram.observe(value)
+        self.assertAlmostEqual(0.05, histogram.quantile(0.125))
+        self.assertAlmostEqual(0.15, histogram.quantile(0.5))
+        self.assertAlmostEqual(0.4, histogram.quantile(1.0))
+        histogram.observe(9)
+        self.assertEqual(0.4, histogram.quantile(1.0))
+        self.assertEqual([(0.1, 1), (0.2, 3), (0.4, 4), (float('inf'), 5)],
+                         list(histogram.cumulative()))
+
+
+class MetricsTests(unittest.TestCase):
+
+    """Unit test of metrics.Metrics"""
+
+    def test_describe(self):
+        """test naming operations from requests"""
+        obj_uri = '%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, 'a%20b/c')
+        self.assertEqual(('object.get', v.CNTR_NAME, 'a b/c'),
+                         describe(v.STORAGE_URL, 'GET', obj_uri))
+        self.assertEqual(('object.get_range', v.CNTR_NAME, 'a b/c'),
+                         describe(v.STORAGE_URL, 'GET', obj_uri,
+                                  headers={'Range': 'bytes=0-1'}))
+        self.assertEqual(('object.copy', v.CNTR_NAME, 'a b/c'),
+                         describe(v.STORAGE_URL, 'PUT', obj_uri,
+                                  headers={'X-Copy-From': '/c/o'}))
+        self.assertEqual(('container.list', v.CNTR_NAME, None),
+                         describe(v.STORAGE_URL, 'GET',
+                                  '%s/%s' % (v.STORAGE_URL, v.CNTR_NAME)))
+        self.assertEqual(('account.bulk_delete', None, None),
+                         describe(v.STORAGE_URL, 'POST', v.STORAGE_URL,
+                                  params={'bulk-delete': 'true'}))
+
+    def test_prometheus(self):
+        """test exporting counters and histograms"""
+        metrics = Metrics(buckets=(0.1, 1.0))
+        metrics(RequestEvent('object.get', 'GET', endpoint='proxy:443',
+                             status=200, bytes_received=10, total=0.05))
+        metrics(RequestEvent('object.get', 'GET', endpoint='proxy:443',
+                             status=503, total=0.5, retries=1))
+        metrics(RequestEvent('object.get', 'GET', endpoint='proxy:443',
+                             error='ConnectTimeout', total=2.0))
+        text = metrics.prometheus()
+        labels = 'operation="object.get",endpoint="proxy:443"'
+        for line in (
+                '# TYPE swiftsc_requests_total counter',
+                'swiftsc_requests_total{%s,status="200"} 1' % labels,
+                'swiftsc_requests_total{%s,status="503"} 1' % labels,
+                'swiftsc_errors_total{%s,error="ConnectTimeout"} 1' % labels,
+                'swiftsc_retries_total{%s} 1' % labels,
+                'swiftsc_received_bytes_total{%s} 10' % labels,
+                '# TYPE swiftsc_request_duration_seconds histogram',
+                'swiftsc_request_duration_seconds_bucket{%s,le="0.1"} 1'
+                % labels,
+                'swiftsc_request_duration_seconds_bucket{%s,le="+Inf"} 3'
+                % labels,
+                'swiftsc_request_duration_seconds_count{%s} 3' % labels,
+                'swiftsc_ttfb_seconds_count{%s} 2' % labels):
+            self.assertIn(line, text.splitlines())
+        self.assertAlmostEqual(0.55, metrics.quantile(0.5), places=6)
+        self.assertIsNone(metrics.quantile(0.5, endpoint='other:443'))
+
+    @requests_mock.Mocker()
+    def test_client_hooks(self, _mock):
+        """test notifying every HTTP call of client"""
+        events = []
+        metrics = Metrics()
+        _mock.get(v.AUTH_URL, headers={'X-Auth-Token': v.TOKEN,
+                                       'X-Storage-Url': v.STORAGE_URL})
+        uri = '%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, v.OBJECT_NAME)
+        _mock.put(uri, [{'status_code': 503},
+                        {'status_code': 201}])
+        _mock.get(uri, content=b'sample')
+        _mock.head(uri, exc=requests.exceptions.ConnectTimeout)
+        cli = Client(auth_uri=v.AUTH_URL, username=v.USERNAME,
+                     password=v.PASSWORD,
+                     retry=RetryPolicy(attempts=2, backoff=0),
+                     hooks=[events.append, metrics])
+        obj = cli.container(v.CNTR_NAME).object(v.OBJECT_NAME)
+        obj.create(v.TEST_FILE)
+        obj.detail()
+        with self.assertRaises(requests.exceptions.ConnectTimeout):
+            obj.show_metadata()
+        self.assertEqual(
+            [('auth.get', 200, 0), ('object.put', 503, 0),
+             ('object.put', 201, 1), ('object.get', 200, 0),
+             ('object.head', None, 0), ('object.head', None, 1)],
+            [(event.operation, event.status, event.retries)
+             for event in events])
+        put = events[2]
+        self.assertEqual((v.CNTR_NAME, v.OBJECT_NAME, 'example.org'),
+                         (put.container, put.name, put.endpoint))
+        self.assertEqual(v.TEST_FILE_SIZE, put.bytes_sent)
+        self.assertEqual(6, events[3].bytes_received)
+        self.assertEqual('ConnectTimeout', events[4].error)
+        self.assertIn('swiftsc_requests_total{operation="object.put",'
+                      'endpoint="example.org",status="503"} 1',
+                      metrics.prometheus())
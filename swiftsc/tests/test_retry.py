@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""swiftsc.retry unit tests."""
+import time
+import unittest
+from email.utils import formatdate
+import requests
+import requests_mock
+from swiftsc.client import Client
+from swiftsc.retry import RetryPolicy, parse_retry_after
+from swiftsc.tests import test_vars as v
+
+
+def _response(status_code, **headers):
+    res = requests.Response()
+    res.status_code = status_code
+    res.headers.update(headers)
+    return res
+
+
+class RetryPolicyTests(unittest.TestCase):
+
+    """Unit test of retry.RetryPolicy"""
+
+    def setUp(self):
+        """Initialize"""
+        self.policy = RetryPolicy(attempts=3, backoff=0, max_backoff=0)
+        self.tclient = Client(uri=v.STORAGE_URL, token=v.TOKEN,
+                              retry=self.policy)
+
+    def test_parse_retry_after(self):
+        """test converting Retry-After into seconds"""
+        self.assertEqual(2.0, parse_retry_after('2'))
+        self.assertAlmostEqual(
+            30, parse_retry_after(formatdate(time.time() + 30,
+                                             usegmt=True)), delta=2)
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertIsNone(parse_retry_after(None))
+
+    def test_delay(self):
+        """test exponential backoff capped by max_backoff"""
+        policy = RetryPolicy(backoff=1, max_backoff=4)
+        for attempt in range(1, 6):
+            self.assertTrue(0 <= policy.delay(attempt) <=
+                            min(4, 2 ** (attempt - 1)))
+        self.assertEqual(3, policy.delay(1, _response(503,
+                                                      **{'Retry-After': '3'})))
+        self.assertEqual(4, policy.delay(1, _response(503,
+                                                      **{'Retry-After': '9'})))
+
+    def test_retryable(self):
+        """test retrying only idempotent methods except rate limiting"""
+        self.assertTrue(self.policy.retryable('GET', _response(503)))
+        self.assertTrue(self.policy.retryable('PUT'))
+        self.assertFalse(self.policy.retryable('GET', _response(404)))
+        self.assertFalse(self.policy.retryable('POST', _response(503)))
+        self.assertFalse(self.policy.retryable('POST'))
+        self.assertTrue(self.policy.retryable('POST', _response(498)))
+
+    @requests_mock.Mocker()
+    def test_retry_status(self, _mock):
+        """test retrying transient status"""
+        _mock.get(v.STORAGE_URL, [{'status_code': 503},
+                                  {'status_code': 429},
+                                  {'json': v.CONTAINERS}])
+        self.assertEqual(v.CONTAINERS, self.tclient.containers.list().json())
+        self.assertEqual(3, _mock.call_count)
+        self.assertEqual(2, self.policy.retries)
+        self.assertEqual(0, self.policy.give_ups)
+
+    @requests_mock.Mocker()
+    def test_give_up(self, _mock):
+        """test returning last response after all attempts"""
+        _mock.get(v.STORAGE_URL, status_code=503)
+        self.assertEqual(503, self.tclient.containers.list().status_code)
+        self.assertEqual(3, _mock.call_count)
+        self.assertEqual(1, self.policy.give_ups)
+
+    @requests_mock.Mocker()
+    def test_deadline(self, _mock):
+        """test giving up when waiting exceeds deadline"""
+        self.policy.deadline = 1
+        _mock.get(v.STORAGE_URL, status_code=503,
+                  headers={'Retry-After': '5'})
+        self.policy.max_backoff = 10
+        self.assertEqual(503, self.tclient.containers.list().status_code)
+        self.assertEqual(1, _mock.call_count)
+
+    @requests_mock.Mocker()
+    def test_retry_connection_error(self, _mock):
+        """test retrying connection reset of idempotent request"""
+        _mock.get(v.STORAGE_URL,
+                  [{'exc': requests.exceptions.ConnectionError},
+                   {'json': v.CONTAINERS}])
+        self.assertEqual(200, self.tclient.containers.list().status_code)
+        _mock.post('%s/%s' % (v.STORAGE_URL, v.CNTR_NAME),
+                   exc=requests.exceptions.ConnectionError)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.tclient.containers.update_metadata(v.CNTR_NAME)
+        self.assertEqual(3, _mock.call_count)
+
+    @requests_mock.Mocker()
+    def test_retry_upload(self, _mock):
+        """test rewinding object body between attempts"""
+        bodies = []
+
+        def _body(request, context):
+            bodies.append(b''.join(request.body))
+            context.status_code = 201 if len(bodies) > 1 else 503
+            return b''
+
+        _mock.put('%s/%s/%s' % (v.STORAGE_URL, v.CNTR_NAME, v.OBJECT_NAME),
+                  content=_body)
+        self.tclient.containers.container(v.CNTR_NAME)
+        res = self.tclient.containers.objects.create(name=v.OBJECT_NAME,
+                                                     file_path=v.TEST_FILE)
+        self.assertEqual(201, res.status_code)
+        self.assertEqual(2, len(bodies))
+        self.assertEqual(v.TEST_FILE_SIZE, len(bodies[1]))
+        self.assertEqual(bodies[0], bodies[1])
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""swiftsc.routing unit tests."""
+import copy
+import unittest
+import requests
+import requests_mock
+from swiftsc.client import Client, _retrieve_public_url_swift
+from swiftsc.routing import Router, catalog_endpoints
+from swiftsc.tests import test_vars as v
+
+PROXY1 = 'https://proxy1.example.org'
+PROXY2 = 'https://proxy2.example.org'
+ACCOUNT_PATH = '/v1/AUTH_c1d6a4bc-892d-4106-9c62-36a48ea0f129'
+
+
+def _keystone(*endpoints):
+    """Build response of KeyStone v2.0 with Swift endpoints."""
+    r_json = copy.deepcopy(v.KEYSTONE)
+    swift = [service for service in r_json['access']['serviceCatalog']
+             if service['type'] == 'object-store'][0]
+    swift['endpoints'] = [{'publicURL': url + ACCOUNT_PATH,
+                           'internalURL': url.replace('https', 'http') +
+                           ACCOUNT_PATH,
+                           'region': region}
+                          for url, region in endpoints]
+    return r_json
+
+
+class RouterTests(unittest.TestCase):
+
+    """Unit test of routing.Router"""
+
+    def test_catalog_endpoints(self):
+        """test selecting interface and region of the catalog"""
+        r_json = _keystone((PROXY1, 'RegionOne'), (PROXY2, 'RegionTwo'))
+        self.assertEqual([[PROXY1 + ACCOUNT_PATH, 'RegionOne'],
+                          [PROXY2 + ACCOUNT_PATH, 'RegionTwo']],
+                         catalog_endpoints(r_json))
+        self.assertEqual('http://proxy2.example.org' + ACCOUNT_PATH,
+                         _retrieve_public_url_swift(r_json, 'internal',
+                                                    'RegionTwo'))
+        r_json = copy.deepcopy(v.KEYSTONE_V3)
+        r_json['token']['catalog'][0]['endpoints'] = [
+            {'interface': 'internal', 'url': PROXY1, 'region_id': 'r1'},
+            {'interface': 'public', 'url': PROXY2, 'region_id': 'r2'}]
+        self.assertEqual([[PROXY2, 'r2']], catalog_endpoints(r_json))
+        self.assertEqual(v.STORAGE_URL_KS,
+                         _retrieve_public_url_swift(v.KEYSTONE_V3))
+
+    def test_rewrite(self):
+        """test redirecting URLs of the Storage URL"""
+        router = Router([PROXY1, PROXY2 + '/v1/AUTH_other'])
+        router.bind(v.STORAGE_URL)
+        proxy1, proxy2 = router.endpoints
+        self.assertEqual(PROXY1 + ACCOUNT_PATH + '/c/o?format=json',
+                         router.rewrite(v.STORAGE_URL + '/c/o?format=json',
+                                        proxy1))
+        self.assertEqual(PROXY2 + '/v1/AUTH_other/c',
+                         router.rewrite(v.STORAGE_URL + '/c', proxy2))
+        self.assertEqual(v.STORAGE_URL + 'x/c',
+                         router.rewrite(v.STORAGE_URL + 'x/c', proxy1))
+        self.assertEqual(v.INFO_URL, router.rewrite(v.INFO_URL, proxy1))
+
+    def test_select(self):
+        """test preferring fast, healthy endpoints of the region"""
+        router = Router([[PROXY1, 'r1'], [PROXY2, 'r1'],
+                         ['https://proxy3.example.org', 'r2']],
+                        region='r1', cooldown=60)
+        proxy1, proxy2, proxy3 = router.endpoints
+        router.release(router.select([proxy2]), latency=0.5)
+        router.release(router.select([proxy1]), latency=0.01)
+        self.assertIs(proxy2, router.select())
+        self.assertEqual(1, proxy2.in_flight)
+        router.release(proxy2, ok=False)
+        self.assertFalse(proxy2.healthy())
+        self.assertIs(proxy1, router.select())
+        router.release(proxy1, ok=False)
+        self.assertIs(proxy3, router.select())
+        router.release(proxy3, ok=False)
+        proxy1.down_until -= 1
+        self.assertIs(proxy1, router.select())
+        router.release(proxy1, latency=0.01)
+        self.assertEqual((0, 0, True), (proxy1.failures, proxy1.in_flight,
+                                        proxy1.healthy()))
+
+    @requests_mock.Mocker()
+    def test_client_failover(self, _mock):
+        """test failing over to another endpoint on connection error"""
+        cli = Client(uri=v.STORAGE_URL, token=v.TOKEN,
+                     endpoints=[PROXY1, PROXY2])
+        _mock.get(PROXY1 + ACCOUNT_PATH,
+                  exc=requests.exceptions.ConnectionError)
+        _mock.get(PROXY2 + ACCOUNT_PATH, json=v.CONTAINERS)
+        self.assertEqual(v.CONTAINERS, cli.containers.list().json())
+        self.assertEqual(1, cli.router.failovers)
+        proxy1, proxy2 = cli.router.endpoints
+        self.assertFalse(proxy1.healthy())
+        self.assertEqual(v.CONTAINERS, cli.containers.list().json())
+        self.assertEqual((1, 2), (proxy1.requests, proxy2.requests))
+
+        _mock.get(PROXY1 + '/healthcheck', text='OK')
+        _mock.get(PROXY2 + '/healthcheck', status_code=503)
+        self.assertEqual({PROXY1 + ACCOUNT_PATH: True,
+                          PROXY2 + ACCOUNT_PATH: False},
+                         cli.check_endpoints())
+        self.assertTrue(proxy1.healthy())
+        self.assertFalse(proxy2.healthy())
+
+    @requests_mock.Mocker()
+    def test_keystone_catalog(self, _mock):
+        """test routing over the endpoints of the catalog"""
+        _mock.post(v.KEYSTONE_URL, json=_keystone((PROXY1, 'RegionOne'),
+                                                  (PROXY2, 'RegionTwo')))
+        cli = Client(auth_uri=v.KEYSTONE_URL, username=v.USERNAME,
+                     password=v.PASSWORD, tenant_name=v.TENANT_NAME,
+                     region='RegionTwo')
+        _mock.get(PROXY2 + ACCOUNT_PATH, json=v.CONTAINERS)
+        self.assertEqual(v.CONTAINERS, cli.containers.list().json())
+        self.assertEqual(PROXY2 + ACCOUNT_PATH, cli.uri)
+        router = cli.router
+        cli.authenticate()
+        self.assertIs(router, cli.router)
+
+        _mock.post(v.KEYSTONE_URL, json=v.KEYSTONE)
+        cli.authenticate()
+        self.assertIsNone(cli.router)
+        self.assertEqual(v.STORAGE_URL_KS, cli.uri)
@@ -1,7 +1,17 @@
 # -*- coding: utf-8 -*-
 """swiftsc.utils unit tests."""
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import threading
 import unittest
+from io import BytesIO
 from swiftsc import utils as u
+from swiftsc.exception import IntegrityError
 from swiftsc.tests import test_vars as v
 
 
@@ -14,6 +24,13 @@ class UtilsTests(unittest.TestCase):
         self.assertEqual(v.TEST_FILE_MIMETYPE,
                          u.check_mimetype(v.TEST_FILE))
 
+    def test_lazy_magic(self):
+        """test importing swiftsc without loading libmagic"""
+        out = subprocess.check_output(
+            [sys.executable, '-c',
+             'import sys, swiftsc; print("magic" in sys.modules)'])
+        self.assertEqual(b'False', out.strip())
+
     def test_check_mimetype_buffer(self):
         """test checking mimetype of buffer"""
         fileobj = open(v.TEST_FILE, 'rb')
@@ -21,6 +38,46 @@ class UtilsTests(unittest.TestCase):
                          u.check_mimetype_buffer(fileobj))
         fileobj.close()
 
+    def test_check_mimetype_without_extension(self):
+        """test sniffing mimetype of file without known extension"""
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'sample')
+            shutil.copy(v.TEST_FILE, path)
+            self.assertEqual(v.TEST_FILE_MIMETYPE, u.check_mimetype(path))
+            self.assertEqual(v.TEST_FILE_MIMETYPE, u.check_mimetype(path))
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_check_mimetype_buffer_head(self):
+        """test sniffing only leading bytes of buffer"""
+        fileobj = BytesIO(b'%PDF-1.4\n' + b' ' * u.SNIFF_SIZE * 2)
+        self.assertEqual('application/pdf', u.check_mimetype_buffer(fileobj))
+        self.assertEqual(u.SNIFF_SIZE, fileobj.tell())
+        self.assertEqual('image/png',
+                         u.check_mimetype_buffer(fileobj, name='a.png'))
+        self.assertEqual(u.SNIFF_SIZE, fileobj.tell())
+
+    def test_guess_mimetype(self):
+        """test guessing mimetype from extension"""
+        self.assertEqual('text/plain', u.guess_mimetype('a/b.txt'))
+        self.assertIsNone(u.guess_mimetype('backup.tar.gz'))
+        self.assertIsNone(u.guess_mimetype('README'))
+
+    def test_lru_cache(self):
+        """test discarding least recently used entries"""
+        cache = u.LRUCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(1, cache.get('a'))
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(1, cache.get('a'))
+        self.assertEqual(3, cache.pop('c'))
+        self.assertEqual(1, len(cache))
+        cache.clear()
+        self.assertEqual(0, len(cache))
+
     def test_retrieve_info_from_buffer(self):
         """test retriving info from buffer"""
         fileobj = open(v.TEST_FILE, 'rb')
@@ -31,3 +88,208 @@ class UtilsTests(unittest.TestCase):
                           file_content),
                          u.retrieve_info_from_buffer(fileobj))
         fileobj.close()
+
+    def test_stream_length(self):
+        """test retrieving remaining length of file object"""
+        with open(v.TEST_FILE, 'rb') as fileobj:
+            fileobj.read(10)
+            self.assertEqual(v.TEST_FILE_SIZE - 10,
+                             u.stream_length(fileobj))
+        self.assertIsNone(u.stream_length(BytesIO(b'sample')))
+
+    def test_file_stream(self):
+        """test streaming file object in chunks"""
+        with open(v.TEST_FILE, 'rb') as fileobj:
+            file_content = fileobj.read()
+            fileobj.seek(0)
+            head = fileobj.read(100)
+            stream = u.FileStream(fileobj,
+                                  length=v.TEST_FILE_SIZE,
+                                  chunk_size=1000,
+                                  head=head)
+            chunks = list(stream)
+        self.assertEqual(v.TEST_FILE_SIZE, len(stream))
+        self.assertEqual(file_content, b''.join(chunks))
+        self.assertTrue(all(len(chunk) <= 1000 for chunk in chunks))
+        self.assertEqual(hashlib.md5(file_content).hexdigest(), stream.etag)
+
+    def test_file_stream_unknown_length(self):
+        """test streaming file object until EOF"""
+        stream = u.FileStream(BytesIO(b'0123456789'), chunk_size=4)
+        self.assertEqual(0, len(stream))
+        self.assertEqual([b'0123', b'4567', b'89'], list(stream))
+
+    def test_rewind_body(self):
+        """test rewinding request body to send it again"""
+        with open(v.TEST_FILE, 'rb') as fobj:
+            stream = u.FileStream(fobj, chunk_size=1000)
+            body = b''.join(stream)
+            self.assertTrue(u.rewind_body(stream))
+            self.assertEqual(body, b''.join(stream))
+        rfd, wfd = os.pipe()
+        os.close(wfd)
+        with os.fdopen(rfd, 'rb') as pipe:
+            self.assertFalse(u.rewind_body(u.FileStream(pipe)))
+        self.assertTrue(u.rewind_body(b'body'))
+        self.assertTrue(u.rewind_body(None))
+        self.assertFalse(u.rewind_body(iter([b'body'])))
+
+    def test_stream_body_empty(self):
+        """test body of empty stream"""
+        self.assertEqual(b'', u.stream_body(BytesIO(), length=0))
+
+    def test_write_chunks(self):
+        """test writing chunks to file object and callable"""
+        bio = BytesIO()
+        self.assertEqual(6, u.write_chunks([b'sam', b'ple'], bio))
+        self.assertEqual(b'sample', bio.getvalue())
+        chunks = []
+        u.write_chunks(iter([b'sam', b'ple']), chunks.append)
+        self.assertEqual([b'sam', b'ple'], chunks)
+
+    def test_iter_file_segments(self):
+        """test splitting local file into segments"""
+        segments = list(u.iter_file_segments(v.TEST_FILE, 1000))
+        self.assertEqual((v.TEST_FILE_SIZE + 999) // 1000, len(segments))
+        self.assertEqual(sum(seg.length for seg in segments[:-1]),
+                         segments[-1].offset)
+        self.assertEqual(v.TEST_FILE_SIZE,
+                         segments[-1].offset + segments[-1].length)
+        fobj = segments[1].open()
+        self.assertEqual(1000, fobj.tell())
+        fobj.close()
+
+    def test_iter_stream_segments(self):
+        """test splitting stream into spooled segments"""
+        stream = BytesIO(b'0123456789')
+        head = stream.read(3)
+        segments = u.iter_stream_segments(stream, 4, chunk_size=2,
+                                          head=head)
+        bodies = []
+        for segment in segments:
+            fobj = segment.open()
+            bodies.append((segment.length, fobj.read()))
+            fobj.close()
+        self.assertEqual([(4, b'0123'), (4, b'4567'), (2, b'89')], bodies)
+        self.assertEqual(hashlib.md5(b'89').hexdigest(), segment.etag)
+        self.assertEqual([], list(u.iter_stream_segments(BytesIO(), 4)))
+
+    def test_md5_file(self):
+        """test calculating MD5 of local file range"""
+        with open(v.TEST_FILE, 'rb') as fileobj:
+            file_content = fileobj.read()
+        self.assertEqual(hashlib.md5(file_content).hexdigest(),
+                         u.md5_file(v.TEST_FILE, chunk_size=100))
+        self.assertEqual(hashlib.md5(file_content[10:110]).hexdigest(),
+                         u.md5_file(v.TEST_FILE, 10, 100))
+
+    def test_iter_verified(self):
+        """test verifying parts of chunks while they pass"""
+        chunks = [b'0123', b'45', b'6789']
+        checks = [(3, hashlib.md5(b'012').hexdigest(), 'a'),
+                  (0, hashlib.md5(b'').hexdigest(), 'b'),
+                  (None, hashlib.md5(b'3456789').hexdigest(), 'c')]
+        self.assertEqual(chunks, list(u.iter_verified(chunks, checks)))
+        checks[2] = (7, checks[0][1], 'c')
+        received = []
+        with self.assertRaises(IntegrityError) as err:
+            for chunk in u.iter_verified(chunks, checks):
+                received.append(chunk)
+        self.assertIn('c', str(err.exception))
+        self.assertEqual([b'0123', b'45'], received)
+
+    def test_iter_check_ranges(self):
+        """test grouping parts into byte ranges"""
+        checks = [(4, 'a', 'a'), (4, 'b', 'b'), (10, 'c', 'c'),
+                  (2, 'd', 'd')]
+        self.assertEqual([(0, 7, checks[:2]), (8, 17, checks[2:3]),
+                          (18, 19, checks[3:])],
+                         list(u.iter_check_ranges(checks, 8)))
+
+    def test_iter_ranges(self):
+        """test splitting content into byte ranges"""
+        self.assertEqual([(0, 3), (4, 7), (8, 9)],
+                         list(u.iter_ranges(10, 4)))
+        self.assertEqual([], list(u.iter_ranges(0, 4)))
+
+    def test_info_uri(self):
+        """test retrieving URL of cluster capabilities"""
+        self.assertEqual(v.INFO_URL, u.info_uri(v.STORAGE_URL))
+        self.assertEqual('http://example.org:8080/info',
+                         u.info_uri(v.STORAGE_URL_KS))
+
+    def test_parse_isotime(self):
+        """test converting KeyStone expiry into epoch seconds"""
+        self.assertEqual(1370333144, u.parse_isotime('2013-06-04T08:05:44Z'))
+        self.assertEqual(1370333144,
+                         u.parse_isotime('2013-06-04T08:05:44.000000Z'))
+        self.assertEqual(1370333144,
+                         u.parse_isotime('2013-06-04T08:05:44+00:00'))
+
+    def test_quote_path(self):
+        """test building URL-encoded path"""
+        self.assertEqual('/cont/a%20b/c', u.quote_path('cont', 'a b/c'))
+
+    def test_iter_batches(self):
+        """test splitting iterable into lists"""
+        self.assertEqual([[0, 1], [2, 3], [4]],
+                         list(u.iter_batches(iter(range(5)), 2)))
+
+    def test_iter_local_files(self):
+        """test enumerating local files with their names"""
+        test_dir = os.path.dirname(v.TEST_FILE)
+        entries = dict((name, path)
+                       for path, name in u.iter_local_files(test_dir))
+        self.assertEqual(v.TEST_FILE, entries['sample.txt'])
+        self.assertEqual([(v.TEST_FILE, 'sample.txt'), ('/tmp/a', 'b')],
+                         list(u.iter_local_files([v.TEST_FILE,
+                                                  ('/tmp/a', 'b')])))
+
+    def test_iter_tar(self):
+        """test packing files into tar stream"""
+        with open(v.TEST_FILE, 'rb') as fileobj:
+            file_content = fileobj.read()
+        archive = b''.join(u.iter_tar(
+            [(v.TEST_FILE, 'a/sample.txt', v.TEST_FILE_SIZE),
+             (v.ZERO_FILE, 'empty.txt', 0),
+             (v.TEST_FILE, 'truncated.txt', 10)], chunk_size=1000))
+        self.assertEqual(0, len(archive) % tarfile.BLOCKSIZE)
+        tar = tarfile.open(fileobj=BytesIO(archive))
+        self.assertEqual(['a/sample.txt', 'empty.txt', 'truncated.txt'],
+                         tar.getnames())
+        self.assertEqual(file_content,
+                         tar.extractfile('a/sample.txt').read())
+        self.assertEqual(file_content[:10],
+                         tar.extractfile('truncated.txt').read())
+
+    def test_iter_size_batches(self):
+        """test splitting files into batches"""
+        entries = [(v.TEST_FILE, 'a'), (v.ZERO_FILE, 'b'),
+                   (v.TEST_FILE, 'c')]
+        self.assertEqual([['a', 'b'], ['c']],
+                         [[name for _, name, _ in batch] for batch in
+                          u.iter_size_batches(entries,
+                                              v.TEST_FILE_SIZE, 10)])
+        self.assertEqual([['a'], ['b'], ['c']],
+                         [[name for _, name, _ in batch] for batch in
+                          u.iter_size_batches(entries, 10 ** 6, 1)])
+
+    def test_byte_budget(self):
+        """test limiting bytes in flight"""
+        budget = u.ByteBudget(10)
+        budget.acquire(8)
+        acquired = threading.Event()
+
+        def _acquire():
+            budget.acquire(5)
+            acquired.set()
+
+        thread = threading.Thread(target=_acquire)
+        thread.start()
+        self.assertFalse(acquired.wait(0.1))
+        budget.release(8)
+        self.assertTrue(acquired.wait(1))
+        thread.join()
+        budget.release(5)
+        budget.acquire(20)
+        self.assertEqual(20, budget.in_flight)
@@ -32,6 +32,12 @@ OBJECTS = [{'bytes': 5246,
             'last_modified': '2013-05-01T09:23:26.092580',
             'name': 'sample_3.txt'}]
 OBJECT_NAME = 'sample.txt'
+INFO_URL = 'https://example.org/info'
+INFO = {'swift': {'version': '2.15.1'},
+        'bulk_delete': {'max_deletes_per_request': 2,
+                        'max_failed_deletes': 1000},
+        'bulk_upload': {'max_containers_per_extraction': 10000,
+                        'max_failed_extractions': 1000}}
 DEST_OBJ_NAME = 'sample_1.txt'
 TEST_FILE = os.path.abspath('swiftsc/tests/sample.txt')
 TEST_FILE_MIMETYPE = 'text/plain'
@@ -1,59 +1,233 @@
 # -*- coding: utf-8 -*-
 """swiftsc utility module."""
+import calendar
+import collections
+import hashlib
+import itertools
+import mimetypes
+import os
+import re
+import stat
 import sys
+import tarfile
+import tempfile
+import threading
+import time
 from io import BytesIO
-import magic
+from swiftsc.exception import IntegrityError
+try:
+    from urllib.parse import quote
+except ImportError:
+    from urllib import quote
+
+#: size of chunks read from files and streams
+CHUNK_SIZE = 65536
+
+
+#: number of leading bytes sniffed by libmagic
+SNIFF_SIZE = 8192
+
+#: number of mimetypes memoized
+MIMETYPE_CACHE_SIZE = 1024
+
+
+class LRUCache(object):
+    """Thread-safe mapping discarding the least recently used entries.
+
+    :param int maxsize: maximum number of entries
+    """
+
+    def __init__(self, maxsize):
+        """Constructor of LRUCache."""
+        self.maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Retrieve entry, marking it as recently used.
+
+        :param key: key of the entry
+        :param default: value returned when the key is missing
+        """
+        with self._lock:
+            try:
+                value = self._entries.pop(key)
+            except KeyError:
+                return default
+            self._entries[key] = value
+            return value
+
+    def set(self, key, value):
+        """Store entry, discarding the least recently used one when full.
+
+        :param key: key of the entry
+        :param value: value of the entry
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """Remove entry.
+
+        :param key: key of the entry
+        :param default: value returned when the key is missing
+        """
+        with self._lock:
+            return self._entries.pop(key, default)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def keys(self):
+        """Retrieve keys from the least recently used one.
+
+        :rtype: list
+        :return: snapshot of keys
+        """
+        with self._lock:
+            return list(self._entries)
+
+    def __len__(self):
+        """Return the number of entries."""
+        return len(self._entries)
+
+
+class _Magic(object):
+    """libmagic handle loaded once and shared by threads.
+
+    Loading the magic database costs more than sniffing a file, and a
+    libmagic cookie must not be used by two threads at once. The module is
+    imported on the first sniff, so importing swiftsc does not load
+    libmagic.
+    """
+
+    def __init__(self):
+        """Constructor of _Magic."""
+        self._module = None
+        self._handle = None
+        self._lock = threading.Lock()
+
+    def buffer(self, data):
+        """Sniff mimetype of leading bytes.
+
+        :rtype: str
+        :return: mimetype
+
+        :param bytes data: leading bytes of the content
+        """
+        with self._lock:
+            if self._handle is None:
+                self._module, self._handle = self._load()
+            if hasattr(self._module, 'open'):
+                # for python-magic package of Debian Wheezy/Sid, Ubuntu 12.04
+                mimetype = self._handle.buffer(data).split('; ')[0]
+            else:
+                # for pip install python-magic
+                mimetype = self._handle.from_buffer(data)
+        if sys.version_info > (3, 0) and isinstance(mimetype, bytes):
+            mimetype = mimetype.decode('utf-8')
+        return mimetype
+
+    @staticmethod
+    def _load():
+        """Import magic module and load magic database.
+
+        :rtype: tuple
+        :return: magic module and handle
+        """
+        import magic
+        if hasattr(magic, 'open'):
+            handle = magic.open(magic.MAGIC_MIME)
+            handle.load()
+            return magic, handle
+        if hasattr(magic, 'Magic'):
+            return magic, magic.Magic(mime=True)
+        raise RuntimeError("Not support python-magic in this environment")
+
+
+_MAGIC = _Magic()
+_MIMETYPES = LRUCache(MIMETYPE_CACHE_SIZE)
+
+
+def guess_mimetype(name):
+    """Guess mimetype from extension of name.
+
+    Compressed files such as ``.tar.gz`` are not guessed, since their
+    mimetype is the one of the compression.
+
+    :rtype: str
+    :return: mimetype, ``None`` if the extension is unknown
+
+    :param str name: file name or object name
+    """
+    mimetype, encoding = mimetypes.guess_type(name, strict=False)
+    if encoding:
+        return None
+    return mimetype
 
 
 def check_mimetype(filepath):
     """Check mimetype of file.
 
+    The extension is looked up first. Otherwise the first
+    :data:`SNIFF_SIZE` bytes are sniffed with libmagic, and the result is
+    memoized until the file is modified.
+
     :rtype: str
     :return: mimetype
 
     :param str filepath: target filename path
     """
-    if hasattr(magic, 'open'):
-        # for python-magic package of Debian Wheezy/Sid, Ubuntu 12.04
-        mgc = magic.open(magic.MAGIC_MIME)
-        mgc.load()
-        mimetype = mgc.file(filepath).split('; ')[0]
-    elif 'from_file' in dir(magic):
-        # for pip install python-magic
-        mimetype = magic.from_file(filepath, mime=True)
-    else:
-        raise RuntimeError("Not support python-magic in this environment")
-    if sys.version_info > (3, 0) and isinstance(mimetype, bytes):
-        mimetype = mimetype.decode('utf-8')
+    mimetype = guess_mimetype(filepath)
+    if mimetype:
+        return mimetype
+    fstat = os.stat(filepath)
+    key = (filepath, fstat.st_size, fstat.st_mtime)
+    mimetype = _MIMETYPES.get(key)
+    if mimetype is None:
+        with open(filepath, 'rb') as fobj:
+            mimetype = _MAGIC.buffer(fobj.read(SNIFF_SIZE))
+        _MIMETYPES.set(key, mimetype)
     return mimetype
 
 
-def check_mimetype_buffer(fileobj):
-    """Check mimetype of file.
+def check_mimetype_buffer(fileobj, name=None):
+    """Check mimetype of file object.
+
+    Only the first :data:`SNIFF_SIZE` bytes are read and sniffed with
+    libmagic, unless the extension of ``name`` is known. Results are
+    memoized by the sniffed bytes.
 
     :rtype: str
     :return: mimetype
 
-    :param fileobj: target filename path
+    :param fileobj: target file object
+    :param str name: file name or object name to look up the extension
     """
-    if 'open' in dir(magic):
-        # for python-magic package of Debian Wheezy/Sid, Ubuntu 12.04
-        mgc = magic.open(magic.MAGIC_MIME)
-        mgc.load()
-        mimetype = mgc.buffer(fileobj.read()).split('; ')[0]
-    elif 'from_file' in dir(magic):
-        # for pip install python-magic
-        mimetype = magic.from_buffer(fileobj.read(), mime=True)
-    else:
-        raise RuntimeError("Not support python-magic in this environment")
-    if sys.version_info > (3, 0) and isinstance(mimetype, bytes):
-        mimetype = mimetype.decode('utf-8')
+    mimetype = guess_mimetype(name) if name else None
+    if mimetype:
+        return mimetype
+    data = fileobj.read(SNIFF_SIZE)
+    key = hashlib.md5(data).digest()
+    mimetype = _MIMETYPES.get(key)
+    if mimetype is None:
+        mimetype = _MAGIC.buffer(data)
+        _MIMETYPES.set(key, mimetype)
     return mimetype
 
 
 def retrieve_info_from_buffer(file_object):
     """Check mimetype of file object.
 
+    This reads the whole stream into memory. It is kept only for
+    compatibility; :meth:`Object.create <swiftsc.client.Object.create>`
+    streams file objects with :class:`FileStream <FileStream>` instead.
+
     :rtype: tuple
     :return: mimetype, content length, data
 
@@ -69,3 +243,553 @@ def retrieve_info_from_buffer(file_object):
     data = bio.read()
     bio.close()
     return (mimetype, content_length, data)
+
+
+def stream_length(file_object):
+    """Retrieve remaining length of file object.
+
+    :rtype: int
+    :return: number of bytes left to read, ``None`` if unknown (pipe, socket)
+
+    :param file_object: target file object
+    """
+    try:
+        fstat = os.fstat(file_object.fileno())
+        if not stat.S_ISREG(fstat.st_mode):
+            return None
+        return fstat.st_size - file_object.tell()
+    except (AttributeError, IOError, OSError, ValueError):
+        return None
+
+
+def stream_body(file_object, length=None, chunk_size=CHUNK_SIZE, head=b''):
+    """Create request body streaming file object.
+
+    :rtype: :class:`FileStream <FileStream>` or bytes
+    :return: request body
+
+    :param file_object: file object to read
+    :param int length: number of bytes to send, ``None`` reads until EOF
+    :param int chunk_size: size of chunks
+    :param bytes head: bytes already read from ``file_object``
+    """
+    if length == 0:
+        # an empty stream would be sent with chunked transfer encoding
+        return b''
+    return FileStream(file_object, length=length, chunk_size=chunk_size,
+                      head=head)
+
+
+class FileStream(object):
+    """Request body reading a file object in fixed-size chunks.
+
+    Only one chunk is held in memory at a time. When ``length`` is ``None``
+    the stream has no length, so the body is sent with chunked
+    transfer encoding. The MD5 of the chunks is computed as they are
+    read, and is available as :attr:`etag` once the stream is exhausted.
+
+    :param file_object: file object to read
+    :param int length: number of bytes to send, ``None`` reads until EOF
+    :param int chunk_size: size of chunks
+    :param bytes head: bytes already read from ``file_object``
+    """
+
+    def __init__(self, file_object, length=None, chunk_size=CHUNK_SIZE,
+                 head=b''):
+        """Constructor of FileStream."""
+        self.file_object = file_object
+        self.length = length
+        self.chunk_size = chunk_size
+        self.head = head
+        #: hex digest of MD5 of the stream, ``None`` until it is exhausted
+        self.etag = None
+        #: number of bytes yielded by the current iteration
+        self.sent = 0
+        try:
+            #: position to rewind, ``None`` if not seekable (pipe, socket)
+            self.offset = file_object.tell()
+        except (AttributeError, IOError, OSError, ValueError):
+            self.offset = None
+
+    def rewind(self):
+        """Rewind the stream to send it again.
+
+        :rtype: bool
+        :return: ``False`` when the file object is not seekable
+        """
+        if self.offset is None:
+            return False
+        self.file_object.seek(self.offset)
+        return True
+
+    def __len__(self):
+        """Return the length of the stream, 0 if unknown."""
+        return self.length or 0
+
+    def __bool__(self):
+        """Return True even if the length is unknown.
+
+        requests drops falsy bodies, as a stream of unknown length would be.
+        """
+        return True
+
+    __nonzero__ = __bool__
+
+    def __iter__(self):
+        """Yield the head, then chunks read from the file object."""
+        self.etag = None
+        self.sent = 0
+        md5 = hashlib.md5()
+        remain = self.length
+        if self.head:
+            if remain is not None:
+                remain -= len(self.head)
+            md5.update(self.head)
+            self.sent += len(self.head)
+            yield self.head
+        while remain is None or remain > 0:
+            size = self.chunk_size
+            if remain is not None:
+                size = min(size, remain)
+            chunk = self.file_object.read(size)
+            if not chunk:
+                break
+            if remain is not None:
+                remain -= len(chunk)
+            md5.update(chunk)
+            self.sent += len(chunk)
+            yield chunk
+        self.etag = md5.hexdigest()
+
+
+def rewind_body(data):
+    """Prepare request body to be sent again.
+
+    :rtype: bool
+    :return: ``True`` when the body can be sent again
+
+    :param data: request body
+    """
+    if data is None or isinstance(data, (bytes, type(u''), dict)):
+        return True
+    rewind = getattr(data, 'rewind', None)
+    return bool(rewind and rewind())
+
+
+def write_chunks(chunks, dest):
+    """Write chunks to destination.
+
+    :rtype: int
+    :return: number of bytes written
+
+    :param chunks: iterable of bytes
+    :param dest: local file path, writable file object or callable
+    """
+    if hasattr(dest, 'write'):
+        write = dest.write
+    elif callable(dest):
+        write = dest
+    else:
+        with open(dest, 'wb') as fobj:
+            return write_chunks(chunks, fobj)
+    written = 0
+    for chunk in chunks:
+        write(chunk)
+        written += len(chunk)
+    return written
+
+
+class FileSegment(object):
+    """Segment of local file.
+
+    :param str file_path: local file path
+    :param int offset: offset of the segment
+    :param int length: length of the segment
+    """
+
+    #: hex digest of MD5, unknown until the segment is read
+    etag = None
+
+    def __init__(self, file_path, offset, length):
+        """Constructor of FileSegment."""
+        self.file_path = file_path
+        self.offset = offset
+        self.length = length
+
+    def open(self):
+        """Open file object positioned at the segment.
+
+        :rtype: file object
+        :return: file object to read the segment from
+        """
+        fobj = open(self.file_path, 'rb')
+        fobj.seek(self.offset)
+        return fobj
+
+
+class SpooledSegment(object):
+    """Segment of stream spooled to temporary file.
+
+    :param spool: `tempfile.SpooledTemporaryFile` holding the segment
+    :param int length: length of the segment
+    :param str etag: hex digest of MD5 computed while spooling
+    """
+
+    def __init__(self, spool, length, etag=None):
+        """Constructor of SpooledSegment."""
+        self.spool = spool
+        self.length = length
+        self.etag = etag
+
+    def open(self):
+        """Open file object positioned at the segment.
+
+        The temporary file is removed when the file object is closed.
+
+        :rtype: file object
+        :return: file object to read the segment from
+        """
+        self.spool.seek(0)
+        return self.spool
+
+
+def iter_file_segments(file_path, segment_size):
+    """Split local file into segments.
+
+    :rtype: generator
+    :return: :class:`FileSegment <FileSegment>` of each segment
+
+    :param str file_path: local file path
+    :param int segment_size: maximum size of segments
+    """
+    size = os.path.getsize(file_path)
+    for offset in range(0, size, segment_size):
+        yield FileSegment(file_path, offset, min(segment_size, size - offset))
+
+
+def iter_stream_segments(file_object, segment_size, chunk_size=CHUNK_SIZE,
+                         head=b''):
+    """Split stream into segments spooled to temporary files.
+
+    Each segment is copied in chunks, and is kept in memory only up to
+    ``chunk_size`` bytes. Its MD5 is computed while it is copied.
+
+    :rtype: generator
+    :return: :class:`SpooledSegment <SpooledSegment>` of each segment
+
+    :param file_object: file object to read
+    :param int segment_size: maximum size of segments
+    :param int chunk_size: size of chunks
+    :param bytes head: bytes already read from ``file_object``
+    """
+    while True:
+        spool = tempfile.SpooledTemporaryFile(max_size=chunk_size)
+        md5 = hashlib.md5()
+        length = 0
+        while length < segment_size:
+            if head:
+                size = segment_size - length
+                chunk, head = head[:size], head[size:]
+            else:
+                chunk = file_object.read(min(chunk_size,
+                                             segment_size - length))
+            if not chunk:
+                break
+            spool.write(chunk)
+            md5.update(chunk)
+            length += len(chunk)
+        if length == 0:
+            spool.close()
+            return
+        yield SpooledSegment(spool, length, md5.hexdigest())
+        if length < segment_size:
+            return
+
+
+def md5_file(file_path, offset=0, length=None, chunk_size=CHUNK_SIZE):
+    """Calculate MD5 of local file.
+
+    :rtype: str
+    :return: hex digest of MD5
+
+    :param str file_path: local file path
+    :param int offset: offset of the range to hash
+    :param int length: length of the range, ``None`` hashes until EOF
+    :param int chunk_size: size of chunks
+    """
+    with open(file_path, 'rb') as fobj:
+        fobj.seek(offset)
+        stream = FileStream(fobj, length=length, chunk_size=chunk_size)
+        for _ in stream:
+            pass
+    return stream.etag
+
+
+def iter_verified(chunks, checks):
+    """Yield chunks while verifying MD5 of consecutive parts of them.
+
+    Each part is hashed as its chunks pass, so the content is verified
+    without reading it again. :class:`IntegrityError
+    <swiftsc.exception.IntegrityError>` is raised before the chunk
+    completing a corrupted part is yielded.
+
+    :rtype: generator
+    :return: chunks
+
+    :param chunks: iterable of bytes
+    :param checks: list of length, hex digest of MD5 and name of each
+                   part. A length of ``None`` covers the rest of chunks.
+    """
+    checks = iter(checks)
+    check = next(checks, None)
+    remain = check[0] if check else None
+    md5 = hashlib.md5()
+    for chunk in chunks:
+        offset = 0
+        while check is not None:
+            if remain == 0:
+                _verify_md5(md5, check)
+                check = next(checks, None)
+                remain = check[0] if check else None
+                md5 = hashlib.md5()
+                continue
+            if offset == len(chunk):
+                break
+            end = len(chunk)
+            if remain is not None:
+                end = min(end, offset + remain)
+                remain -= end - offset
+            md5.update(chunk[offset:end])
+            offset = end
+        yield chunk
+    if check is not None and not remain:
+        _verify_md5(md5, check)
+
+
+def _verify_md5(md5, check):
+    """Compare MD5 with expected hex digest of check."""
+    if md5.hexdigest() != check[1]:
+        raise IntegrityError('%s is corrupted' % check[2])
+
+
+def iter_check_ranges(checks, part_size):
+    """Group consecutive parts into byte ranges.
+
+    Parts are not split, so that each of them is verified within a range.
+
+    :rtype: generator
+    :return: tuple of first and last byte positions, and checks of each
+             range
+
+    :param checks: list of length, hex digest of MD5 and name of each part
+    :param int part_size: maximum size of ranges of more than one part
+    """
+    first = 0
+    length = 0
+    group = []
+    for check in checks:
+        if group and length and length + check[0] > part_size:
+            yield (first, first + length - 1, group)
+            first += length
+            length = 0
+            group = []
+        group.append(check)
+        length += check[0]
+    if length:
+        yield (first, first + length - 1, group)
+
+
+def iter_ranges(size, part_size):
+    """Split content into byte ranges.
+
+    :rtype: generator
+    :return: tuple of first and last byte positions of each range
+
+    :param int size: content length
+    :param int part_size: maximum size of ranges
+    """
+    for offset in range(0, size, part_size):
+        yield (offset, min(offset + part_size, size) - 1)
+
+
+def info_uri(storage_url):
+    """Retrieve URL of cluster capabilities.
+
+    :rtype: str
+    :return: URL of ``/info`` of Swift proxy
+
+    :param str storage_url: Swift Storage URL
+    """
+    return '%s/info' % re.sub(r'/v1/[^/]+/?$', '', storage_url)
+
+
+def healthcheck_uri(storage_url):
+    """Retrieve URL of health check.
+
+    :rtype: str
+    :return: URL of ``/healthcheck`` of Swift proxy
+
+    :param str storage_url: Swift Storage URL
+    """
+    return '%s/healthcheck' % re.sub(r'/v1/[^/]+/?$', '', storage_url)
+
+
+def parse_isotime(value):
+    """Convert ISO 8601 time of KeyStone into seconds since the epoch.
+
+    :rtype: int
+    :return: seconds since the epoch
+
+    :param str value: UTC time such as ``2013-06-04T08:05:44Z`` or
+                      ``2015-08-26T08:58:05.000000Z``
+    """
+    value = re.sub(r'(Z|[+-]00:?00)$', '', value.strip())
+    return calendar.timegm(time.strptime(value.split('.')[0],
+                                         '%Y-%m-%dT%H:%M:%S'))
+
+
+def quote_path(*names):
+    """Build URL-encoded path of account.
+
+    :rtype: str
+    :return: path such as ``/container/object``
+
+    :param *names: container name and object name
+    """
+    return ''.join('/' + quote(name.encode('utf-8')
+                               if not isinstance(name, bytes) else name)
+                   for name in names)
+
+
+def iter_batches(iterable, size):
+    """Split iterable into lists.
+
+    :rtype: generator
+    :return: lists of at most ``size`` items
+
+    :param iterable: items
+    :param int size: maximum size of lists
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def iter_local_files(paths):
+    """Enumerate local files with their object names.
+
+    :rtype: generator
+    :return: tuple of file path and object name
+
+    :param paths: directory path, or iterable of file paths or of tuples of
+                  file path and object name. Files of a directory are named
+                  after their relative path, other files after their basename.
+    """
+    if isinstance(paths, str) and os.path.isdir(paths):
+        for root, dirs, files in os.walk(paths):
+            dirs.sort()
+            for filename in sorted(files):
+                file_path = os.path.join(root, filename)
+                yield (file_path,
+                       os.path.relpath(file_path, paths).replace(os.sep, '/'))
+        return
+    if isinstance(paths, str):
+        paths = [paths]
+    for path in paths:
+        if isinstance(path, tuple):
+            yield path
+        else:
+            yield (path, os.path.basename(path))
+
+
+def iter_tar(entries, chunk_size=CHUNK_SIZE):
+    """Pack files into tar stream.
+
+    Files are read in chunks while the stream is consumed, so neither the
+    archive nor whole files are held in memory. A file is packed with the
+    size given in ``entries``, even if it changed in the meantime.
+
+    :rtype: generator
+    :return: chunks of tar archive
+
+    :param entries: iterable of tuples of file path, name and size
+    :param int chunk_size: size of chunks
+    """
+    for file_path, name, size in entries:
+        info = tarfile.TarInfo(name)
+        info.size = size
+        info.mtime = int(os.path.getmtime(file_path))
+        info.mode = 0o644
+        yield info.tobuf(tarfile.GNU_FORMAT, 'utf-8', 'strict')
+        with open(file_path, 'rb') as fobj:
+            written = 0
+            for chunk in FileStream(fobj, length=size, chunk_size=chunk_size):
+                written += len(chunk)
+                yield chunk
+        padding = size - written
+        padding += -size % tarfile.BLOCKSIZE
+        if padding:
+            yield tarfile.NUL * padding
+    yield tarfile.NUL * (tarfile.BLOCKSIZE * 2)
+
+
+def iter_size_batches(entries, max_bytes, max_count):
+    """Split files into batches bounded by size or count.
+
+    :rtype: generator
+    :return: lists of tuples of file path, name and size
+
+    :param entries: iterable of tuples of file path and name
+    :param int max_bytes: maximum total size of a batch
+    :param int max_count: maximum number of files of a batch
+    """
+    batch = []
+    total = 0
+    for file_path, name in entries:
+        size = os.path.getsize(file_path)
+        if batch and (total + size > max_bytes or len(batch) >= max_count):
+            yield batch
+            batch = []
+            total = 0
+        batch.append((file_path, name, size))
+        total += size
+    if batch:
+        yield batch
+
+
+class ByteBudget(object):
+    """Limit of bytes in flight shared by threads.
+
+    An amount larger than the limit is allowed when nothing else is in
+    flight, so that a single large transfer does not block forever.
+
+    :param int limit: maximum number of bytes in flight
+    """
+
+    def __init__(self, limit):
+        """Constructor of ByteBudget."""
+        self.limit = limit
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, size):
+        """Wait until ``size`` bytes fit in the budget and take them.
+
+        :param int size: number of bytes
+        """
+        with self._cond:
+            while self.in_flight and self.in_flight + size > self.limit:
+                self._cond.wait()
+            self.in_flight += size
+
+    def release(self, size):
+        """Give back ``size`` bytes to the budget.
+
+        :param int size: number of bytes
+        """
+        with self._cond:
+            self.in_flight -= size
+            self._cond.notify_all()